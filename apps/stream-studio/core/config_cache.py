@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import copy
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from core.storage import read_json
+
+# (st_mtime_ns, st_size) or None when the file does not exist.
+FileStamp = Optional[Tuple[int, int]]
+
+
+def file_stamp(path: Path) -> FileStamp:
+    try:
+        st = Path(path).stat()
+        return (int(st.st_mtime_ns), int(st.st_size))
+    except Exception:
+        return None
+
+
+class ConfigCache:
+    """Parsed-config snapshots revalidated by file mtime/size.
+
+    Each entry remembers the files it was built from; a lookup only stats those
+    files and rebuilds when any stamp changed (or after `invalidate`).
+    Values are handed out as deep copies so callers can't mutate the snapshot.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Any, Tuple[Any, Any]] = {}
+
+    def get(
+        self,
+        key: Any,
+        *,
+        paths: Iterable[Path],
+        build: Callable[[], Any],
+        extra: Any = None,
+        copy_value: bool = True,
+    ) -> Any:
+        """Return the cached value for `key`, rebuilding it if `paths` or `extra` changed."""
+        stamps = (tuple((str(p), file_stamp(p)) for p in paths), extra)
+        with self._lock:
+            hit = self._entries.get(key)
+        if hit is not None and hit[0] == stamps:
+            value = hit[1]
+        else:
+            value = build()
+            with self._lock:
+                self._entries[key] = (stamps, value)
+        return copy.deepcopy(value) if copy_value else value
+
+    def invalidate(self, key: Any = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+_cache = ConfigCache()
+
+
+def config_cache() -> ConfigCache:
+    return _cache
+
+
+def invalidate_config_cache() -> None:
+    """Drop every cached snapshot (call after writing config files)."""
+    _cache.invalidate()
+
+
+def _parse_yaml(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    try:
+        import yaml
+
+        return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    except Exception:
+        return {}
+
+
+def load_yaml_cached(path: Path) -> Dict[str, Any]:
+    p = Path(path)
+    return _cache.get(("yaml", str(p)), paths=[p], build=lambda: _parse_yaml(p))
+
+
+def read_json_cached(path: Path) -> Any:
+    p = Path(path)
+    return _cache.get(("json", str(p)), paths=[p], build=lambda: read_json(p))
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core.storage import JsonDict, JsonlWriter
+
+
+def _segment_name(ts: str) -> str:
+    """Hourly partition for an ISO8601 `ts` (e.g. 2026-10-17T04:33:40Z -> 20261017T04)."""
+    t = (ts or "").strip()
+    if len(t) >= 13 and t[4] == "-" and t[10] == "T":
+        return f"{t[0:4]}{t[5:7]}{t[8:10]}T{t[11:13]}"
+    return time.strftime("%Y%m%dT%H", time.gmtime())
+
+
+def _correlation_id(obj: JsonDict) -> str:
+    rid = obj.get("run_id")
+    if not rid:
+        payload = obj.get("payload")
+        if isinstance(payload, dict):
+            rid = payload.get("request_id") or payload.get("run_id")
+    return str(rid or "")
+
+
+class EventStore:
+    """Append-only event store with hourly JSONL segments and a SQLite index.
+
+    Layout under `root`:
+    - `segments/<YYYYMMDDTHH>.jsonl`: raw events, one per line
+    - `index.sqlite`: (run_id, source, type, ts) -> (segment, offset, length)
+
+    `append` only enqueues; a writer thread appends batches to the segments
+    and indexes them in one transaction. `query` looks rows up in the index
+    and seeks straight to the matching lines.
+    """
+
+    def __init__(self, root: Path, *, queue_size: int = 10000, batch_max: int = 512) -> None:
+        self.root = Path(root)
+        self.db_path = self.root / "index.sqlite"
+        self.segments_dir = self.root / "segments"
+        self.batch_max = max(1, int(batch_max))
+        self.dropped = 0
+        self._q: "queue.Queue[Tuple[int, JsonDict]]" = queue.Queue(maxsize=max(1, int(queue_size)))
+        # Last enqueued / last processed sequence numbers (see flush()).
+        self._seq_lock = threading.Lock()
+        self._enqueued = 0
+        self._written = 0
+        self._written_cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="event-store", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.root.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(str(self.db_path), timeout=5.0)
+        con.row_factory = sqlite3.Row
+        return con
+
+    def init(self, con: sqlite3.Connection) -> None:
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS events_idx (
+              id INTEGER PRIMARY KEY AUTOINCREMENT,
+              ts TEXT NOT NULL,
+              run_id TEXT NOT NULL,
+              source TEXT NOT NULL,
+              type TEXT NOT NULL,
+              segment TEXT NOT NULL,
+              offset INTEGER NOT NULL,
+              length INTEGER NOT NULL
+            )
+            """
+        )
+        con.execute("CREATE INDEX IF NOT EXISTS idx_events_run ON events_idx(run_id, ts)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_events_source ON events_idx(source, type, ts)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_events_ts ON events_idx(ts)")
+        con.commit()
+
+    # --- write path ---
+
+    def append(self, obj: JsonDict) -> bool:
+        if not isinstance(obj, dict):
+            return False
+        with self._seq_lock:
+            try:
+                self._q.put_nowait((self._enqueued + 1, obj))
+            except queue.Full:
+                self.dropped += 1
+                return False
+            self._enqueued += 1
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every event appended before this call is indexed."""
+        with self._seq_lock:
+            target = self._enqueued
+        with self._written_cond:
+            if self._written >= target:
+                return True
+            if not self._thread.is_alive():
+                return False
+            return self._written_cond.wait_for(lambda: self._written >= target, timeout=max(0.0, timeout))
+
+    def _run(self) -> None:
+        con: Optional[sqlite3.Connection] = None
+        while True:
+            batch = [self._q.get()]
+            while len(batch) < self.batch_max:
+                try:
+                    batch.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if con is None:
+                    con = self._connect()
+                    self.init(con)
+                self._write_batch(con, [obj for _seq, obj in batch])
+            except Exception:
+                try:
+                    if con is not None:
+                        con.close()
+                except Exception:
+                    pass
+                con = None
+            finally:
+                for _ in batch:
+                    self._q.task_done()
+                with self._written_cond:
+                    self._written = batch[-1][0]
+                    self._written_cond.notify_all()
+
+    def _write_batch(self, con: sqlite3.Connection, batch: List[JsonDict]) -> None:
+        by_segment: Dict[str, List[Tuple[JsonDict, bytes]]] = {}
+        for obj in batch:
+            ts = str(obj.get("ts") or "")
+            line = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+            by_segment.setdefault(_segment_name(ts), []).append((obj, line))
+
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        rows: List[Tuple[str, str, str, str, str, int, int]] = []
+        for seg, items in by_segment.items():
+            with (self.segments_dir / f"{seg}.jsonl").open("ab") as f:
+                offset = f.tell()
+                f.write(b"".join(line for _, line in items))
+            for obj, line in items:
+                rows.append(
+                    (
+                        str(obj.get("ts") or ""),
+                        _correlation_id(obj),
+                        str(obj.get("source") or ""),
+                        str(obj.get("type") or ""),
+                        seg,
+                        offset,
+                        len(line),
+                    )
+                )
+                offset += len(line)
+        con.executemany(
+            "INSERT INTO events_idx(ts, run_id, source, type, segment, offset, length) VALUES(?,?,?,?,?,?,?)",
+            rows,
+        )
+        con.commit()
+
+    # --- read path ---
+
+    def query(
+        self,
+        *,
+        run_id: Optional[str] = None,
+        source: Optional[str] = None,
+        type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 1000,
+        newest_first: bool = False,
+    ) -> Iterator[JsonDict]:
+        """Yield matching events (ordered by ts) without scanning segments."""
+        self.flush()
+        where: List[str] = []
+        args: List[Any] = []
+        for col, val in (("run_id", run_id), ("source", source), ("type", type)):
+            if val:
+                where.append(f"{col} = ?")
+                args.append(val)
+        if since:
+            where.append("ts >= ?")
+            args.append(since)
+        if until:
+            where.append("ts <= ?")
+            args.append(until)
+        sql = "SELECT segment, offset, length FROM events_idx"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        order = "DESC" if newest_first else "ASC"
+        sql += f" ORDER BY ts {order}, id {order} LIMIT ?"
+        args.append(max(1, min(100_000, int(limit))))
+
+        if not self.db_path.exists():
+            return
+        con = self._connect()
+        try:
+            self.init(con)
+            rows = con.execute(sql, args).fetchall()
+        finally:
+            con.close()
+
+        files: Dict[str, Any] = {}
+        try:
+            for r in rows:
+                seg = str(r["segment"])
+                f = files.get(seg)
+                if f is None:
+                    try:
+                        f = (self.segments_dir / f"{seg}.jsonl").open("rb")
+                    except FileNotFoundError:
+                        continue
+                    files[seg] = f
+                f.seek(int(r["offset"]))
+                raw = f.read(int(r["length"]))
+                try:
+                    yield json.loads(raw.decode("utf-8"))
+                except Exception:
+                    continue
+        finally:
+            for f in files.values():
+                try:
+                    f.close()
+                except Exception:
+                    pass
+
+
+_stores_lock = threading.Lock()
+_stores: Dict[str, EventStore] = {}
+
+
+def get_event_store(root: Path) -> EventStore:
+    key = str(Path(root).resolve())
+    with _stores_lock:
+        st = _stores.get(key)
+        if st is None:
+            st = EventStore(Path(root))
+            _stores[key] = st
+        return st
+
+
+def flush_all_event_stores(timeout: float = 5.0) -> None:
+    with _stores_lock:
+        stores = list(_stores.values())
+    for st in stores:
+        try:
+            st.flush(timeout=timeout)
+        except Exception:
+            continue
+
+
+def event_store_root(events_path: Path) -> Path:
+    """Store directory that sits next to a legacy events.jsonl."""
+    return Path(events_path).parent / "events"
+
+
+@dataclass
+class EventLogWriter(JsonlWriter):
+    """JsonlWriter for events.jsonl that also feeds the indexed EventStore."""
+
+    def append(self, obj: Any) -> None:
+        super().append(obj)
+        try:
+            get_event_store(event_store_root(self.path)).append(obj)
+        except Exception:
+            pass
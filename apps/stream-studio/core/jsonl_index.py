@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from core.storage import JsonDict, atomic_write_text
+
+INDEX_VERSION = 1
+
+
+def _parse_line(raw: bytes) -> Optional[JsonDict]:
+    try:
+        obj = json.loads(raw.decode("utf-8"))
+    except Exception:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+class JsonlOffsetIndex:
+    """Sidecar offset index for an append-only JSONL file.
+
+    Every `stride` lines a block is recorded with its starting line number,
+    byte offset and per-source event counts. The index is extended
+    incrementally (only bytes appended since the last refresh are scanned)
+    and persisted as `<file>.idx` so a restart does not rescan the log.
+
+    - `read_lines(start, count)` seeks straight to the block holding `start`.
+    - `tail_where(n, source=...)` walks blocks from the end and skips blocks
+      that contain no events of that source.
+    A truncated/rotated file (smaller, or different first line) is reindexed.
+    """
+
+    def __init__(self, path: Path, *, stride: int = 1000, persist: bool = True) -> None:
+        self.path = Path(path)
+        self.stride = max(1, int(stride))
+        self.persist = persist
+        self.sidecar = self.path.with_name(self.path.name + ".idx")
+        self._lock = threading.Lock()
+        self._reset()
+        if persist:
+            self._load_sidecar()
+
+    def _reset(self) -> None:
+        self.blocks: List[Dict[str, Any]] = []
+        self.indexed_bytes = 0
+        self.indexed_lines = 0
+        self.head = ""
+
+    def _load_sidecar(self) -> None:
+        try:
+            raw = json.loads(self.sidecar.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if not isinstance(raw, dict) or raw.get("version") != INDEX_VERSION or raw.get("stride") != self.stride:
+            return
+        try:
+            self.blocks = list(raw.get("blocks") or [])
+            self.indexed_bytes = int(raw.get("indexed_bytes") or 0)
+            self.indexed_lines = int(raw.get("indexed_lines") or 0)
+            self.head = str(raw.get("head") or "")
+        except Exception:
+            self._reset()
+
+    def _save_sidecar(self) -> None:
+        if not self.persist:
+            return
+        obj = {
+            "version": INDEX_VERSION,
+            "stride": self.stride,
+            "indexed_bytes": self.indexed_bytes,
+            "indexed_lines": self.indexed_lines,
+            "head": self.head,
+            "blocks": self.blocks,
+        }
+        try:
+            atomic_write_text(self.sidecar, json.dumps(obj, ensure_ascii=False, separators=(",", ":")))
+        except Exception:
+            pass
+
+    # --- indexing ---
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._refresh_locked()
+
+    def _refresh_locked(self) -> None:
+        try:
+            from core.log_sink import flush_log_sink
+
+            flush_log_sink(self.path)
+        except Exception:
+            pass
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            if self.indexed_bytes:
+                self._reset()
+                self._save_sidecar()
+            return
+
+        with self.path.open("rb") as f:
+            head = f.read(64).decode("utf-8", errors="replace")
+            if size < self.indexed_bytes or (self.head and not head.startswith(self.head[: len(head)])):
+                self._reset()
+            if size == self.indexed_bytes:
+                return
+            if not self.head:
+                self.head = head
+
+            f.seek(self.indexed_bytes)
+            pos = self.indexed_bytes
+            changed = False
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    # Partial line still being written; index it next time.
+                    break
+                if self.indexed_lines % self.stride == 0:
+                    self.blocks.append({"line": self.indexed_lines, "offset": pos, "sources": {}})
+                obj = _parse_line(raw)
+                src = str((obj or {}).get("source") or "")
+                counts = self.blocks[-1]["sources"]
+                counts[src] = int(counts.get(src, 0)) + 1
+                pos += len(raw)
+                self.indexed_lines += 1
+                changed = True
+            self.indexed_bytes = pos
+        if changed:
+            self._save_sidecar()
+
+    # --- queries ---
+
+    @property
+    def total_lines(self) -> int:
+        self.refresh()
+        return self.indexed_lines
+
+    def _block_end(self, i: int) -> int:
+        return int(self.blocks[i + 1]["offset"]) if i + 1 < len(self.blocks) else self.indexed_bytes
+
+    def read_lines(self, start: int, count: int) -> List[JsonDict]:
+        """Return up to `count` parsed lines starting at line number `start`."""
+        with self._lock:
+            self._refresh_locked()
+            if count <= 0 or start >= self.indexed_lines or not self.blocks:
+                return []
+            start = max(0, int(start))
+            bi = min(start // self.stride, len(self.blocks) - 1)
+            block = self.blocks[bi]
+            line_no = int(block["line"])
+            end = self.indexed_bytes
+            out: List[JsonDict] = []
+            with self.path.open("rb") as f:
+                f.seek(int(block["offset"]))
+                while line_no < start + count and f.tell() < end:
+                    raw = f.readline()
+                    if not raw:
+                        break
+                    if line_no >= start:
+                        obj = _parse_line(raw)
+                        if obj is not None:
+                            out.append(obj)
+                    line_no += 1
+            return out
+
+    def tail_where(
+        self,
+        n: int,
+        *,
+        source: Optional[str] = None,
+        predicate: Optional[Callable[[JsonDict], bool]] = None,
+    ) -> List[JsonDict]:
+        """Last `n` events matching `source`/`predicate`, oldest first."""
+        with self._lock:
+            self._refresh_locked()
+            if n <= 0 or not self.blocks:
+                return []
+            found: List[JsonDict] = []
+            with self.path.open("rb") as f:
+                for i in range(len(self.blocks) - 1, -1, -1):
+                    block = self.blocks[i]
+                    if source is not None and not block["sources"].get(source):
+                        continue
+                    start = int(block["offset"])
+                    f.seek(start)
+                    chunk = f.read(self._block_end(i) - start)
+                    for raw in reversed(chunk.split(b"\n")):
+                        if not raw:
+                            continue
+                        obj = _parse_line(raw)
+                        if obj is None:
+                            continue
+                        if source is not None and str(obj.get("source") or "") != source:
+                            continue
+                        if predicate is not None and not predicate(obj):
+                            continue
+                        found.append(obj)
+                        if len(found) >= n:
+                            return list(reversed(found))
+            return list(reversed(found))
+
+
+_indexes_lock = threading.Lock()
+_indexes: Dict[str, JsonlOffsetIndex] = {}
+
+
+def get_jsonl_index(path: Path) -> JsonlOffsetIndex:
+    """Process-wide index per JSONL file."""
+    key = str(Path(path).resolve())
+    with _indexes_lock:
+        idx = _indexes.get(key)
+        if idx is None:
+            idx = JsonlOffsetIndex(Path(path))
+            _indexes[key] = idx
+        return idx
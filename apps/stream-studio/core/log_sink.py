@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class LogSinkConfig:
+    """Tuning for background JSONL writers (see `logging:` in app.yaml)."""
+
+    queue_size: int = 10000
+    batch_max: int = 512
+    flush_interval_s: float = 0.2
+    fsync: bool = False
+    # 0 disables rotation.
+    rotate_max_bytes: int = 64 * 1024 * 1024
+    rotate_keep: int = 10
+    gzip_rotated: bool = True
+
+    @classmethod
+    def from_dict(cls, raw: Optional[Dict[str, Any]]) -> "LogSinkConfig":
+        cfg = cls()
+        if not isinstance(raw, dict):
+            return cfg
+        try:
+            if "queue_size" in raw:
+                cfg.queue_size = max(1, int(raw["queue_size"]))
+            if "batch_max" in raw:
+                cfg.batch_max = max(1, int(raw["batch_max"]))
+            if "flush_interval_ms" in raw:
+                cfg.flush_interval_s = max(0.0, float(raw["flush_interval_ms"]) / 1000.0)
+            if "fsync" in raw:
+                cfg.fsync = bool(raw["fsync"])
+            if "rotate_max_mb" in raw:
+                cfg.rotate_max_bytes = max(0, int(float(raw["rotate_max_mb"]) * 1024 * 1024))
+            if "rotate_keep" in raw:
+                cfg.rotate_keep = max(0, int(raw["rotate_keep"]))
+            if "gzip" in raw:
+                cfg.gzip_rotated = bool(raw["gzip"])
+        except Exception:
+            pass
+        return cfg
+
+
+class JsonlSink:
+    """One writer thread per JSONL file fed by a bounded queue.
+
+    `append` only serializes and enqueues; the thread batches lines into a
+    single write, optionally fsyncs, and rotates the file by size. When the
+    queue is full, events are dropped (counted in `dropped`) rather than
+    blocking request threads.
+    """
+
+    def __init__(self, path: Path, cfg: Optional[LogSinkConfig] = None) -> None:
+        self.path = Path(path)
+        self.cfg = cfg or LogSinkConfig()
+        self.dropped = 0
+        self._q: "queue.Queue[Tuple[int, str]]" = queue.Queue(maxsize=self.cfg.queue_size)
+        self._wake = threading.Event()
+        # Sequence numbers: last enqueued line, last line the writer finished
+        # with, and the highest target a pending flush() is waiting for.
+        self._seq_lock = threading.Lock()
+        self._enqueued = 0
+        self._written = 0
+        self._flush_target = 0
+        self._written_cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=f"jsonl-sink:{self.path.name}", daemon=True)
+        self._thread.start()
+
+    def append(self, obj: Any) -> bool:
+        line = json.dumps(obj, ensure_ascii=False)
+        with self._seq_lock:
+            try:
+                self._q.put_nowait((self._enqueued + 1, line))
+            except queue.Full:
+                self.dropped += 1
+                return False
+            self._enqueued += 1
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every line enqueued before this call is written.
+
+        Lines appended while waiting are not waited for, so readers do not
+        stall under steady logging.
+        """
+        with self._seq_lock:
+            target = self._enqueued
+        with self._written_cond:
+            if self._written >= target:
+                return True
+            if not self._thread.is_alive():
+                return False
+            self._flush_target = max(self._flush_target, target)
+            self._wake.set()
+            return self._written_cond.wait_for(lambda: self._written >= target, timeout=max(0.0, timeout))
+
+    # --- writer thread ---
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._q.get()
+            except Exception:
+                continue
+            batch: List[Tuple[int, str]] = [first]
+            # Let a burst accumulate, then drain it into one write (unless a flush is waiting).
+            with self._written_cond:
+                flush_pending = self._flush_target >= first[0]
+            if self.cfg.flush_interval_s and not flush_pending and self._q.qsize() < self.cfg.batch_max:
+                self._wake.wait(self.cfg.flush_interval_s)
+            self._wake.clear()
+            while len(batch) < self.cfg.batch_max:
+                try:
+                    batch.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write([line for _seq, line in batch])
+            except Exception:
+                pass
+            finally:
+                for _ in batch:
+                    self._q.task_done()
+                with self._written_cond:
+                    self._written = batch[-1][0]
+                    self._written_cond.notify_all()
+
+    def _write(self, lines: List[str]) -> None:
+        if not lines:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        with self.path.open("ab") as f:
+            f.write(data)
+            f.flush()
+            if self.cfg.fsync:
+                os.fsync(f.fileno())
+            size = f.tell()
+        if self.cfg.rotate_max_bytes and size >= self.cfg.rotate_max_bytes:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        rotated = self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+        n = 1
+        while rotated.exists() or rotated.with_name(rotated.name + ".gz").exists():
+            rotated = self.path.with_name(f"{self.path.stem}.{stamp}-{n}{self.path.suffix}")
+            n += 1
+        os.replace(self.path, rotated)
+        if self.cfg.gzip_rotated:
+            # Compress off the writer thread so logging keeps flowing.
+            threading.Thread(target=_gzip_and_prune, args=(rotated, self.path, self.cfg.rotate_keep), daemon=True).start()
+        else:
+            _prune_segments(self.path, self.cfg.rotate_keep)
+
+
+def rotated_segments(path: Path) -> List[Path]:
+    """Closed segments of `path` (plain or gzipped), oldest first."""
+    path = Path(path)
+    try:
+        items = [p for p in path.parent.glob(f"{path.stem}.*{path.suffix}*") if p != path and not p.name.endswith(".tmp")]
+    except Exception:
+        return []
+    return sorted(items, key=lambda p: p.name)
+
+
+def _gzip_and_prune(src: Path, live_path: Path, keep: int) -> None:
+    try:
+        dst = src.with_name(src.name + ".gz")
+        with src.open("rb") as fin, gzip.open(dst, "wb") as fout:
+            shutil.copyfileobj(fin, fout)
+        src.unlink()
+    except Exception:
+        pass
+    _prune_segments(live_path, keep)
+
+
+def _prune_segments(live_path: Path, keep: int) -> None:
+    if keep <= 0:
+        return
+    segs = rotated_segments(live_path)
+    for p in segs[:-keep]:
+        try:
+            p.unlink()
+        except Exception:
+            continue
+
+
+_sinks_lock = threading.Lock()
+_sinks: Dict[str, JsonlSink] = {}
+_default_cfg = LogSinkConfig()
+
+
+def configure_log_sinks(cfg: LogSinkConfig) -> None:
+    """Set the config used for sinks (existing sinks pick up the new values)."""
+    global _default_cfg
+    with _sinks_lock:
+        _default_cfg = cfg
+        for sink in _sinks.values():
+            sink.cfg = cfg
+
+
+def _key(path: Path) -> str:
+    return os.path.abspath(str(path))
+
+
+def get_log_sink(path: Path) -> JsonlSink:
+    key = _key(path)
+    with _sinks_lock:
+        sink = _sinks.get(key)
+        if sink is None:
+            sink = JsonlSink(Path(path), _default_cfg)
+            _sinks[key] = sink
+        return sink
+
+
+def flush_log_sink(path: Path, timeout: float = 5.0) -> None:
+    """Flush the sink for `path` if one exists (read-your-writes for tail readers)."""
+    with _sinks_lock:
+        sink = _sinks.get(_key(path))
+    if sink is not None:
+        sink.flush(timeout=timeout)
+
+
+def flush_all_log_sinks(timeout: float = 5.0) -> None:
+    with _sinks_lock:
+        sinks = list(_sinks.values())
+    for sink in sinks:
+        try:
+            sink.flush(timeout=timeout)
+        except Exception:
+            continue
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _make_bounds(min_ms: float = 1.0, max_ms: float = 120_000.0, sub_buckets: int = 8) -> List[float]:
+    """Log-linear (HDR-style) bucket upper bounds in ms.
+
+    Each power of two is split into `sub_buckets` linear steps, so relative
+    error stays under 1/sub_buckets (12.5% by default) from 1ms to 2 minutes.
+    """
+    bounds: List[float] = []
+    lo = min_ms
+    while lo < max_ms:
+        step = lo / sub_buckets
+        for i in range(1, sub_buckets + 1):
+            bounds.append(round(lo + step * i, 3))
+        lo *= 2
+    return bounds
+
+
+_BOUNDS = _make_bounds()
+# Coarser subset (1.5x and 2x of each power of two) used for Prometheus
+# `_bucket` lines; keeps /metrics small while staying exact per bucket.
+_EXPORT_BOUNDS = [b for i, b in enumerate(_BOUNDS) if i % 4 == 3]
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with cheap merge and quantiles."""
+
+    __slots__ = ("counts", "total", "sum_ms", "max_ms")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(_BOUNDS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float) -> None:
+        v = max(0.0, float(ms))
+        self.counts[bisect.bisect_left(_BOUNDS, v)] += 1
+        self.total += 1
+        self.sum_ms += v
+        if v > self.max_ms:
+            self.max_ms = v
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.total += other.total
+        self.sum_ms += other.sum_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def quantile(self, q: float) -> float:
+        if self.total <= 0:
+            return 0.0
+        rank = max(1, int(math.ceil(q * self.total)))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                # Upper bound of the bucket, clamped to the largest value seen.
+                return min(_BOUNDS[i], self.max_ms) if i < len(_BOUNDS) else self.max_ms
+        return self.max_ms
+
+    def cumulative(self, bounds: Iterable[float]) -> List[Tuple[float, int]]:
+        out: List[Tuple[float, int]] = []
+        seen = 0
+        i = 0
+        for b in bounds:
+            while i < len(_BOUNDS) and _BOUNDS[i] <= b:
+                seen += self.counts[i]
+                i += 1
+            out.append((b, seen))
+        return out
+
+
+class _RollingHistogram:
+    """Cumulative histogram plus a ring of per-slice histograms for windows."""
+
+    def __init__(self, slice_s: float, slices: int) -> None:
+        self.slice_s = slice_s
+        self.cumulative = LatencyHistogram()
+        self._ring: List[Tuple[int, LatencyHistogram]] = []
+        self._slices = slices
+
+    def record(self, ms: float, now: float) -> None:
+        self.cumulative.record(ms)
+        sid = int(now // self.slice_s)
+        if not self._ring or self._ring[-1][0] != sid:
+            self._ring.append((sid, LatencyHistogram()))
+            if len(self._ring) > self._slices:
+                del self._ring[0 : len(self._ring) - self._slices]
+        self._ring[-1][1].record(ms)
+
+    def window(self, window_s: float, now: float) -> LatencyHistogram:
+        out = LatencyHistogram()
+        min_sid = int((now - window_s) // self.slice_s) + 1
+        for sid, h in self._ring:
+            if sid >= min_sid:
+                out.merge(h)
+        return out
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+def _fmt_labels(key: LabelKey, extra: Optional[Dict[str, str]] = None) -> str:
+    items = list(key) + sorted((extra or {}).items())
+    if not items:
+        return ""
+    esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")  # noqa: E731
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in items) + "}"
+
+
+class MetricsRegistry:
+    """In-process latency histograms and counters rendered as Prometheus text.
+
+    - `observe_latency(phase, ms, provider=...)`: per (phase, provider) histogram,
+      exported cumulatively plus p50/p95/p99 over rolling windows.
+    - `inc(name, **labels)`: monotonically increasing counters.
+    - `set_gauge(name, value, **labels)`: last-value gauges.
+    """
+
+    def __init__(self, *, windows_s: Tuple[int, ...] = (60, 300), slice_s: float = 10.0, prefix: str = "aituber") -> None:
+        self.windows_s = tuple(sorted(windows_s))
+        self.slice_s = float(slice_s)
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._hist: Dict[LabelKey, _RollingHistogram] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._slices = int(math.ceil(max(self.windows_s or (60,)) / self.slice_s)) + 1
+
+    def observe_latency(self, phase: str, ms: float, *, provider: str = "", now: Optional[float] = None) -> None:
+        key = _label_key({"phase": phase or "unknown", "provider": provider or ""})
+        t = time.time() if now is None else now
+        with self._lock:
+            h = self._hist.get(key)
+            if h is None:
+                h = _RollingHistogram(self.slice_s, self._slices)
+                self._hist[key] = h
+            h.record(ms, t)
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + float(value)
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = float(value)
+
+    def quantile(self, phase: str, q: float, *, provider: str = "", window_s: Optional[float] = None) -> float:
+        key = _label_key({"phase": phase, "provider": provider})
+        with self._lock:
+            h = self._hist.get(key)
+            if h is None:
+                return 0.0
+            hist = h.cumulative if window_s is None else h.window(window_s, time.time())
+            return hist.quantile(q)
+
+    def render_prometheus(self, now: Optional[float] = None) -> str:
+        t = time.time() if now is None else now
+        p = self.prefix
+        lines: List[str] = []
+        with self._lock:
+            if self._hist:
+                name = f"{p}_phase_latency_ms"
+                lines.append(f"# HELP {name} Pipeline phase latency in milliseconds.")
+                lines.append(f"# TYPE {name} histogram")
+                for key, h in sorted(self._hist.items()):
+                    cum = h.cumulative
+                    for b, c in cum.cumulative(_EXPORT_BOUNDS):
+                        lines.append(f"{name}_bucket{_fmt_labels(key, {'le': repr(float(b))})} {c}")
+                    lines.append(f"{name}_bucket{_fmt_labels(key, {'le': '+Inf'})} {cum.total}")
+                    lines.append(f"{name}_sum{_fmt_labels(key)} {cum.sum_ms:.3f}")
+                    lines.append(f"{name}_count{_fmt_labels(key)} {cum.total}")
+
+                wname = f"{p}_phase_latency_window_ms"
+                cname_w = f"{p}_phase_latency_window_samples"
+                qlines: List[str] = []
+                clines: List[str] = []
+                for key, h in sorted(self._hist.items()):
+                    for w in self.windows_s:
+                        wh = h.window(w, t)
+                        for q in (0.5, 0.95, 0.99):
+                            extra = {"quantile": str(q), "window": f"{w}s"}
+                            qlines.append(f"{wname}{_fmt_labels(key, extra)} {wh.quantile(q):.3f}")
+                        clines.append(f"{cname_w}{_fmt_labels(key, {'window': f'{w}s'})} {wh.total}")
+                lines.append(f"# HELP {wname} Rolling-window latency quantiles in milliseconds.")
+                lines.append(f"# TYPE {wname} gauge")
+                lines.extend(qlines)
+                lines.append(f"# HELP {cname_w} Samples in the rolling window.")
+                lines.append(f"# TYPE {cname_w} gauge")
+                lines.extend(clines)
+
+            for cname, series in sorted(self._counters.items()):
+                full = f"{p}_{cname}"
+                lines.append(f"# TYPE {full} counter")
+                for key, v in sorted(series.items()):
+                    lines.append(f"{full}{_fmt_labels(key)} {v:g}")
+
+            for gname, series in sorted(self._gauges.items()):
+                full = f"{p}_{gname}"
+                lines.append(f"# TYPE {full} gauge")
+                for key, v in sorted(series.items()):
+                    lines.append(f"{full}{_fmt_labels(key)} {v:g}")
+        return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    return _registry
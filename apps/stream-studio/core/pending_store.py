@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.sqlite_pool import ensure_schema, get_connection
+from core.storage import read_json, utc_iso
+from core.types import PendingItem
+
+
+@dataclass
+class PendingStore:
+    """Manager approval queue in SQLite (replaces rewriting pending.json).
+
+    Rows are keyed by `pending_id` and indexed on (status, created_at), so
+    approve/reject touch one row and `/manager/pending` pages by status.
+    Decided items beyond `keep_decided` are pruned on each decision.
+    """
+
+    db_path: Path
+    keep_decided: int = 500
+
+    def _connect(self) -> sqlite3.Connection:
+        return get_connection(self.db_path)
+
+    def init(self) -> None:
+        ensure_schema(self.db_path, "pending", self._create_schema)
+
+    @staticmethod
+    def _create_schema(con: sqlite3.Connection) -> None:
+        con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pending (
+              seq INTEGER PRIMARY KEY AUTOINCREMENT,
+              pending_id TEXT NOT NULL UNIQUE,
+              created_at TEXT NOT NULL,
+              status TEXT NOT NULL,
+              decided_at TEXT,
+              item_json TEXT NOT NULL
+            )
+            """
+        )
+        con.execute("CREATE INDEX IF NOT EXISTS idx_pending_status ON pending(status, seq)")
+
+    def import_legacy_json(self, path: Path) -> int:
+        """One-time import of manager/pending.json; the file is renamed afterwards."""
+        if not path.exists():
+            return 0
+        raw = read_json(path) or {}
+        items = raw.get("items") if isinstance(raw, dict) else None
+        n = 0
+        self.init()
+        with self._connect() as con:
+            for obj in items or []:
+                try:
+                    it = PendingItem.model_validate(obj)
+                except Exception:
+                    continue
+                con.execute(
+                    "INSERT OR IGNORE INTO pending(pending_id, created_at, status, decided_at, item_json) VALUES(?,?,?,?,?)",
+                    (
+                        it.pending_id,
+                        it.created_at,
+                        it.status,
+                        None if it.status == "pending" else it.created_at,
+                        it.model_dump_json(),
+                    ),
+                )
+                n += 1
+            con.commit()
+        try:
+            os.replace(path, path.with_name(path.name + ".migrated"))
+        except Exception:
+            pass
+        return n
+
+    def add(self, item: PendingItem) -> None:
+        self.init()
+        with self._connect() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO pending(pending_id, created_at, status, decided_at, item_json) VALUES(?,?,?,?,?)",
+                (item.pending_id, item.created_at, item.status, None, item.model_dump_json()),
+            )
+            con.commit()
+
+    def get(self, pending_id: str) -> Optional[PendingItem]:
+        self.init()
+        with self._connect() as con:
+            row = con.execute("SELECT item_json FROM pending WHERE pending_id = ?", (pending_id,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return PendingItem.model_validate_json(row["item_json"])
+        except Exception:
+            return None
+
+    def update(self, pending_id: str, patch: Dict[str, Any]) -> Optional[PendingItem]:
+        """Apply `patch` to one item; returns the updated item (None if missing)."""
+        self.init()
+        with self._connect() as con:
+            con.execute("BEGIN IMMEDIATE")
+            row = con.execute("SELECT item_json FROM pending WHERE pending_id = ?", (pending_id,)).fetchone()
+            if row is None:
+                con.rollback()
+                return None
+            it = PendingItem.model_validate_json(row["item_json"])
+            for k, v in patch.items():
+                setattr(it, k, v)
+            decided_at = utc_iso() if it.status != "pending" else None
+            con.execute(
+                "UPDATE pending SET status = ?, decided_at = ?, item_json = ? WHERE pending_id = ?",
+                (it.status, decided_at, it.model_dump_json(), pending_id),
+            )
+            con.commit()
+        if decided_at:
+            self.prune_decided()
+        return it
+
+    def list(
+        self,
+        *,
+        status: Optional[str] = "pending",
+        limit: int = 200,
+        offset: int = 0,
+        newest_first: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Return (items as JSON dicts, total matching); `status=None` lists every status."""
+        lim = max(1, min(2000, int(limit)))
+        off = max(0, int(offset))
+        where = "WHERE status = ?" if status else ""
+        args: List[Any] = [status] if status else []
+        order = "DESC" if newest_first else "ASC"
+        self.init()
+        with self._connect() as con:
+            total = int(con.execute(f"SELECT COUNT(*) FROM pending {where}", args).fetchone()[0])
+            rows = con.execute(
+                f"SELECT item_json FROM pending {where} ORDER BY seq {order} LIMIT ? OFFSET ?",
+                args + [lim, off],
+            ).fetchall()
+        out: List[Dict[str, Any]] = []
+        for r in rows:
+            try:
+                out.append(json.loads(r["item_json"]))
+            except Exception:
+                continue
+        return out, total
+
+    def prune_decided(self) -> int:
+        keep = max(0, int(self.keep_decided))
+        self.init()
+        with self._connect() as con:
+            cur = con.execute(
+                """
+                DELETE FROM pending
+                WHERE status != 'pending'
+                  AND seq NOT IN (
+                    SELECT seq FROM pending WHERE status != 'pending' ORDER BY seq DESC LIMIT ?
+                  )
+                """,
+                (keep,),
+            )
+            con.commit()
+            return int(cur.rowcount or 0)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import functools
 from pathlib import Path
 
-from core.storage import read_json
+from core.config_cache import read_json_cached
 
 
+@functools.lru_cache(maxsize=4)
 def _find_repo_root(start: Path) -> Path:
     p = start.resolve()
     for parent in [p] + list(p.parents):
@@ -31,7 +33,7 @@ def read_prompt_text(*, name: str) -> str:
 
     # Web-saved settings are the single source of truth.
     settings_path = repo_root / "data" / "config" / "console_settings.json"
-    obj = read_json(settings_path) or {}
+    obj = read_json_cached(settings_path) or {}
 
     if name == "llm_system":
         llm = obj.get("llm") if isinstance(obj.get("llm"), dict) else {}
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import functools
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import os
 
@@ -123,6 +124,9 @@ class Settings(BaseSettings):
     # RAG
     rag_enabled: bool = Field(default=True)
     short_term_max_events: int = Field(default=50)
+    # Retrieval: only the top-k relevant rag_items (per type) within a token budget reach the prompt.
+    rag_top_k: int = Field(default=8)
+    rag_token_budget: int = Field(default=1500)
 
     # Short-term turns (conversation log) - separate from RAG
     short_term_enabled: bool = Field(default=True)
@@ -133,7 +137,61 @@ class Settings(BaseSettings):
         return [w.strip() for w in (self.ng_words or "").split(",") if w.strip()]
 
 
+@functools.lru_cache(maxsize=1)
+def _repo_root() -> Path:
+    return _find_repo_root(Path(__file__))
+
+
+# Environment variables that feed Settings(); a change here must rebuild the snapshot.
+_ENV_FINGERPRINT_PREFIXES = ("AITUBER_", "GEMINI_", "GOOGLE_")
+
+
+def _env_fingerprint() -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, v) for k, v in os.environ.items() if k.startswith(_ENV_FINGERPRINT_PREFIXES)))
+
+
+def _settings_dep_paths(env_file: Optional[Path]) -> List[Path]:
+    """Files whose mtime invalidates the cached Settings snapshot."""
+    repo_root = _repo_root()
+
+    def _resolve(p: Path) -> Path:
+        return p if p.is_absolute() else (repo_root / p).resolve()
+
+    env_dir = repo_root / ".env"
+    paths: List[Path] = []
+    if env_file is not None:
+        paths.append(_resolve(env_file))
+    elif (os.getenv("AITUBER_ENV_FILE") or "").strip():
+        paths.append(_resolve(Path(os.getenv("AITUBER_ENV_FILE", "").strip())))
+    else:
+        paths += [env_dir / ".env.main", env_dir / ".env"]
+    # Directory mtime covers credential JSON files being added/removed.
+    paths.append(env_dir)
+    data_dir = Path(os.getenv("AITUBER_DATA_DIR") or "data/stream-studio")
+    paths.append(data_dir / "config" / "console_settings.json")
+    return paths
+
+
 def load_settings(*, env_file: Optional[Path] = None) -> Settings:
+    """Return a Settings snapshot.
+
+    The snapshot is rebuilt only when an env file, the .env folder,
+    console_settings.json or the relevant environment variables change.
+    """
+    from core.config_cache import config_cache
+
+    cached = config_cache().get(
+        ("settings", str(env_file) if env_file is not None else ""),
+        paths=_settings_dep_paths(env_file),
+        build=lambda: _build_settings(env_file=env_file),
+        extra=_env_fingerprint(),
+        copy_value=False,
+    )
+    # Fields are scalars/Paths, so a shallow copy keeps the snapshot untouched.
+    return cached.model_copy()
+
+
+def _build_settings(*, env_file: Optional[Path] = None) -> Settings:
     # pydantic-settings reads os.environ; we load .env files ourselves to avoid
     # Windows backslash escape issues in python-dotenv.
     repo_root = _find_repo_root(Path(__file__))
@@ -255,6 +313,17 @@ def _apply_console_settings(settings: Settings) -> None:
                 max_value=100,
             )
 
+        if isinstance(rag, dict) and "top_k" in rag:
+            settings.rag_top_k = _coerce_int(rag.get("top_k"), settings.rag_top_k, min_value=1, max_value=50)
+
+        if isinstance(rag, dict) and "token_budget" in rag:
+            settings.rag_token_budget = _coerce_int(
+                rag.get("token_budget"),
+                settings.rag_token_budget,
+                min_value=0,
+                max_value=20000,
+            )
+
         providers = raw.get("providers")
         if isinstance(providers, dict):
             llm = str(providers.get("llm") or "").strip().lower()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Set, Tuple
+
+# Per-thread long-lived connections: {db_path: Connection}.
+_local = threading.local()
+_schema_lock = threading.RLock()
+_schema_done: Set[Tuple[str, str]] = set()
+
+
+def _thread_conns() -> Dict[str, sqlite3.Connection]:
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = {}
+        _local.conns = conns
+    return conns
+
+
+def _open(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # cached_statements: sqlite3 keeps prepared statements per connection.
+    con = sqlite3.connect(str(path), timeout=5.0, cached_statements=256)
+    con.row_factory = sqlite3.Row
+    try:
+        # WAL lets console reads proceed while the pipeline writes.
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        con.execute("PRAGMA busy_timeout=5000")
+    except sqlite3.DatabaseError:
+        pass
+    return con
+
+
+def get_connection(db_path: Path) -> sqlite3.Connection:
+    """Long-lived WAL connection for `db_path`, one per thread.
+
+    Use as `with get_connection(p) as con:`; the context manager commits or
+    rolls back but keeps the connection open for reuse.
+    """
+    path = Path(db_path)
+    key = str(path)
+    conns = _thread_conns()
+    con = conns.get(key)
+    if con is not None and not path.exists():
+        # Database file was removed underneath us: start fresh.
+        try:
+            con.close()
+        except Exception:
+            pass
+        con = None
+        _forget_schema(key)
+    if con is None:
+        con = _open(path)
+        conns[key] = con
+    return con
+
+
+def _forget_schema(key: str) -> None:
+    with _schema_lock:
+        for item in [x for x in _schema_done if x[0] == key]:
+            _schema_done.discard(item)
+
+
+def ensure_schema(db_path: Path, name: str, create: Callable[[sqlite3.Connection], None]) -> None:
+    """Run `create(con)` once per process for (db_path, name)."""
+    key = (str(Path(db_path)), name)
+    if key in _schema_done and Path(db_path).exists():
+        return
+    with _schema_lock:
+        if key in _schema_done and Path(db_path).exists():
+            return
+        con = get_connection(Path(db_path))
+        with con:
+            create(con)
+        _schema_done.add(key)
+
+
+def close_thread_connections() -> None:
+    conns = _thread_conns()
+    for con in conns.values():
+        try:
+            con.close()
+        except Exception:
+            pass
+    conns.clear()
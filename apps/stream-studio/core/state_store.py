@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.storage import JsonDict, read_json, write_json
+
+
+class VersionedStateStore:
+    """In-process state dict with a monotonic version and push subscribers.
+
+    - Readers get a copy from memory (no disk reads on the hot path).
+    - Every change bumps `version` and is pushed as a shallow diff to async
+      subscribers (SSE/WebSocket handlers), safe to call from worker threads.
+    - The JSON file is only a snapshot: a background thread flushes it after
+      changes settle, so request threads never pay for the write.
+    """
+
+    def __init__(self, *, path: Optional[Path] = None, flush_interval_s: float = 0.25, queue_size: int = 256) -> None:
+        self.path = path
+        self.flush_interval_s = max(0.0, float(flush_interval_s))
+        self.queue_size = max(1, int(queue_size))
+
+        self._lock = threading.Lock()
+        self._state: JsonDict = {}
+        self._version = 0
+        self._subs: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Queue[JsonDict]"]] = []
+
+        self._dirty = False
+        self._flush_event = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+
+        if path is not None:
+            raw = read_json(path)
+            if isinstance(raw, dict):
+                self._state = raw
+
+    # --- reads ---
+
+    @property
+    def version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def snapshot(self) -> Tuple[int, JsonDict]:
+        with self._lock:
+            return self._version, copy.deepcopy(self._state)
+
+    def get(self) -> JsonDict:
+        return self.snapshot()[1]
+
+    # --- writes ---
+
+    def replace(self, state: JsonDict) -> int:
+        """Replace the whole state (pushed as a snapshot)."""
+        with self._lock:
+            self._state = copy.deepcopy(dict(state or {}))
+            self._version += 1
+            msg = {"type": "snapshot", "version": self._version, "state": copy.deepcopy(self._state)}
+            return self._commit_locked(msg)
+
+    def update(self, patch: JsonDict) -> int:
+        """Merge top-level keys into the state."""
+        return self.mutate(lambda st: st.update(patch or {}))
+
+    def mutate(self, fn: Callable[[JsonDict], Optional[JsonDict]]) -> int:
+        """Apply `fn` to a working copy under the lock (read-modify-write).
+
+        `fn` may modify the dict in place or return a new dict. Only changed
+        top-level keys are pushed to subscribers.
+        """
+        with self._lock:
+            before = self._state
+            work = copy.deepcopy(before)
+            out = fn(work)
+            after = out if isinstance(out, dict) else work
+
+            patch = {k: v for k, v in after.items() if k not in before or before[k] != v}
+            removed = [k for k in before if k not in after]
+            if not patch and not removed:
+                return self._version
+
+            self._state = after
+            self._version += 1
+            msg: JsonDict = {"type": "patch", "version": self._version, "patch": copy.deepcopy(patch)}
+            if removed:
+                msg["removed"] = removed
+            return self._commit_locked(msg)
+
+    def _commit_locked(self, msg: JsonDict) -> int:
+        self._publish_locked(msg)
+        self._mark_dirty()
+        return self._version
+
+    # --- push delivery ---
+
+    def subscribe(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> "asyncio.Queue[JsonDict]":
+        """Register an asyncio consumer; must be called from its event loop."""
+        lp = loop or asyncio.get_running_loop()
+        q: "asyncio.Queue[JsonDict]" = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subs.append((lp, q))
+        return q
+
+    def unsubscribe(self, queue: "asyncio.Queue[JsonDict]") -> None:
+        with self._lock:
+            self._subs = [(lp, q) for lp, q in self._subs if q is not queue]
+
+    def _publish_locked(self, msg: JsonDict) -> None:
+        alive: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Queue[JsonDict]"]] = []
+        for lp, q in self._subs:
+            try:
+                lp.call_soon_threadsafe(self._offer, q, msg)
+                alive.append((lp, q))
+            except RuntimeError:
+                # Event loop closed: drop the subscriber.
+                continue
+        self._subs = alive
+
+    def _offer(self, queue: "asyncio.Queue[JsonDict]", msg: JsonDict) -> None:
+        try:
+            queue.put_nowait(msg)
+            return
+        except asyncio.QueueFull:
+            pass
+        # Slow consumer: collapse the backlog into a single fresh snapshot.
+        while not queue.empty():
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+        version, state = self.snapshot()
+        queue.put_nowait({"type": "snapshot", "version": version, "state": state})
+
+    # --- snapshot persistence ---
+
+    def _mark_dirty(self) -> None:
+        if self.path is None:
+            return
+        self._dirty = True
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._flush_loop, name="state-store-flush", daemon=True)
+            self._flusher.start()
+        self._flush_event.set()
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._flush_event.wait()
+            # Coalesce bursts (e.g. several segment updates) into one write.
+            if self.flush_interval_s:
+                time.sleep(self.flush_interval_s)
+            self._flush_event.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass
+
+    def flush(self) -> None:
+        """Write the current snapshot to disk now (if dirty)."""
+        if self.path is None:
+            return
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+                state = copy.deepcopy(self._state)
+            try:
+                write_json(self.path, state)
+            except Exception:
+                with self._lock:
+                    self._dirty = True
+                raise
+
+
+_stores_lock = threading.Lock()
+_stores: Dict[str, VersionedStateStore] = {}
+
+
+def get_state_store(path: Path) -> VersionedStateStore:
+    """Process-wide store per snapshot file."""
+    key = str(Path(path).resolve())
+    with _stores_lock:
+        st = _stores.get(key)
+        if st is None:
+            st = VersionedStateStore(path=Path(path))
+            _stores[key] = st
+        return st
+
+
+def flush_all_state_stores() -> None:
+    with _stores_lock:
+        stores = list(_stores.values())
+    for st in stores:
+        try:
+            st.flush()
+        except Exception:
+            continue
@@ -56,27 +56,74 @@ def write_json(path: Path, obj: Any) -> None:
 
 @dataclass
 class JsonlWriter:
+    """Append-only JSONL log handle.
+
+    Appends go through the process-wide background sink for `path`
+    (core.log_sink), so callers only pay for serialization + enqueue.
+    Use `sync=True` where a line must be on disk before returning.
+    """
+
     path: Path
+    sync: bool = False
 
     def append(self, obj: Any) -> None:
-        ensure_parent(self.path)
-        line = json.dumps(obj, ensure_ascii=False)
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        if self.sync:
+            ensure_parent(self.path)
+            line = json.dumps(obj, ensure_ascii=False)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            return
+        from core.log_sink import get_log_sink
+
+        get_log_sink(self.path).append(obj)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        from core.log_sink import flush_log_sink
+
+        flush_log_sink(self.path, timeout=timeout)
 
 
 def tail_jsonl(path: Path, max_lines: int) -> list[JsonDict]:
     if max_lines <= 0:
         return []
     try:
-        lines = path.read_text(encoding="utf-8").splitlines()
+        # Make lines still queued in a background sink visible to this read.
+        from core.log_sink import flush_log_sink
+
+        flush_log_sink(path)
+    except Exception:
+        pass
+    try:
+        lines = _tail_lines(path, max_lines)
     except FileNotFoundError:
         return []
 
     out: list[JsonDict] = []
-    for line in lines[-max_lines:]:
+    for line in lines:
         try:
-            out.append(json.loads(line))
+            out.append(json.loads(line.decode("utf-8")))
         except Exception:
             continue
     return out
+
+
+def _tail_lines(path: Path, max_lines: int, block_size: int = 64 * 1024) -> list[bytes]:
+    """Last `max_lines` lines of a file, reading backwards from EOF in blocks."""
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        chunks: list[bytes] = []
+        newlines = 0
+        # One extra newline guarantees the first kept line is complete.
+        while pos > 0 and newlines <= max_lines:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            newlines += chunk.count(b"\n")
+            chunks.append(chunk)
+    lines = b"".join(reversed(chunks)).split(b"\n")
+    if pos > 0:
+        lines = lines[1:]
+    lines = [ln.rstrip(b"\r") for ln in lines if ln.strip()]
+    return lines[-max_lines:]
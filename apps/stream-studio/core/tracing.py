@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional
+
+JsonDict = Dict[str, Any]
+
+# Request whose spans are being recorded on the current thread/task.
+_current_request: contextvars.ContextVar[str] = contextvars.ContextVar("trace_request_id", default="")
+# Span nesting depth (exported as an arg; Chrome trace nests by time overlap).
+_current_depth: contextvars.ContextVar[int] = contextvars.ContextVar("trace_depth", default=0)
+
+
+def _us(perf_s: float) -> float:
+    return perf_s * 1_000_000.0
+
+
+class TraceRecorder:
+    """Keeps recent per-request spans in memory and exports Chrome trace JSON.
+
+    Spans are complete events ("ph": "X") timed with `time.perf_counter`, so
+    they line up with the timings passed to `_log_phase_timing`. Only the
+    last `max_requests` requests are retained.
+    """
+
+    def __init__(self, *, max_requests: int = 200, max_spans_per_request: int = 2000) -> None:
+        self.max_requests = max(1, int(max_requests))
+        self.max_spans = max(1, int(max_spans_per_request))
+        self._lock = threading.Lock()
+        self._traces: "OrderedDict[str, List[JsonDict]]" = OrderedDict()
+        self._threads: Dict[int, str] = {}
+
+    def add_span(
+        self,
+        request_id: str,
+        name: str,
+        *,
+        start: float,
+        end: float,
+        cat: str = "",
+        args: Optional[JsonDict] = None,
+        tid: Optional[int] = None,
+    ) -> None:
+        if not request_id:
+            return
+        th = threading.current_thread()
+        tid = th.ident if tid is None else tid
+        ev: JsonDict = {
+            "name": name,
+            "cat": cat or name.split(".", 1)[0],
+            "ph": "X",
+            "ts": round(_us(start), 1),
+            "dur": round(max(0.0, _us(end - start)), 1),
+            "pid": os.getpid(),
+            "tid": int(tid or 0),
+            "args": dict(args or {}),
+        }
+        with self._lock:
+            spans = self._traces.get(request_id)
+            if spans is None:
+                spans = []
+                self._traces[request_id] = spans
+                while len(self._traces) > self.max_requests:
+                    self._traces.popitem(last=False)
+            else:
+                self._traces.move_to_end(request_id)
+            if len(spans) < self.max_spans:
+                spans.append(ev)
+            if tid is not None and tid not in self._threads:
+                self._threads[int(tid)] = th.name
+
+    def request_ids(self) -> List[str]:
+        with self._lock:
+            return list(reversed(self._traces.keys()))
+
+    def export_chrome(self, request_id: str) -> Optional[JsonDict]:
+        """Chrome trace / Perfetto JSON for one request (None if unknown)."""
+        with self._lock:
+            spans = self._traces.get(request_id)
+            if spans is None:
+                return None
+            events = [dict(e) for e in spans]
+            names = dict(self._threads)
+        events.sort(key=lambda e: (e["ts"], -e["dur"]))
+        meta: List[JsonDict] = []
+        for tid in sorted({e["tid"] for e in events}):
+            meta.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": {"name": names.get(tid, str(tid))},
+                }
+            )
+        return {
+            "traceEvents": meta + events,
+            "displayTimeUnit": "ms",
+            "otherData": {"request_id": request_id},
+        }
+
+
+_recorder = TraceRecorder()
+
+
+def get_tracer() -> TraceRecorder:
+    return _recorder
+
+
+def current_request_id() -> str:
+    return _current_request.get()
+
+
+@contextlib.contextmanager
+def trace_context(request_id: str) -> Iterator[None]:
+    """Attribute spans opened on this thread/task to `request_id`.
+
+    Context does not flow into `threading.Thread` targets; worker threads
+    must enter their own `trace_context`.
+    """
+    token = _current_request.set(request_id or "")
+    try:
+        yield
+    finally:
+        _current_request.reset(token)
+
+
+@contextlib.contextmanager
+def span(name: str, *, request_id: Optional[str] = None, **args: Any) -> Iterator[JsonDict]:
+    """Record a nested span; yields a dict whose items are added to the span args."""
+    rid = request_id if request_id is not None else _current_request.get()
+    depth = _current_depth.get()
+    token = _current_depth.set(depth + 1)
+    extra: JsonDict = dict(args)
+    start = time.perf_counter()
+    try:
+        yield extra
+    except BaseException as e:
+        extra["error"] = f"{type(e).__name__}: {e}"[:200]
+        raise
+    finally:
+        end = time.perf_counter()
+        _current_depth.reset(token)
+        if rid:
+            extra["depth"] = depth
+            _recorder.add_span(rid, name, start=start, end=end, args=extra)
+
+
+def record_span(name: str, *, start: float, end: float, request_id: Optional[str] = None, **args: Any) -> None:
+    """Record an already-measured interval (perf_counter seconds)."""
+    rid = request_id if request_id is not None else _current_request.get()
+    if rid:
+        _recorder.add_span(rid, name, start=start, end=end, args=args)
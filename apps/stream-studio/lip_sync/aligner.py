@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import functools
 import json
 import subprocess
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional, Protocol, Tuple
+from typing import Any, Iterable, List, Optional, Protocol, Tuple
 
 
 @dataclass
@@ -64,17 +66,43 @@ def _strip_non_kana(s: str) -> str:
     return _katakana("".join(keep))
 
 
+# Janome loads its dictionary on construction (hundreds of ms), so one
+# tokenizer is shared by the whole process. False = Janome unavailable.
+_tokenizer: Any = None
+_tokenizer_lock = threading.Lock()
+
+
+def _get_tokenizer() -> Any:
+    global _tokenizer
+    with _tokenizer_lock:
+        if _tokenizer is None:
+            try:
+                from janome.tokenizer import Tokenizer  # type: ignore
+
+                _tokenizer = Tokenizer()
+            except Exception:
+                _tokenizer = False
+        return _tokenizer or None
+
+
+def warm_up_tokenizer() -> bool:
+    """Load the shared tokenizer ahead of the first utterance; False if Janome is unavailable."""
+    return _get_tokenizer() is not None
+
+
 def text_to_kana(*, text: str) -> str:
     """Convert Japanese text to (mostly) Katakana reading.
 
     Uses Janome when available; falls back to stripping kana from the surface.
     """
+    t = _get_tokenizer()
+    if t is None:
+        return _strip_non_kana(text or "")
     try:
-        from janome.tokenizer import Tokenizer  # type: ignore
-
-        t = Tokenizer()
         parts: list[str] = []
-        for tok in t.tokenize(text or ""):
+        with _tokenizer_lock:
+            tokens = list(t.tokenize(text or ""))
+        for tok in tokens:
             # reading is katakana or '*'
             r = getattr(tok, "reading", "") or ""
             if r and r != "*":
@@ -124,6 +152,12 @@ def kana_to_moras(katakana: str) -> List[str]:
     return moras
 
 
+@functools.lru_cache(maxsize=4096)
+def text_to_moras(text: str) -> Tuple[str, ...]:
+    """Mora sequence for `text` (memoized; transcripts and replies repeat a lot)."""
+    return tuple(kana_to_moras(text_to_kana(text=text)))
+
+
 def mora_to_vowel(mora: str, *, prev_vowel: Optional[str] = None) -> Optional[str]:
     """Return vowel key a/i/u/e/o if the mora has one, else None."""
     m = (mora or "").strip()
@@ -172,11 +206,13 @@ def mora_to_vowel(mora: str, *, prev_vowel: Optional[str] = None) -> Optional[st
     return None
 
 
-def _levenshtein_align(a: List[str], b: List[str]) -> List[Optional[int]]:
-    """Align sequence a to b. Returns mapping a_idx -> b_idx (or None).
+# Subproblems up to this many DP cells use the full backtrace matrix;
+# larger ones are split Hirschberg-style so memory stays linear.
+_FULL_DP_MAX_CELLS = 4096
 
-    Uses edit distance with substitution cost 1.
-    """
+
+def _levenshtein_align_full(a: List[str], b: List[str]) -> List[Optional[int]]:
+    """Full-matrix edit-distance alignment (small inputs)."""
     n, m = len(a), len(b)
     if n == 0:
         return []
@@ -229,6 +265,63 @@ def _levenshtein_align(a: List[str], b: List[str]) -> List[Optional[int]]:
     return mapping
 
 
+def _edit_distance_row(a: List[str], b: List[str]) -> List[int]:
+    """Last DP row: edit distance between all of `a` and each prefix of `b` (O(len(b)) memory)."""
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, start=1):
+            d = prev[j - 1] + (0 if ca == cb else 1)
+            u = prev[j] + 1
+            left = cur[j - 1] + 1
+            cur[j] = d if d <= u and d <= left else (u if u <= left else left)
+        prev = cur
+    return prev
+
+
+def _hirschberg(a: List[str], b: List[str], a_off: int, b_off: int, out: List[Optional[int]]) -> None:
+    n, m = len(a), len(b)
+    if n == 0 or m == 0:
+        return
+    if n == 1 or (n + 1) * (m + 1) <= _FULL_DP_MAX_CELLS:
+        for i, j in enumerate(_levenshtein_align_full(a, b)):
+            if j is not None:
+                out[a_off + i] = b_off + j
+        return
+    mid = n // 2
+    left = _edit_distance_row(a[:mid], b)
+    right = _edit_distance_row(a[mid:][::-1], b[::-1])
+    split = min(range(m + 1), key=lambda k: left[k] + right[m - k])
+    _hirschberg(a[:mid], b[:split], a_off, b_off, out)
+    _hirschberg(a[mid:], b[split:], a_off + mid, b_off + split, out)
+
+
+def _levenshtein_align(a: List[str], b: List[str]) -> List[Optional[int]]:
+    """Align sequence a to b. Returns mapping a_idx -> b_idx (or None).
+
+    Uses edit distance with substitution cost 1. A shared prefix/suffix is
+    matched directly; the rest uses the full backtrace matrix when small and
+    is split Hirschberg-style otherwise, so memory is O(len(a) + len(b))
+    rather than O(len(a) * len(b)).
+    """
+    n, m = len(a), len(b)
+    if n == 0:
+        return []
+    if m == 0:
+        return [None] * n
+    mapping: List[Optional[int]] = [None] * n
+    lo = 0
+    while lo < n and lo < m and a[lo] == b[lo]:
+        mapping[lo] = lo
+        lo += 1
+    hi = 0
+    while hi < n - lo and hi < m - lo and a[n - 1 - hi] == b[m - 1 - hi]:
+        mapping[n - 1 - hi] = m - 1 - hi
+        hi += 1
+    _hirschberg(list(a[lo : n - hi]), list(b[lo : m - hi]), lo, lo, mapping)
+    return mapping
+
+
 def build_phonemes_from_timed_chunks(*, chunks: Iterable[TimedChunk], text: str) -> List[PhonemeEvent]:
     """Best-effort forced alignment for Japanese using timed transcript chunks.
 
@@ -244,7 +337,7 @@ def build_phonemes_from_timed_chunks(*, chunks: Iterable[TimedChunk], text: str)
     for ch in chunks:
         if ch.end_ms <= ch.start_ms:
             continue
-        mk = kana_to_moras(text_to_kana(text=ch.text))
+        mk = text_to_moras(ch.text)
         if not mk:
             continue
         dur = max(1, int(ch.end_ms) - int(ch.start_ms))
@@ -258,7 +351,7 @@ def build_phonemes_from_timed_chunks(*, chunks: Iterable[TimedChunk], text: str)
             t_times.append((s, e))
 
     # Target moras
-    target_moras = kana_to_moras(text_to_kana(text=text))
+    target_moras = list(text_to_moras(text))
     if not target_moras or not t_moras:
         return []
 
@@ -302,26 +395,49 @@ class WhisperAligner:
     This is not a perfect forced alignment, but it is audio-timeline-based:
     we extract timed chunks from the audio (segments/words) and align the
     target text moras onto that timeline.
+
+    Models come from the shared registry in stt/whisper_service (also used by
+    STT), so constructing an aligner per segment is cheap. `device` and
+    `compute_type` may differ from STT's (e.g. a small int8 model for timing).
     """
 
     model_size: str = "small"
     language: str = "ja"
     beam_size: int = 1
     vad_filter: bool = True
+    device: str = "auto"
+    compute_type: str = "default"
+
+    def _model(self) -> Any:
+        from stt.whisper_service import WhisperConfig, get_model
 
-    def align(self, *, audio_wav_path: Path, text: str) -> List[PhonemeEvent]:
         try:
-            from faster_whisper import WhisperModel  # type: ignore
-        except Exception as e:
+            return get_model(
+                WhisperConfig(
+                    model=self.model_size,
+                    device=self.device,
+                    compute_type=self.compute_type,
+                    language=self.language,
+                )
+            )
+        except ImportError as e:
             raise RuntimeError(
                 "WhisperAligner requires faster-whisper. Install it (already in requirements.txt) and its runtime deps."
             ) from e
 
+    def warm_up(self) -> bool:
+        """Load the model ahead of the first segment; False on failure."""
+        try:
+            self._model()
+            return True
+        except Exception:
+            return False
+
+    def _timed_chunks(self, model: Any, audio_wav_path: Path) -> List[TimedChunk]:
         audio_wav_path = Path(audio_wav_path)
         if not audio_wav_path.exists():
             raise FileNotFoundError(str(audio_wav_path))
 
-        model = WhisperModel(self.model_size)
         segments, _info = model.transcribe(
             str(audio_wav_path),
             language=self.language or None,
@@ -348,12 +464,32 @@ class WhisperAligner:
             tx = str(getattr(seg, "text", "") or "")
             if e > s and tx.strip():
                 chunks.append(TimedChunk(start_ms=s, end_ms=e, text=tx))
+        return chunks
 
+    def align(self, *, audio_wav_path: Path, text: str) -> List[PhonemeEvent]:
+        chunks = self._timed_chunks(self._model(), audio_wav_path)
         # Final safety: if whisper returned nothing, bail
         if not chunks:
             return []
         return build_phonemes_from_timed_chunks(chunks=chunks, text=text)
 
+    def align_many(self, wavs: List[Path], texts: List[str]) -> List[List[PhonemeEvent]]:
+        """Align every segment of an utterance with one model lookup.
+
+        Best-effort per segment: a segment that fails yields an empty list.
+        """
+        if len(wavs) != len(texts):
+            raise ValueError(f"align_many: {len(wavs)} wavs vs {len(texts)} texts")
+        model = self._model()
+        out: List[List[PhonemeEvent]] = []
+        for wav, text in zip(wavs, texts):
+            try:
+                chunks = self._timed_chunks(model, wav)
+                out.append(build_phonemes_from_timed_chunks(chunks=chunks, text=text) if chunks else [])
+            except Exception:
+                out.append([])
+        return out
+
 
 @dataclass
 class MFAAligner:
@@ -7,6 +7,10 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
+from tts.audio_chain import read_wav
+
 from .aligner import PhonemeEvent
 from .mapper import LipSyncMapper, MouthPose, VisemeEvent
 
@@ -15,6 +19,12 @@ def _clamp(x: float, lo: float, hi: float) -> float:
     return lo if x < lo else hi if x > hi else x
 
 
+def samples_duration_ms(samples: np.ndarray, sample_rate: int) -> int:
+    if not sample_rate:
+        return 0
+    return int(round((len(samples) / float(sample_rate)) * 1000.0))
+
+
 def wav_duration_ms(path: Path) -> int:
     with wave.open(str(path), "rb") as wf:
         frames = wf.getnframes()
@@ -24,63 +34,57 @@ def wav_duration_ms(path: Path) -> int:
         return int(round((frames / float(rate)) * 1000.0))
 
 
-def wav_read_mono_float32(path: Path) -> Tuple[List[float], int]:
+def wav_read_mono_float32(path: Path) -> Tuple[np.ndarray, int]:
     """Read wav into mono float32 samples in [-1,1]."""
-    with wave.open(str(path), "rb") as wf:
-        n = wf.getnframes()
-        ch = wf.getnchannels()
-        sw = wf.getsampwidth()
-        sr = wf.getframerate()
-        raw = wf.readframes(n)
-    if sw != 2:
-        raise ValueError(f"Only 16-bit PCM WAV supported for envelope; got sampwidth={sw}")
-    import struct
-
-    total = len(raw) // 2
-    ints = struct.unpack("<" + "h" * total, raw)
-    if ch == 1:
-        mono = [v / 32768.0 for v in ints]
-    else:
-        mono = []
-        for i in range(0, len(ints), ch):
-            s = 0.0
-            for c in range(ch):
-                s += ints[i + c] / 32768.0
-            mono.append(s / ch)
-    return mono, int(sr)
+    return read_wav(path)
 
 
 def rms_envelope(
     *,
-    wav_path: Path,
+    wav_path: Optional[Path] = None,
+    samples: Optional[np.ndarray] = None,
+    sample_rate: int = 0,
     hop_ms: int = 10,
     win_ms: int = 30,
     floor: float = 0.02,
     gain: float = 2.0,
 ) -> Tuple[List[int], List[float]]:
-    """Compute RMS envelope at fixed hop.
+    """Compute RMS envelope at fixed hop from in-memory `samples` or a WAV file.
 
     Returns (times_ms, env_0_1)
     """
-    samples, sr = wav_read_mono_float32(wav_path)
+    if samples is None:
+        if wav_path is None:
+            return [], []
+        samples, sample_rate = wav_read_mono_float32(wav_path)
+    x = np.asarray(samples, dtype=np.float32)
+    sr = int(sample_rate)
+    n = len(x)
+    if n == 0 or sr <= 0:
+        return [], []
     hop = max(1, int(sr * (hop_ms / 1000.0)))
     win = max(1, int(sr * (win_ms / 1000.0)))
-    out_t: List[int] = []
-    out_v: List[float] = []
-    for start in range(0, len(samples), hop):
-        seg = samples[start : start + win]
-        if not seg:
-            break
-        ss = 0.0
-        for v in seg:
-            ss += v * v
-        rms = math.sqrt(ss / len(seg))
-        # normalize-ish
-        v = (rms - floor) * gain
-        v = _clamp(v, 0.0, 1.0)
-        out_t.append(int(round((start / sr) * 1000.0)))
-        out_v.append(v)
-    return out_t, out_v
+    starts = np.arange(0, n, hop)
+    ends = np.minimum(starts + win, n)
+    if win % hop == 0:
+        # Strided reduction: energy per hop block, then windows as sums of whole blocks.
+        blocks = np.zeros(len(starts) * hop, dtype=np.float64)
+        blocks[:n] = x
+        blocks = blocks.reshape(-1, hop)
+        energy = np.einsum("ij,ij->i", blocks, blocks)
+        k = win // hop
+        csum = np.concatenate(([0.0], np.cumsum(energy)))
+        idx = np.arange(len(starts))
+        sums = csum[np.minimum(idx + k, len(energy))] - csum[idx]
+    else:
+        # Windowed sum of squares via a prefix sum (windows are truncated at the end).
+        x64 = x.astype(np.float64)
+        csum = np.concatenate(([0.0], np.cumsum(x64 * x64)))
+        sums = csum[ends] - csum[starts]
+    rms = np.sqrt(np.maximum(sums, 0.0) / (ends - starts))
+    env = np.clip((rms - floor) * gain, 0.0, 1.0)
+    times = np.round((starts / sr) * 1000.0).astype(np.int64)
+    return times.tolist(), env.tolist()
 
 
 @dataclass
@@ -121,6 +125,39 @@ class LipSyncCurve:
         path.parent.mkdir(parents=True, exist_ok=True)
         path.write_text(json.dumps(self.to_json_dict(), ensure_ascii=False), encoding="utf-8")
 
+    def write_binary(self, path: Path, *, encoding: str = "u8") -> None:
+        """Write the compact LSC1 format (see lip_sync/curve_codec.py)."""
+        from .curve_codec import write_binary
+
+        write_binary(self, path, encoding=encoding)
+
+
+_VOWEL_KEYS = ("a", "i", "u", "e", "o")
+
+
+def _attack_release_filter_many(
+    targets: np.ndarray,
+    *,
+    fps: int,
+    attack_ms: int,
+    release_ms: int,
+) -> np.ndarray:
+    """One-pole attack/release smoothing of every row of `targets` (series x frames) at once."""
+    x = np.asarray(targets, dtype=np.float64)
+    if x.ndim != 2 or x.shape[1] == 0:
+        return x
+    dt = 1000.0 / float(fps)
+    a_up = 1.0 - math.exp(-dt / max(1.0, float(attack_ms)))
+    a_dn = 1.0 - math.exp(-dt / max(1.0, float(release_ms)))
+    # The recursion is sequential in time; iterate frames, vectorized over series.
+    cols = x.T.tolist()
+    cur = list(cols[0])
+    out = [cur]
+    for col in cols[1:]:
+        cur = [c + (t - c) * (a_up if t >= c else a_dn) for c, t in zip(cur, col)]
+        out.append(cur)
+    return np.asarray(out, dtype=np.float64).T
+
 
 def _attack_release_filter(
     *,
@@ -131,18 +168,42 @@ def _attack_release_filter(
 ) -> List[float]:
     if not targets:
         return []
+    return _attack_release_filter_many(
+        np.asarray([targets], dtype=np.float64), fps=fps, attack_ms=attack_ms, release_ms=release_ms
+    )[0].tolist()
+
+
+def _frame_times(duration_ms: int, fps: int) -> np.ndarray:
     dt = 1000.0 / float(fps)
-    a_up = 1.0 - math.exp(-dt / max(1.0, float(attack_ms)))
-    a_dn = 1.0 - math.exp(-dt / max(1.0, float(release_ms)))
-    cur = float(targets[0])
-    out = [cur]
-    for t in targets[1:]:
-        tgt = float(t)
-        if tgt >= cur:
-            cur = cur + (tgt - cur) * a_up
-        else:
-            cur = cur + (tgt - cur) * a_dn
-        out.append(float(cur))
+    n = max(1, int(math.ceil(duration_ms / dt)))
+    return np.round(np.arange(n) * dt).astype(np.int64)
+
+
+def _paint_intervals(times: np.ndarray, starts: np.ndarray, ends: np.ndarray, *, fill: int) -> np.ndarray:
+    """Per frame, index of the first interval (list order) with start <= t < end, else `fill`."""
+    out = np.full(len(times), int(fill), dtype=np.int64)
+    if len(starts) == 0:
+        return out
+    lo = np.searchsorted(times, starts, side="left")
+    hi = np.searchsorted(times, ends, side="left")
+    # Paint back to front so earlier intervals win where padded spans overlap.
+    for i in range(len(starts) - 1, -1, -1):
+        if hi[i] > lo[i]:
+            out[lo[i] : hi[i]] = i
+    return out
+
+
+def _envelope_at(times: np.ndarray, env_times: List[int], env: List[float], *, hop_ms: int = 10) -> np.ndarray:
+    """Envelope value at each frame (nearest hop, 0 where the envelope has no sample)."""
+    out = np.zeros(len(times), dtype=np.float64)
+    if not env_times:
+        return out
+    et = np.asarray(env_times, dtype=np.int64)
+    ev = np.asarray(env, dtype=np.float64)
+    keys = np.round(times / float(hop_ms)).astype(np.int64) * hop_ms
+    pos = np.minimum(np.searchsorted(et, keys, side="left"), len(et) - 1)
+    hit = et[pos] == keys
+    out[hit] = ev[pos[hit]]
     return out
 
 
@@ -154,6 +215,7 @@ def build_curve_from_timeline(
     phoneme_events: Optional[List[PhonemeEvent]] = None,
     viseme_events: Optional[List[VisemeEvent]] = None,
     wav_path_for_envelope: Optional[Path] = None,
+    envelope_audio: Optional[Tuple[np.ndarray, int]] = None,
     alpha_viseme_open: float = 0.75,
     speech_pad_ms: int = 60,
     attack_ms: int = 45,
@@ -165,34 +227,22 @@ def build_curve_from_timeline(
       1) viseme timing
       2) phoneme timing
       3) envelope only
+
+    `envelope_audio` (samples, sample_rate) takes precedence over reading
+    `wav_path_for_envelope`. Events are assigned to frames with
+    searchsorted/interval painting, so cost is O(frames + events).
     """
-    dt = 1000.0 / float(fps)
-    n = max(1, int(math.ceil(duration_ms / dt)))
-    times = [int(round(i * dt)) for i in range(n)]
+    times = _frame_times(duration_ms, fps)
+    n = len(times)
 
     # Envelope (fallback, and can be mixed into viseme_open)
-    env_by_ms: Dict[int, float] = {}
-    if wav_path_for_envelope:
-        et, ev = rms_envelope(wav_path=wav_path_for_envelope)
-        for t, v in zip(et, ev):
-            env_by_ms[int(t)] = float(v)
-
-    def env_at(t_ms: int) -> float:
-        if not env_by_ms:
-            return 0.0
-        hop = 10
-        k = int(round(t_ms / hop) * hop)
-        return float(env_by_ms.get(k, 0.0))
-
-    # Build pose targets per frame
-    mouth_open_tgt: List[float] = []
-    mouth_form_tgt: List[float] = []
-    smile_tgt: List[float] = []
-    vowel_a_tgt: List[float] = []
-    vowel_i_tgt: List[float] = []
-    vowel_u_tgt: List[float] = []
-    vowel_e_tgt: List[float] = []
-    vowel_o_tgt: List[float] = []
+    env = np.zeros(n, dtype=np.float64)
+    if envelope_audio is not None or wav_path_for_envelope:
+        if envelope_audio is not None:
+            et, ev = rms_envelope(samples=envelope_audio[0], sample_rate=envelope_audio[1])
+        else:
+            et, ev = rms_envelope(wav_path=wav_path_for_envelope)
+        env = _envelope_at(times, et, ev)
 
     mode = "envelope"
 
@@ -209,105 +259,83 @@ def build_curve_from_timeline(
         if visemes_sorted:
             mode = "viseme"
 
-    def pose_at(t: int) -> MouthPose:
-        # pad around speech boundaries to avoid snapping
-        t2 = t
-        if visemes_sorted:
-            # find last viseme <= t
-            last = None
-            for ev in visemes_sorted:
-                if ev.time_ms <= t2:
-                    last = ev
-                else:
-                    break
-            if last is None:
-                return mapper.pose_for_viseme_id("sil")
-            p = mapper.pose_for_viseme_id(last.viseme_id)
-            if last.intensity is not None:
+    # Pose table: one row per event, plus the silent pose in the last row.
+    poses: List[MouthPose] = []
+    vowel_of: List[Optional[str]] = []
+    if visemes_sorted:
+        for ev in visemes_sorted:
+            p = mapper.pose_for_viseme_id(ev.viseme_id)
+            if ev.intensity is not None:
                 p = MouthPose(
-                    mouth_open=_clamp(p.mouth_open * float(last.intensity), 0.0, 1.0),
+                    mouth_open=_clamp(p.mouth_open * float(ev.intensity), 0.0, 1.0),
                     mouth_form=p.mouth_form,
                     smile=p.smile,
                 )
-            return p
-
+            poses.append(p)
+            k = (ev.viseme_id or "").strip().lower()
+            vowel_of.append(k if k in _VOWEL_KEYS else None)
+        poses.append(mapper.pose_for_viseme_id("sil"))
+        vowel_of.append(None)
+        # Last viseme at or before each frame (held until the next one).
+        last = np.searchsorted(
+            np.asarray([float(ev.time_ms) for ev in visemes_sorted], dtype=np.float64), times, side="right"
+        ) - 1
+        pose_idx = np.where(last < 0, len(visemes_sorted), last)
+        vowel_idx = pose_idx
+    else:
+        pose_idx = np.full(n, len(phoneme_spans), dtype=np.int64)
         if phoneme_spans:
-            # linear scan is fine for MVP sizes; optimize later if needed
-            for s, e, p in phoneme_spans:
-                if (s - speech_pad_ms) <= t2 < (e + speech_pad_ms):
-                    return p
-            return mapper.pose_for_phoneme("sil")
-
-        return mapper.pose_for_phoneme("sil")
-
-    def _active_vowel_key_at(t: int) -> Optional[str]:
-        """Return active vowel key a/i/u/e/o when the timeline suggests one."""
-        t2 = t
-        if visemes_sorted:
-            last = None
-            for ev in visemes_sorted:
-                if ev.time_ms <= t2:
-                    last = ev
-                else:
-                    break
-            if last is None:
-                return None
-            k = (last.viseme_id or "").strip().lower()
-            return k if k in ("a", "i", "u", "e", "o") else None
-
-        if phoneme_events:
-            # Use raw phoneme events as timing oracle.
-            for ev in phoneme_events:
-                if (ev.start_ms - speech_pad_ms) <= t2 < (ev.end_ms + speech_pad_ms):
-                    k = (ev.phoneme or "").strip().lower()
-                    return k if k in ("a", "i", "u", "e", "o") else None
-        return None
-
-    for t in times:
-        p = pose_at(t)
-        vis_open = float(_clamp(p.mouth_open, 0.0, 1.0))
-        form = float(_clamp(p.mouth_form, -1.0, 1.0))
-        sm = float(_clamp(p.smile, 0.0, 1.0))
-        env = env_at(t)
-        # Mix envelope as robustness (prevents open=0 during strong consonants)
-        open_v = _clamp(alpha_viseme_open * vis_open + (1.0 - alpha_viseme_open) * env, 0.0, 1.0)
-        mouth_open_tgt.append(open_v)
-        mouth_form_tgt.append(form)
-        smile_tgt.append(sm)
-
-        # Per-vowel activation (for models exposing ParamMouthA/I/U/E/O).
-        # Drive it from the same audio-timeline oracle; scale by mouth openness.
-        k = _active_vowel_key_at(t)
-        vowel_a_tgt.append(open_v if k == "a" else 0.0)
-        vowel_i_tgt.append(open_v if k == "i" else 0.0)
-        vowel_u_tgt.append(open_v if k == "u" else 0.0)
-        vowel_e_tgt.append(open_v if k == "e" else 0.0)
-        vowel_o_tgt.append(open_v if k == "o" else 0.0)
-
-    # Smooth (attack/release)
-    mouth_open = _attack_release_filter(targets=mouth_open_tgt, fps=fps, attack_ms=attack_ms, release_ms=release_ms)
-    mouth_form = _attack_release_filter(targets=mouth_form_tgt, fps=fps, attack_ms=attack_ms, release_ms=release_ms)
-    smile = _attack_release_filter(targets=smile_tgt, fps=fps, attack_ms=attack_ms, release_ms=release_ms)
-    vowel_a = _attack_release_filter(targets=vowel_a_tgt, fps=fps, attack_ms=attack_ms, release_ms=release_ms)
-    vowel_i = _attack_release_filter(targets=vowel_i_tgt, fps=fps, attack_ms=attack_ms, release_ms=release_ms)
-    vowel_u = _attack_release_filter(targets=vowel_u_tgt, fps=fps, attack_ms=attack_ms, release_ms=release_ms)
-    vowel_e = _attack_release_filter(targets=vowel_e_tgt, fps=fps, attack_ms=attack_ms, release_ms=release_ms)
-    vowel_o = _attack_release_filter(targets=vowel_o_tgt, fps=fps, attack_ms=attack_ms, release_ms=release_ms)
+            poses = [p for _s, _e, p in phoneme_spans]
+            pose_idx = _paint_intervals(
+                times,
+                np.asarray([s - speech_pad_ms for s, _e, _p in phoneme_spans], dtype=np.int64),
+                np.asarray([e + speech_pad_ms for _s, e, _p in phoneme_spans], dtype=np.int64),
+                fill=len(phoneme_spans),
+            )
+        poses.append(mapper.pose_for_phoneme("sil"))
+        # Raw phoneme events are the timing oracle for the vowel series.
+        events = list(phoneme_events or [])
+        for ev in events:
+            k = (ev.phoneme or "").strip().lower()
+            vowel_of.append(k if k in _VOWEL_KEYS else None)
+        vowel_of.append(None)
+        vowel_idx = _paint_intervals(
+            times,
+            np.asarray([float(ev.start_ms) - speech_pad_ms for ev in events], dtype=np.float64),
+            np.asarray([float(ev.end_ms) + speech_pad_ms for ev in events], dtype=np.float64),
+            fill=len(events),
+        )
+
+    table = np.asarray([[p.mouth_open, p.mouth_form, p.smile] for p in poses], dtype=np.float64)
+    table[:, 0] = np.clip(table[:, 0], 0.0, 1.0)
+    table[:, 1] = np.clip(table[:, 1], -1.0, 1.0)
+    table[:, 2] = np.clip(table[:, 2], 0.0, 1.0)
+    framewise = table[pose_idx]
+
+    # Mix envelope as robustness (prevents open=0 during strong consonants)
+    open_v = np.clip(alpha_viseme_open * framewise[:, 0] + (1.0 - alpha_viseme_open) * env, 0.0, 1.0)
+
+    # Per-vowel activation (for models exposing ParamMouthA/I/U/E/O).
+    # Drive it from the same audio-timeline oracle; scale by mouth openness.
+    vowel_codes = np.asarray([_VOWEL_KEYS.index(k) if k else -1 for k in vowel_of], dtype=np.int64)
+    frame_vowel = vowel_codes[vowel_idx]
+
+    targets = np.empty((3 + len(_VOWEL_KEYS), n), dtype=np.float64)
+    targets[0] = open_v
+    targets[1] = framewise[:, 1]
+    targets[2] = framewise[:, 2]
+    for j in range(len(_VOWEL_KEYS)):
+        targets[3 + j] = np.where(frame_vowel == j, open_v, 0.0)
+
+    # Smooth (attack/release), all series in one pass
+    smoothed = _attack_release_filter_many(targets, fps=fps, attack_ms=attack_ms, release_ms=release_ms)
+    names = ["mouth_open", "mouth_form", "smile"] + [f"vowel_{k}" for k in _VOWEL_KEYS]
 
     return LipSyncCurve(
         fps=fps,
         duration_ms=duration_ms,
         mode=mode,
-        series={
-            "mouth_open": mouth_open,
-            "mouth_form": mouth_form,
-            "smile": smile,
-            "vowel_a": vowel_a,
-            "vowel_i": vowel_i,
-            "vowel_u": vowel_u,
-            "vowel_e": vowel_e,
-            "vowel_o": vowel_o,
-        },
+        series={name: smoothed[i].tolist() for i, name in enumerate(names)},
         meta={
             "alpha_viseme_open": alpha_viseme_open,
             "speech_pad_ms": speech_pad_ms,
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from .curve import LipSyncCurve
+
+# Compact lip-sync curve format ("LSC1"), little-endian:
+#
+#   0  4s  magic b"LSC1"
+#   4  u8  version (1)
+#   5  u8  encoding (1 = uint8 quantized, 2 = float16)
+#   6  u8  channel count
+#   7  u8  reserved
+#   8  u16 fps
+#  10  u16 header length in bytes (offset of the first frame)
+#  12  u32 duration_ms
+#  16  u32 frame count
+#  20  per channel: f32 lo, f32 hi, u8 name length, name (utf-8)
+#
+# Frames follow the header interleaved (frame 0 all channels, frame 1, ...),
+# so any prefix of the stream is a usable curve. uint8 values map linearly
+# onto [lo, hi]; float16 values are stored as-is (lo/hi informational).
+
+MAGIC = b"LSC1"
+VERSION = 1
+ENCODING_U8 = 1
+ENCODING_F16 = 2
+ENCODINGS = {"u8": ENCODING_U8, "f16": ENCODING_F16}
+
+_FIXED_HEADER = struct.Struct("<4sBBBBHHII")
+_CHANNEL = struct.Struct("<ffB")
+
+# Value range per series (quantization bounds); anything else is [0, 1].
+SERIES_RANGES: Dict[str, Tuple[float, float]] = {"mouth_form": (-1.0, 1.0)}
+
+
+def _encoding_id(encoding: str) -> int:
+    enc = ENCODINGS.get(str(encoding or "").strip().lower())
+    if enc is None:
+        raise ValueError(f"Unknown lip-sync curve encoding: {encoding!r} (expected one of {sorted(ENCODINGS)})")
+    return enc
+
+
+def encode_header(curve: LipSyncCurve, *, encoding: str = "u8") -> bytes:
+    names = list(curve.series.keys())
+    n_frames = max((len(v) for v in curve.series.values()), default=0)
+    channels = b""
+    for name in names:
+        lo, hi = SERIES_RANGES.get(name, (0.0, 1.0))
+        raw = name.encode("utf-8")
+        channels += _CHANNEL.pack(lo, hi, len(raw)) + raw
+    header_len = _FIXED_HEADER.size + len(channels)
+    return (
+        _FIXED_HEADER.pack(
+            MAGIC,
+            VERSION,
+            _encoding_id(encoding),
+            len(names),
+            0,
+            int(curve.fps),
+            header_len,
+            int(curve.duration_ms),
+            n_frames,
+        )
+        + channels
+    )
+
+
+def _frames_matrix(curve: LipSyncCurve) -> np.ndarray:
+    """(frames, channels) float64; shorter series are held at their last value."""
+    names = list(curve.series.keys())
+    n = max((len(v) for v in curve.series.values()), default=0)
+    out = np.zeros((n, len(names)), dtype=np.float64)
+    for j, name in enumerate(names):
+        v = np.asarray(curve.series[name], dtype=np.float64)
+        if len(v):
+            out[: len(v), j] = v
+            out[len(v) :, j] = v[-1]
+    return out
+
+
+def encode_frames(curve: LipSyncCurve, *, encoding: str = "u8") -> np.ndarray:
+    """Encoded frame data as a (frames, channels) array of the on-disk dtype."""
+    enc = _encoding_id(encoding)
+    m = _frames_matrix(curve)
+    if enc == ENCODING_F16:
+        return m.astype("<f2")
+    bounds = np.asarray([SERIES_RANGES.get(name, (0.0, 1.0)) for name in curve.series.keys()], dtype=np.float64)
+    lo = bounds[:, 0] if len(bounds) else np.zeros(0)
+    span = (bounds[:, 1] - bounds[:, 0]) if len(bounds) else np.ones(0)
+    q = np.rint((m - lo) / np.where(span > 0, span, 1.0) * 255.0)
+    return np.clip(q, 0, 255).astype(np.uint8)
+
+
+def _chunks(header: bytes, frames: np.ndarray, step: int) -> Iterator[bytes]:
+    yield header
+    for i in range(0, len(frames), step):
+        yield frames[i : i + step].tobytes()
+
+
+def iter_binary_chunks(curve: LipSyncCurve, *, encoding: str = "u8", chunk_frames: int = 256) -> Iterator[bytes]:
+    """Header, then frame data in chunks (for writing or a streaming response).
+
+    Encoding happens up front, so a bad `encoding` raises ValueError here
+    rather than mid-stream.
+    """
+    header = encode_header(curve, encoding=encoding)
+    frames = encode_frames(curve, encoding=encoding)
+    return _chunks(header, frames, max(1, int(chunk_frames)))
+
+
+def encode_curve(curve: LipSyncCurve, *, encoding: str = "u8") -> bytes:
+    return b"".join(iter_binary_chunks(curve, encoding=encoding, chunk_frames=1 << 30))
+
+
+def write_binary(curve: LipSyncCurve, path: Path, *, encoding: str = "u8") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        for chunk in iter_binary_chunks(curve, encoding=encoding):
+            f.write(chunk)
+    tmp.replace(path)
+
+
+def decode_curve(data: bytes) -> LipSyncCurve:
+    """Parse an LSC1 payload (a truncated stream yields the complete frames)."""
+    buf = memoryview(data)
+    if len(buf) < _FIXED_HEADER.size:
+        raise ValueError("lip-sync curve payload too short")
+    magic, version, enc, n_ch, _r, fps, header_len, duration_ms, n_frames = _FIXED_HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("not a lip-sync curve payload")
+    if version != VERSION:
+        raise ValueError(f"unsupported lip-sync curve version: {version}")
+    if enc not in (ENCODING_U8, ENCODING_F16):
+        raise ValueError(f"unsupported lip-sync curve encoding: {enc}")
+
+    off = _FIXED_HEADER.size
+    names: List[str] = []
+    bounds: List[Tuple[float, float]] = []
+    for _ in range(n_ch):
+        lo, hi, name_len = _CHANNEL.unpack_from(buf, off)
+        off += _CHANNEL.size
+        names.append(bytes(buf[off : off + name_len]).decode("utf-8"))
+        bounds.append((lo, hi))
+        off += name_len
+
+    dtype = np.dtype(np.uint8) if enc == ENCODING_U8 else np.dtype("<f2")
+    frame_bytes = max(1, n_ch * dtype.itemsize)
+    avail = max(0, min(int(n_frames), (len(buf) - int(header_len)) // frame_bytes))
+    raw = np.frombuffer(buf, dtype=dtype, count=avail * n_ch, offset=int(header_len)).reshape(avail, n_ch)
+    vals = raw.astype(np.float64)
+    if enc == ENCODING_U8 and n_ch:
+        b = np.asarray(bounds, dtype=np.float64)
+        vals = b[:, 0] + vals / 255.0 * (b[:, 1] - b[:, 0])
+
+    return LipSyncCurve(
+        fps=int(fps),
+        duration_ms=int(duration_ms),
+        mode="",
+        series={name: vals[:, j].tolist() for j, name in enumerate(names)},
+        meta={"format": "lsc1", "encoding": "u8" if enc == ENCODING_U8 else "f16"},
+    )
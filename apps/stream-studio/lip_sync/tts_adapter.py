@@ -5,6 +5,8 @@ import io
 import wave
 from typing import List, Optional, Protocol
 
+from tts.client_pool import get_google_tts_pool
+
 from .aligner import PhonemeEvent
 from .mapper import VisemeEvent
 
@@ -101,35 +103,20 @@ class GoogleCloudTextToSpeechAdapter:
         emotion_tags: Optional[list[str]] = None,
     ) -> TTSResult:
         try:
-            from google.cloud import texttospeech  # type: ignore
+            from google.cloud import texttospeech  # type: ignore  # noqa: F401
         except Exception as e:
             raise RuntimeError("google-cloud-texttospeech is not installed/configured") from e
 
-        client = texttospeech.TextToSpeechClient()
-        synthesis_input = texttospeech.SynthesisInput(text=text)
-        voice_params = texttospeech.VoiceSelectionParams(
+        # LINEAR16 PCM from the shared long-lived client, wrapped into WAV
+        pcm = get_google_tts_pool().synthesize_linear16(
+            text=text,
             language_code=self.language_code,
-            name=voice_id or self.voice_name or "",
-        )
-
-        # LINEAR16 PCM, wrap into WAV
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.LINEAR16,
-            sample_rate_hertz=int(self.sample_rate_hz),
+            voice_name=voice_id or self.voice_name or "",
+            sample_rate_hz=int(self.sample_rate_hz),
             speaking_rate=float(speed) if speed is not None else 1.0,
             pitch=float(pitch) if pitch is not None else 0.0,
         )
 
-        response = client.synthesize_speech(
-            input=synthesis_input,
-            voice=voice_params,
-            audio_config=audio_config,
-        )
-
-        pcm = response.audio_content or b""
-        if len(pcm) % 2 == 1:
-            pcm = pcm[:-1]
-
         buf = io.BytesIO()
         with wave.open(buf, "wb") as wf:
             wf.setnchannels(1)
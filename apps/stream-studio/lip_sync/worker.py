@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from core.metrics import get_metrics
+
+# Aligned (upgraded) lip-sync curves are computed here, off the audio
+# publication path. Audio goes out with a provisional envelope-only curve;
+# the aligned one replaces it when ready.
+
+_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def lipsync_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = max(1, int(os.getenv("AITUBER_LIPSYNC_WORKERS", "2") or 2))
+            _executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lipsync")
+        return _executor
+
+
+def submit_upgrade(
+    build: Callable[[], Optional[str]],
+    on_ready: Callable[[str], None],
+) -> concurrent.futures.Future:
+    """Run `build()` (returns the aligned curve's web path or None) on the pool,
+    then hand a non-empty path to `on_ready`. Never raises into the caller.
+    """
+
+    def _run() -> Optional[str]:
+        m = get_metrics()
+        t0 = time.perf_counter()
+        try:
+            path = build()
+        except Exception:
+            path = None
+        m.observe_latency("lipsync_upgrade", (time.perf_counter() - t0) * 1000.0)
+        if not path:
+            m.inc("lipsync_upgrades_total", result="empty")
+            return None
+        try:
+            on_ready(path)
+        except Exception:
+            m.inc("errors_total", source="lipsync", phase="upgrade_publish")
+            return None
+        m.inc("lipsync_upgrades_total", result="ok")
+        return path
+
+    return lipsync_executor().submit(_run)
@@ -11,6 +11,8 @@ import threading
 
 from pydantic import BaseModel, Field
 
+from llm.genai_pool import call_with_timeout, get_genai_client
+
 
 class AnimationSelectOut(BaseModel):
     expression: str = Field(default="")
@@ -153,24 +155,9 @@ def _heuristic_fallback(
 _cooldown_lock = threading.Lock()
 _cooldown_until: float = 0.0
 
-_client_lock = threading.Lock()
-_client_cache: Dict[str, Any] = {}
-
-
 def _get_genai_client(api_key: str) -> Any:
-    # Cache clients to reduce per-request overhead.
-    key = (api_key or "").strip()
-    if not key:
-        return None
-    with _client_lock:
-        c = _client_cache.get(key)
-        if c is not None:
-            return c
-        from google import genai
-
-        c = genai.Client(api_key=key)
-        _client_cache[key] = c
-        return c
+    # Shared process-wide client (see llm.genai_pool).
+    return get_genai_client(api_key)
 
 
 def _in_cooldown() -> bool:
@@ -318,25 +305,16 @@ def select_animation(
 
     last_err: Optional[str] = None
     try:
-        ex = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-        fut = ex.submit(
+        # Shared pool: a hung call never blocks request completion.
+        text = call_with_timeout(
             _call_gemini_text,
+            timeout_seconds,
             api_key=api_key,
             model=config.model,
             system_prompt=sys,
             user_text=prompt,
             generation_config=gen_cfg,
         )
-        try:
-            text = fut.result(timeout=timeout_seconds)
-        finally:
-            # IMPORTANT: If the LLM call is hung, the worker thread may not stop.
-            # Never block request completion waiting for executor teardown.
-            try:
-                fut.cancel()
-            except Exception:
-                pass
-            ex.shutdown(wait=False, cancel_futures=True)
 
         if not text:
             last_err = "empty_response"
@@ -4,9 +4,10 @@ import concurrent.futures
 import json
 from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 from core.prompts import read_prompt_text
+from llm.genai_pool import call_with_timeout, get_genai_client, stream_content
 from llm.mvp_models import LLMOut
 
 
@@ -121,9 +122,7 @@ class GeminiMVP:
         last_err: Optional[str] = None
         for _attempt in range(2):
             try:
-                from google import genai
-
-                client = genai.Client(api_key=self.api_key)
+                client = get_genai_client(self.api_key)
 
                 def _call() -> Any:
                     kwargs: Dict[str, Any] = {
@@ -165,9 +164,7 @@ class GeminiMVP:
                         }
                         return client.models.generate_content(**kwargs3)
 
-                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ex:
-                    fut = ex.submit(_call)
-                    resp = fut.result(timeout=timeout_seconds)
+                resp = call_with_timeout(_call, timeout_seconds)
                 text = self._resp_to_text(resp)
                 if not text:
                     last_err = "empty_response"
@@ -200,6 +197,63 @@ class GeminiMVP:
             reason = (reason + " | " + last_err)[:220]
         return self._fallback(user_text=user_text, reason=reason)
 
+    def generate_text(self, *, prompt: str, system_prompt: str = "", timeout_seconds: float = 20) -> str:
+        """Plain-text completion for background tasks (e.g. summaries); "" on failure."""
+        if not (self.api_key or "").strip() or not (prompt or "").strip():
+            return ""
+        try:
+            client = get_genai_client(self.api_key)
+            kwargs = self._request_kwargs(text=prompt, system_prompt=system_prompt)
+            resp = call_with_timeout(client.models.generate_content, timeout_seconds, **kwargs)
+            return self._resp_to_text(resp)
+        except Exception:
+            return ""
+
+    def generate_stream(
+        self, *, user_text: str, rag_context: str, vlm_summary: str, chunk_timeout_seconds: float = 20
+    ) -> Iterator[str]:
+        """Yield reply text as the model produces it (same prompt as `generate_full`).
+
+        Raises on failure; callers fall back to `generate_full` when nothing was yielded.
+        """
+        if not (self.api_key or "").strip():
+            raise RuntimeError("missing_api_key")
+        sys = (self.system_prompt or "").strip() or read_prompt_text(name="llm_system").strip()
+        body = self._build_prompt(
+            user_text=user_text,
+            rag_context=rag_context,
+            vlm_summary=vlm_summary,
+            system_prompt=None,
+        )
+        kwargs = self._request_kwargs(text=body, system_prompt=sys)
+        for chunk in stream_content(self.api_key, timeout=chunk_timeout_seconds, **kwargs):
+            text = self._resp_to_text_raw(chunk)
+            if text:
+                yield text
+
+    def _request_kwargs(self, *, text: str, system_prompt: str) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "contents": [{"role": "user", "parts": [{"text": text}]}],
+        }
+        config: Dict[str, Any] = dict(self.generation_config or {})
+        if system_prompt:
+            config["system_instruction"] = system_prompt
+        if config:
+            kwargs["config"] = config
+        return kwargs
+
+    @staticmethod
+    def _resp_to_text_raw(chunk: Any) -> str:
+        """Chunk text without stripping (whitespace between stream chunks matters)."""
+        try:
+            t = getattr(chunk, "text", None)
+            if isinstance(t, str):
+                return t
+        except Exception:
+            pass
+        return GeminiMVP._resp_to_text(chunk)
+
     def _wrap_plain_text(self, *, text: str, reason: str) -> LLMOut:
         t = (text or "").strip()
         if not t:
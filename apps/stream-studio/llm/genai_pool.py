@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import os
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from core.metrics import get_metrics
+
+# One google-genai client per API key for the whole process. The client owns
+# its HTTP connection pool, so reusing it keeps TLS sessions alive between
+# LLM/VLM calls instead of reconnecting on every request.
+_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+_client_factory: Optional[Callable[[str], Any]] = None
+
+_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_DEFAULT_WORKERS = 8
+
+
+def _default_factory(api_key: str) -> Any:
+    from google import genai
+
+    return genai.Client(api_key=api_key)
+
+
+def set_client_factory(factory: Optional[Callable[[str], Any]]) -> None:
+    """Override client construction (tests); clears cached clients."""
+    global _client_factory
+    with _clients_lock:
+        _client_factory = factory
+        _clients.clear()
+
+
+def get_genai_client(api_key: str) -> Any:
+    """Shared client for `api_key`, or None when the key is empty."""
+    key = (api_key or "").strip()
+    if not key:
+        return None
+    with _clients_lock:
+        c = _clients.get(key)
+        if c is None:
+            c = (_client_factory or _default_factory)(key)
+            _clients[key] = c
+            get_metrics().inc("genai_clients_created_total")
+        return c
+
+
+def reset_clients() -> None:
+    with _clients_lock:
+        _clients.clear()
+
+
+def genai_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Bounded pool used to enforce timeouts on blocking SDK calls."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            try:
+                n = int((os.getenv("AITUBER_GENAI_WORKERS", "") or "").strip() or _DEFAULT_WORKERS)
+            except Exception:
+                n = _DEFAULT_WORKERS
+            _executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(64, n)), thread_name_prefix="genai")
+        return _executor
+
+
+def call_with_timeout(fn: Callable[..., Any], timeout: float, *args: Any, **kwargs: Any) -> Any:
+    """Run `fn` on the shared pool; raises concurrent.futures.TimeoutError.
+
+    A hung call keeps its worker until the SDK returns, but the caller never
+    waits for it (unlike a per-call `with ThreadPoolExecutor()` block).
+    """
+    fut = genai_executor().submit(fn, *args, **kwargs)
+    try:
+        return fut.result(timeout=max(0.0, float(timeout)))
+    except concurrent.futures.TimeoutError:
+        fut.cancel()
+        get_metrics().inc("genai_timeouts_total")
+        raise
+
+
+def generate_content(api_key: str, *, timeout: float, **kwargs: Any) -> Any:
+    """`client.models.generate_content(**kwargs)` with a hard timeout."""
+    client = get_genai_client(api_key)
+    if client is None:
+        raise RuntimeError("missing_api_key")
+    return call_with_timeout(client.models.generate_content, timeout, **kwargs)
+
+
+class _StreamFailure:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+_STREAM_END = object()
+
+
+def stream_content(api_key: str, *, timeout: float, **kwargs: Any) -> Iterator[Any]:
+    """Iterate `client.models.generate_content_stream(**kwargs)` chunks.
+
+    The SDK iterator is drained on the shared pool so a slow consumer (TTS)
+    never stalls the HTTP stream; `timeout` bounds the wait for each chunk.
+    Closing the generator early stops the pump at the next chunk.
+    """
+    client = get_genai_client(api_key)
+    if client is None:
+        raise RuntimeError("missing_api_key")
+    q: "queue.Queue[Any]" = queue.Queue()
+    stop = threading.Event()
+
+    def _pump() -> None:
+        try:
+            for chunk in client.models.generate_content_stream(**kwargs):
+                if stop.is_set():
+                    break
+                q.put(chunk)
+        except BaseException as e:  # noqa: BLE001 - re-raised in the consumer
+            q.put(_StreamFailure(e))
+        finally:
+            q.put(_STREAM_END)
+
+    genai_executor().submit(_pump)
+    try:
+        while True:
+            try:
+                item = q.get(timeout=max(0.0, float(timeout)))
+            except queue.Empty:
+                get_metrics().inc("genai_timeouts_total")
+                raise concurrent.futures.TimeoutError(f"no stream chunk within {timeout}s")
+            if item is _STREAM_END:
+                return
+            if isinstance(item, _StreamFailure):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+
+
+async def agenerate_content(api_key: str, *, timeout: float, **kwargs: Any) -> Any:
+    """Async variant: uses the SDK's `client.aio` when present, else the shared pool."""
+    client = get_genai_client(api_key)
+    if client is None:
+        raise RuntimeError("missing_api_key")
+    aio = getattr(client, "aio", None)
+    if aio is not None:
+        coro = aio.models.generate_content(**kwargs)
+    else:
+        coro = asyncio.wrap_future(genai_executor().submit(lambda: client.models.generate_content(**kwargs)))
+    try:
+        return await asyncio.wait_for(coro, timeout=max(0.0, float(timeout)))
+    except asyncio.TimeoutError:
+        get_metrics().inc("genai_timeouts_total")
+        raise
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from llm.mvp_models import LLMOut
+
+# Sentence boundaries used for TTS segmentation (kept in sync with the
+# non-streaming `segments` mode).
+SENTENCE_SEPARATORS = frozenset(["。", "、", "?", "？", "!", "！", "\n"])
+
+# Acknowledgements models sometimes prepend; never spoken.
+ACK_PREFIXES = (
+    "了解です。",
+    "了解しました。",
+    "承知しました。",
+    "かしこまりました。",
+    "はい。",
+)
+
+_SPEECH_KEYS = ("speech_text", "response")
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+def split_sentences(text: str) -> Tuple[List[str], str]:
+    """Return (completed_sentences, remainder)."""
+    if not text:
+        return [], ""
+    out: List[str] = []
+    start = 0
+    for i, ch in enumerate(text):
+        if ch in SENTENCE_SEPARATORS:
+            s = text[start : i + 1].strip()
+            start = i + 1
+            if s:
+                out.append(s)
+    return out, text[start:]
+
+
+class SentenceSegmenter:
+    """Incremental `split_sentences`: feed text deltas, get completed sentences."""
+
+    def __init__(self) -> None:
+        self._buf = ""
+
+    def feed(self, delta: str) -> List[str]:
+        if not delta:
+            return []
+        sents, self._buf = split_sentences(self._buf + delta)
+        return sents
+
+    def flush(self) -> List[str]:
+        rest = self._buf.strip()
+        self._buf = ""
+        return [rest] if rest else []
+
+
+class LeadingSpeechFilter:
+    """Streaming counterpart of the TTS preamble sanitizer.
+
+    Holds text back only while it could still be an echoed system prompt or
+    an acknowledgement prefix; once the reply diverges, everything passes
+    through unchanged.
+    """
+
+    def __init__(self, *, system_prompt: str = "", ack_prefixes: Tuple[str, ...] = ACK_PREFIXES) -> None:
+        self.system_prompt = (system_prompt or "").strip()
+        self.ack_prefixes = tuple(p for p in ack_prefixes if p)
+        self._held = ""
+        self._open = False
+
+    def feed(self, delta: str) -> str:
+        if self._open:
+            return delta or ""
+        self._held += delta or ""
+        while True:
+            acc = self._held.lstrip()
+            if not acc:
+                return ""
+            candidates = self.ack_prefixes + ((self.system_prompt,) if self.system_prompt else ())
+            stripped = False
+            for p in candidates:
+                if acc.startswith(p):
+                    self._held = acc[len(p) :]
+                    stripped = True
+                    break
+            if stripped:
+                continue
+            if any(p.startswith(acc) for p in candidates):
+                return ""
+            self._open = True
+            self._held = ""
+            return acc
+
+    def flush(self) -> str:
+        if self._open:
+            return ""
+        rest = self._held.strip()
+        self._held = ""
+        # Ended while still matching a prefix: a bare acknowledgement is dropped,
+        # a partial one is real text.
+        if rest in self.ack_prefixes or rest == self.system_prompt:
+            return ""
+        return rest
+
+
+def _decode_json_string(buf: str, pos: int) -> Tuple[str, int, bool]:
+    """Decode a JSON string body from `buf[pos:]` as far as it is complete.
+
+    Returns (decoded, next_pos, closed). Stops before a partial escape.
+    """
+    out: List[str] = []
+    i = pos
+    n = len(buf)
+    while i < n:
+        ch = buf[i]
+        if ch == '"':
+            return "".join(out), i + 1, True
+        if ch != "\\":
+            out.append(ch)
+            i += 1
+            continue
+        if i + 1 >= n:
+            break
+        esc = buf[i + 1]
+        if esc == "u":
+            if i + 6 > n:
+                break
+            try:
+                code = int(buf[i + 2 : i + 6], 16)
+            except ValueError:
+                code = 0xFFFD
+            if 0xD800 <= code < 0xDC00:
+                # Surrogate pair: wait for the low half.
+                if i + 12 > n:
+                    break
+                if buf[i + 6 : i + 8] == "\\u":
+                    try:
+                        low = int(buf[i + 8 : i + 12], 16)
+                    except ValueError:
+                        low = 0
+                    if 0xDC00 <= low < 0xE000:
+                        out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                        i += 12
+                        continue
+                code = 0xFFFD
+            out.append(chr(code))
+            i += 6
+            continue
+        out.append(_ESCAPES.get(esc, esc))
+        i += 2
+    return "".join(out), i, False
+
+
+def _strip_fence(text: str) -> str:
+    t = (text or "").strip()
+    if t.startswith("```"):
+        t = t.split("\n", 1)[1] if "\n" in t else ""
+        if t.rstrip().endswith("```"):
+            t = t.rstrip()[:-3]
+    return t.strip()
+
+
+def _partial_field(text: str, key: str) -> Optional[str]:
+    m = re.search(r'"' + re.escape(key) + r'"\s*:\s*"', text)
+    if not m:
+        return None
+    val, _pos, _closed = _decode_json_string(text, m.end())
+    return val
+
+
+def _partial_list(text: str, key: str) -> List[str]:
+    m = re.search(r'"' + re.escape(key) + r'"\s*:\s*\[([^\]]*)', text)
+    if not m:
+        return []
+    return [s for s in re.findall(r'"((?:[^"\\]|\\.)*)"', m.group(1)) if s]
+
+
+class StreamingReplyParser:
+    """Incremental reader for a model reply that is either JSON or plain text.
+
+    `feed()` returns the newly available part of the spoken text: the
+    `speech_text` string value in JSON replies (decoded as it streams, even
+    before the object is closed) or the raw text otherwise. `finish()`
+    parses the complete reply, tolerating truncated JSON.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._mode = ""  # "", "json" or "text"
+        self._pos = -1  # decode position inside the speech string once found
+        self._closed = False
+        self._decoded = ""
+        self._emitted = ""
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def _speech_so_far(self) -> str:
+        if self._mode == "text":
+            return self._text
+        if self._pos < 0:
+            for key in _SPEECH_KEYS:
+                m = re.search(r'"' + key + r'"\s*:\s*"', self._text)
+                if m:
+                    self._pos = m.end()
+                    break
+            if self._pos < 0:
+                return ""
+        if not self._closed:
+            val, self._pos, self._closed = _decode_json_string(self._text, self._pos)
+            self._decoded += val
+        return self._decoded
+
+    def feed(self, chunk: str) -> str:
+        if not chunk:
+            return ""
+        self._text += chunk
+        if not self._mode:
+            head = self._text.lstrip()
+            if not head:
+                return ""
+            if head[0] in "{`":
+                self._mode = "json"
+            else:
+                self._mode = "text"
+                # Plain replies keep their leading whitespace out of speech.
+                self._text = head
+        speech = self._speech_so_far()
+        if len(speech) <= len(self._emitted):
+            return ""
+        delta = speech[len(self._emitted) :]
+        self._emitted = speech
+        return delta
+
+    def finish(self) -> Tuple[str, Dict[str, Any]]:
+        """Return (unspoken speech tail, fields) for the complete reply."""
+        fields = self.fields()
+        speech = str(fields.get("speech_text") or "")
+        tail = speech[len(self._emitted) :] if speech.startswith(self._emitted) else ""
+        self._emitted += tail
+        return tail, fields
+
+    def fields(self) -> Dict[str, Any]:
+        if self._mode != "json":
+            return {"speech_text": self._text.strip()}
+        body = _strip_fence(self._text)
+        obj: Any = None
+        try:
+            obj = json.loads(body)
+        except Exception:
+            start, end = body.find("{"), body.rfind("}")
+            if start >= 0 and end > start:
+                try:
+                    obj = json.loads(body[start : end + 1])
+                except Exception:
+                    obj = None
+        if isinstance(obj, dict):
+            out = dict(obj)
+            if not isinstance(out.get("speech_text"), str) and isinstance(out.get("response"), str):
+                out["speech_text"] = out["response"]
+            return out
+        # Truncated or malformed JSON: recover what is readable.
+        out2: Dict[str, Any] = {}
+        for key in ("speech_text", "overlay_text", "emotion"):
+            v = _partial_field(body, key)
+            if v is not None:
+                out2[key] = v
+        if "speech_text" not in out2:
+            v = _partial_field(body, "response")
+            out2["speech_text"] = v if v is not None else ("" if "{" in body else body)
+        tags = _partial_list(body, "motion_tags")
+        if tags:
+            out2["motion_tags"] = tags
+        return out2
+
+
+def _max_length(field: str) -> int:
+    for m in LLMOut.model_fields[field].metadata:
+        if getattr(m, "max_length", None):
+            return int(m.max_length)
+    return 0
+
+
+def clamp_reply_text(speech_text: str, overlay_text: str) -> Tuple[str, str]:
+    """Apply LLMOut's length limits to a streamed reply (which skips model validation).
+
+    An empty overlay falls back to the tail of the speech, as in the non-streaming path.
+    """
+    speech_max, overlay_max = _max_length("speech_text"), _max_length("overlay_text")
+    speech = (speech_text or "").strip()[:speech_max].strip()
+    overlay = (overlay_text or "").strip()[:overlay_max].strip() or speech[-overlay_max:]
+    return speech, overlay
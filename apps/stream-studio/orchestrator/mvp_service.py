@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Optional, Protocol
 
 from core.types import AssistantOutput, EventIn
 from llm.mvp_models import LLMOut
+from rag.context_assembler import ContextAssembler, get_context_assembler
 from rag.long_term.store import LongTermStore
 from rag.short_term.memory import ShortTermMemory
 from vlm.summarizer import VLMSummarizer
@@ -27,30 +28,26 @@ class OrchestratorMVP:
     ng_words: list[str]
     rag_enabled: bool = True
     short_term_max_events: int = 50
+    assembler: Optional[ContextAssembler] = None
 
     def _build_context(self, *, event: EventIn, include_vlm: bool) -> tuple[str, str]:
-        rag_context = ""
+        rag_context = "no_rag"
         if self.rag_enabled:
+            asm = self.assembler or get_context_assembler()
             st_limit = max(0, int(self.short_term_max_events))
             st_text = self.st.recent_text(max_events=st_limit) if st_limit else ""
             lt_hits = self.lt.search(query=event.text, limit=5)
             lt_text = "\n".join([f"- {doc_id}: {snip}" for doc_id, snip in lt_hits])
-
-            short_rag = self.lt.get(doc_id="shortRAG")
-            long_rag = self.lt.get(doc_id="longRAG")
-            short_rag_text = (short_rag or {}).get("text") if isinstance(short_rag, dict) else ""
-            long_rag_text = (long_rag or {}).get("text") if isinstance(long_rag, dict) else ""
-
-            if st_text:
-                rag_context += "[short_term]\n" + st_text + "\n"
-            if short_rag_text:
-                rag_context += "[shortRAG]\n" + str(short_rag_text).strip() + "\n"
-            if long_rag_text:
-                rag_context += "[longRAG]\n" + str(long_rag_text).strip() + "\n"
-            if lt_text:
-                rag_context += "[long_term_search]\n" + lt_text + "\n"
-        if not rag_context:
-            rag_context = "no_rag"
+            lt_version = (str(self.lt.db_path), self.lt.version())
+            rag_context = asm.render(
+                [
+                    asm.dynamic("conversation_summary", self.st.summary_text()),
+                    asm.dynamic("short_term", st_text),
+                    asm.static("shortRAG", version=lt_version, build=lambda: self._lt_doc_text("shortRAG")),
+                    asm.static("longRAG", version=lt_version, build=lambda: self._lt_doc_text("longRAG")),
+                    asm.dynamic("long_term_search", lt_text, keep="head"),
+                ]
+            )
 
         vlm_summary = ""
         if include_vlm:
@@ -60,6 +57,10 @@ class OrchestratorMVP:
 
         return rag_context, vlm_summary
 
+    def _lt_doc_text(self, doc_id: str) -> str:
+        doc = self.lt.get(doc_id=doc_id)
+        return str((doc or {}).get("text") or "").strip() if isinstance(doc, dict) else ""
+
     def _apply_safety(self, out: LLMOut) -> AssistantOutput:
         blocked = False
         safe_speech = out.speech_text
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from core.metrics import get_metrics
+from rag.vector_index import estimate_tokens
+
+# Approximate token budget per prompt section (see `estimate_tokens`).
+DEFAULT_BUDGETS: Dict[str, int] = {
+    "conversation_summary": 400,
+    "short_term_turns": 800,
+    "short_term": 800,
+    "shortRAG": 600,
+    "longRAG": 1500,
+    "long_term_search": 400,
+}
+_FALLBACK_BUDGET = 800
+
+
+@dataclass
+class ContextSection:
+    name: str
+    text: str
+    tokens: int
+    truncated: bool = False
+    cached: bool = False
+
+
+def fit_to_budget(text: str, budget: int, *, keep: str = "tail") -> Tuple[str, bool]:
+    """Trim `text` to roughly `budget` tokens on line boundaries.
+
+    keep="tail" keeps the newest (last) lines, keep="head" the first ones.
+    """
+    s = (text or "").strip()
+    if not s:
+        return "", False
+    b = max(0, int(budget))
+    if estimate_tokens(s) <= b:
+        return s, False
+    lines = s.split("\n")
+    if keep == "tail":
+        lines.reverse()
+    kept: List[str] = []
+    used = 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > b:
+            if not kept and b > 0:
+                # A single oversized line: cut by characters.
+                part = line[-b:] if keep == "tail" else line[:b]
+                while part and estimate_tokens(part) > b:
+                    part = part[1:] if keep == "tail" else part[:-1]
+                kept.append(part)
+            break
+        kept.append(line)
+        used += cost
+    if keep == "tail":
+        kept.reverse()
+    return "\n".join(kept).strip(), True
+
+
+class ContextAssembler:
+    """Builds the prompt `rag_context` from named, size-bounded sections.
+
+    Static sections (RAG items, long-term docs) are built once per store
+    version and kept in a small LRU; dynamic sections are only trimmed.
+    Each call publishes per-section token counts to `/metrics`.
+    """
+
+    def __init__(self, *, budgets: Optional[Dict[str, int]] = None, max_cached: int = 64) -> None:
+        self.budgets: Dict[str, int] = dict(DEFAULT_BUDGETS)
+        if budgets:
+            self.budgets.update({str(k): int(v) for k, v in budgets.items()})
+        self.max_cached = max(1, int(max_cached))
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[Any, ...], ContextSection]" = OrderedDict()
+
+    def budget_for(self, name: str, budget: Optional[int] = None) -> int:
+        if budget is not None:
+            return max(0, int(budget))
+        return max(0, int(self.budgets.get(name, _FALLBACK_BUDGET)))
+
+    def static(
+        self,
+        name: str,
+        *,
+        version: Hashable,
+        build: Callable[[], str],
+        budget: Optional[int] = None,
+        keep: str = "tail",
+    ) -> ContextSection:
+        """Section whose text only changes when `version` changes."""
+        b = self.budget_for(name, budget)
+        key = (name, version, b, keep)
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+        if hit is not None:
+            get_metrics().inc("context_cache_total", section=name, result="hit")
+            return ContextSection(hit.name, hit.text, hit.tokens, hit.truncated, cached=True)
+        text, truncated = fit_to_budget(build() or "", b, keep=keep)
+        sec = ContextSection(name, text, estimate_tokens(text), truncated)
+        with self._lock:
+            self._cache[key] = sec
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        get_metrics().inc("context_cache_total", section=name, result="miss")
+        return sec
+
+    def dynamic(self, name: str, text: str, *, budget: Optional[int] = None, keep: str = "tail") -> ContextSection:
+        out, truncated = fit_to_budget(text or "", self.budget_for(name, budget), keep=keep)
+        return ContextSection(name, out, estimate_tokens(out), truncated)
+
+    def render(self, sections: List[ContextSection], *, empty: str = "no_rag") -> str:
+        m = get_metrics()
+        chunks: List[str] = []
+        for sec in sections:
+            m.set_gauge("context_section_tokens", sec.tokens, section=sec.name)
+            if sec.truncated:
+                m.inc("context_truncated_total", section=sec.name)
+            if sec.text:
+                chunks.append(f"[{sec.name}]\n{sec.text}")
+        return "\n\n".join(chunks).strip() or empty
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+_assembler = ContextAssembler()
+
+
+def get_context_assembler(budgets: Optional[Dict[str, Any]] = None) -> ContextAssembler:
+    """Process-wide assembler (shares the static-section cache); `budgets` overrides defaults."""
+    if isinstance(budgets, dict):
+        for k, v in budgets.items():
+            try:
+                _assembler.budgets[str(k)] = max(0, int(v))
+            except Exception:
+                continue
+    return _assembler
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.sqlite_pool import ensure_schema, get_connection
+from core.storage import utc_iso
+from rag.versions import bump_version, store_version
+
+JsonDict = Dict[str, Any]
+
+
+@dataclass
+class ConversationStore:
+    """Single append-only message log for chat, short-term memory and turns.
+
+    One row per message. `in_context` marks messages that feed short-term
+    prompt context and the turn table (pending manager candidates and
+    forgotten messages stay in the export only).
+    Retention is a ring buffer on the rowid: every `_trim_every` inserts,
+    rows older than the newest `max_messages` are range-deleted on the
+    primary key.
+    """
+
+    db_path: Path
+    max_messages: int = 20000
+
+    @property
+    def _trim_every(self) -> int:
+        return max(16, int(self.max_messages) // 16)
+
+    def _connect(self) -> sqlite3.Connection:
+        return get_connection(self.db_path)
+
+    def init(self) -> None:
+        ensure_schema(self.db_path, "conversation", self._create_schema)
+
+    @staticmethod
+    def _create_schema(con: sqlite3.Connection) -> None:
+        con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS messages (
+              id INTEGER PRIMARY KEY AUTOINCREMENT,
+              ts TEXT NOT NULL,
+              run_id TEXT NOT NULL DEFAULT '',
+              role TEXT NOT NULL,
+              source TEXT NOT NULL DEFAULT '',
+              text TEXT NOT NULL,
+              in_context INTEGER NOT NULL DEFAULT 1,
+              meta_json TEXT
+            )
+            """
+        )
+        con.execute("CREATE INDEX IF NOT EXISTS idx_messages_run ON messages(run_id)")
+        con.execute("CREATE TABLE IF NOT EXISTS conversation_meta(key TEXT PRIMARY KEY, value TEXT)")
+
+    def version(self) -> int:
+        """In-process change counter (bumped on every write)."""
+        return store_version("conversation", self.db_path)
+
+    def append(
+        self,
+        *,
+        role: str,
+        text: str,
+        run_id: str = "",
+        source: str = "",
+        meta: Optional[JsonDict] = None,
+        in_context: bool = True,
+        ts: Optional[str] = None,
+    ) -> Optional[int]:
+        t = str(text or "").strip()
+        if not t:
+            return None
+        self.init()
+        with self._connect() as con:
+            cur = con.execute(
+                "INSERT INTO messages(ts, run_id, role, source, text, in_context, meta_json) VALUES(?,?,?,?,?,?,?)",
+                (
+                    ts or utc_iso(),
+                    str(run_id or ""),
+                    str(role or "").strip() or "user",
+                    str(source or ""),
+                    t,
+                    1 if in_context else 0,
+                    json.dumps(meta, ensure_ascii=False) if meta else None,
+                ),
+            )
+            row_id = int(cur.lastrowid)
+            if row_id % self._trim_every == 0:
+                con.execute("DELETE FROM messages WHERE id <= ?", (row_id - max(1, int(self.max_messages)),))
+            con.commit()
+        bump_version("conversation", self.db_path)
+        return row_id
+
+    @staticmethod
+    def _message(row: sqlite3.Row) -> JsonDict:
+        meta: JsonDict = {}
+        if row["meta_json"]:
+            try:
+                meta = json.loads(row["meta_json"])
+            except Exception:
+                meta = {}
+        return {
+            "id": int(row["id"]),
+            "ts": str(row["ts"] or ""),
+            "run_id": str(row["run_id"] or ""),
+            "role": str(row["role"] or ""),
+            "source": str(row["source"] or ""),
+            "text": str(row["text"] or ""),
+            "in_context": bool(row["in_context"]),
+            "meta": meta,
+        }
+
+    def recent(
+        self,
+        *,
+        limit: int = 50,
+        newest_first: bool = True,
+        context_only: bool = True,
+        after_id: int = 0,
+    ) -> List[JsonDict]:
+        lim = max(0, int(limit))
+        if lim <= 0:
+            return []
+        self.init()
+        where = "WHERE id > ?" + (" AND in_context = 1" if context_only else "")
+        with self._connect() as con:
+            rows = con.execute(
+                f"SELECT id, ts, run_id, role, source, text, in_context, meta_json FROM messages {where} "
+                "ORDER BY id DESC LIMIT ?",
+                (int(after_id), lim),
+            ).fetchall()
+        out = [self._message(r) for r in rows]
+        if not newest_first:
+            out.reverse()
+        return out
+
+    def turns(self, *, limit: int = 200, after_id: int = 0) -> List[JsonDict]:
+        """Completed user/assistant exchanges (grouped by run_id), newest first."""
+        lim = max(1, min(2000, int(limit)))
+        self.init()
+        with self._connect() as con:
+            rows = con.execute(
+                """
+                SELECT id, ts, run_id, role, text FROM messages
+                WHERE id > ? AND in_context = 1 AND run_id != '' AND role IN ('user', 'assistant')
+                ORDER BY id DESC LIMIT ?
+                """,
+                (int(after_id), lim * 4),
+            ).fetchall()
+        runs: Dict[str, JsonDict] = {}
+        order: List[str] = []
+        for r in rows:
+            rid = str(r["run_id"])
+            turn = runs.get(rid)
+            if turn is None:
+                turn = {"id": int(r["id"]), "user_text": "", "assistant_text": "", "created_at": str(r["ts"] or "")}
+                runs[rid] = turn
+                order.append(rid)
+            key = "user_text" if r["role"] == "user" else "assistant_text"
+            # Rows arrive newest first; keep the earliest text per role.
+            turn[key] = str(r["text"] or "")
+        out = [runs[rid] for rid in order if runs[rid]["user_text"] and runs[rid]["assistant_text"]]
+        return out[:lim]
+
+    def get_summary(self) -> JsonDict:
+        """Running summary of older messages: {"text", "upto_id", "updated_at"}."""
+        self.init()
+        with self._connect() as con:
+            row = con.execute("SELECT value FROM conversation_meta WHERE key = 'summary'").fetchone()
+        out: JsonDict = {"text": "", "upto_id": 0, "updated_at": ""}
+        if row is not None:
+            try:
+                raw = json.loads(row["value"])
+                out.update({k: raw[k] for k in out if k in raw})
+            except Exception:
+                pass
+        return out
+
+    def set_summary(self, *, text: str, upto_id: int) -> None:
+        self.init()
+        value = json.dumps({"text": text, "upto_id": int(upto_id), "updated_at": utc_iso()}, ensure_ascii=False)
+        with self._connect() as con:
+            con.execute("INSERT OR REPLACE INTO conversation_meta(key, value) VALUES('summary', ?)", (value,))
+            con.commit()
+        bump_version("conversation", self.db_path)
+
+    def unsummarized(self, *, after_id: int, keep_recent: int) -> List[JsonDict]:
+        """In-context messages after `after_id`, excluding the newest `keep_recent` (oldest first)."""
+        self.init()
+        with self._connect() as con:
+            rows = con.execute(
+                """
+                SELECT id, ts, run_id, role, source, text, in_context, meta_json FROM messages
+                WHERE id > ? AND in_context = 1
+                ORDER BY id DESC LIMIT -1 OFFSET ?
+                """,
+                (int(after_id), max(0, int(keep_recent))),
+            ).fetchall()
+        out = [self._message(r) for r in rows]
+        out.reverse()
+        return out
+
+    # Removing from the console only drops messages from context/turn views;
+    # the chat export keeps the full log (as chat.jsonl did).
+
+    def forget_message(self, *, row_id: int) -> bool:
+        self.init()
+        with self._connect() as con:
+            cur = con.execute("UPDATE messages SET in_context = 0 WHERE id = ? AND in_context = 1", (int(row_id),))
+            con.commit()
+        bump_version("conversation", self.db_path)
+        return int(cur.rowcount or 0) > 0
+
+    def forget_run_of(self, *, row_id: int) -> bool:
+        """Forget every message sharing the run_id of message `row_id`."""
+        self.init()
+        with self._connect() as con:
+            row = con.execute("SELECT run_id FROM messages WHERE id = ?", (int(row_id),)).fetchone()
+            if row is None:
+                return False
+            if row["run_id"]:
+                cur = con.execute(
+                    "UPDATE messages SET in_context = 0 WHERE run_id = ? AND in_context = 1", (row["run_id"],)
+                )
+            else:
+                cur = con.execute("UPDATE messages SET in_context = 0 WHERE id = ? AND in_context = 1", (int(row_id),))
+            con.commit()
+        bump_version("conversation", self.db_path)
+        return int(cur.rowcount or 0) > 0
+
+    def forget_all(self) -> None:
+        self.init()
+        with self._connect() as con:
+            con.execute("UPDATE messages SET in_context = 0 WHERE in_context = 1")
+            con.execute("DELETE FROM conversation_meta WHERE key = 'summary'")
+            con.commit()
+        bump_version("conversation", self.db_path)
+
+    def iter_export(self, *, since_id: int = 0, limit: int = 100000) -> Iterator[JsonDict]:
+        """Chat log export (oldest first), same shape as the former chat.jsonl."""
+        self.init()
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT id, ts, run_id, role, source, text, in_context, meta_json FROM messages "
+                "WHERE id > ? ORDER BY id ASC LIMIT ?",
+                (int(since_id), max(1, int(limit))),
+            ).fetchall()
+        for r in rows:
+            m = self._message(r)
+            yield {
+                "id": m["id"],
+                "ts": m["ts"],
+                "run_id": m["run_id"],
+                "role": m["role"],
+                "source": m["source"],
+                "text": m["text"],
+                "meta": m["meta"],
+            }
+
+    def import_legacy_turns(self, path: Path) -> int:
+        """One-time copy of the old turns table (short_term_turns.sqlite)."""
+        p = Path(path)
+        if not p.exists():
+            return 0
+        self.init()
+        with self._connect() as con:
+            done = con.execute("SELECT value FROM conversation_meta WHERE key = 'legacy_turns'").fetchone()
+            if done is not None:
+                return 0
+            n = 0
+            try:
+                src = sqlite3.connect(str(p))
+                try:
+                    rows = src.execute(
+                        "SELECT id, user_text, assistant_text, created_at FROM turns ORDER BY id ASC"
+                    ).fetchall()
+                finally:
+                    src.close()
+            except sqlite3.Error:
+                rows = []
+            for rid, u, a, ts in rows:
+                run = f"legacy_turn_{rid}"
+                for role, text in (("user", u), ("assistant", a)):
+                    if str(text or "").strip():
+                        con.execute(
+                            "INSERT INTO messages(ts, run_id, role, source, text) VALUES(?,?,?,?,?)",
+                            (str(ts or ""), run, role, "legacy", str(text).strip()),
+                        )
+                n += 1
+            con.execute("INSERT OR REPLACE INTO conversation_meta(key, value) VALUES('legacy_turns', ?)", (str(n),))
+            con.commit()
+        bump_version("conversation", self.db_path)
+        return n
+
+
+_stores: Dict[str, ConversationStore] = {}
+_stores_lock = threading.Lock()
+
+
+def conversation_db_path(data_dir: Path) -> Path:
+    return Path(data_dir) / "rag" / "conversation.sqlite"
+
+
+def get_conversation_store(db_path: Path) -> ConversationStore:
+    key = str(Path(db_path))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = ConversationStore(db_path=Path(db_path))
+            _stores[key] = store
+        return store
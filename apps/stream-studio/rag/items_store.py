@@ -5,32 +5,39 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from core.sqlite_pool import ensure_schema, get_connection
+from rag.vector_index import estimate_tokens, get_vector_index
+from rag.versions import bump_version, store_version
+
 
 @dataclass
 class RagItemsStore:
     db_path: Path
 
     def _connect(self) -> sqlite3.Connection:
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        con = sqlite3.connect(str(self.db_path))
-        con.row_factory = sqlite3.Row
-        return con
+        return get_connection(self.db_path)
 
     def init(self) -> None:
-        with self._connect() as con:
-            con.execute(
-                """
-                CREATE TABLE IF NOT EXISTS rag_items (
-                  id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  rag_type TEXT NOT NULL,
-                  title TEXT,
-                  text TEXT NOT NULL,
-                  created_at TEXT NOT NULL
-                )
-                """
+        ensure_schema(self.db_path, "rag_items", self._create_schema)
+
+    @staticmethod
+    def _create_schema(con: sqlite3.Connection) -> None:
+        con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rag_items (
+              id INTEGER PRIMARY KEY AUTOINCREMENT,
+              rag_type TEXT NOT NULL,
+              title TEXT,
+              text TEXT NOT NULL,
+              created_at TEXT NOT NULL
             )
-            con.execute("CREATE INDEX IF NOT EXISTS idx_rag_items_type_created ON rag_items(rag_type, created_at)")
-            con.commit()
+            """
+        )
+        con.execute("CREATE INDEX IF NOT EXISTS idx_rag_items_type_created ON rag_items(rag_type, created_at)")
+
+    def version(self, rag_type: str) -> int:
+        """In-process change counter for one rag_type (bumped on add/delete)."""
+        return store_version("rag_items", self.db_path, self._normalize_type(rag_type))
 
     @staticmethod
     def _normalize_type(t: str) -> str:
@@ -52,14 +59,28 @@ class RagItemsStore:
                 (rt, (title or "").strip(), body, created_at),
             )
             con.commit()
-            return int(cur.lastrowid)
+            row_id = int(cur.lastrowid)
+        bump_version("rag_items", self.db_path, rt)
+        try:
+            get_vector_index(self.db_path).add(item_id=row_id, rag_type=rt, title=title, text=body)
+        except Exception:
+            pass
+        return row_id
 
     def delete(self, *, row_id: int) -> bool:
         self.init()
         with self._connect() as con:
             cur = con.execute("DELETE FROM rag_items WHERE id = ?", (int(row_id),))
             con.commit()
-            return int(cur.rowcount or 0) > 0
+            deleted = int(cur.rowcount or 0) > 0
+        # The row's type is unknown here; bump both.
+        bump_version("rag_items", self.db_path, "short")
+        bump_version("rag_items", self.db_path, "long")
+        try:
+            get_vector_index(self.db_path).remove(item_id=int(row_id))
+        except Exception:
+            pass
+        return deleted
 
     def list(self, *, rag_type: str, limit: int = 200) -> List[Dict[str, Any]]:
         rt = self._normalize_type(rag_type)
@@ -86,18 +107,64 @@ class RagItemsStore:
                 )
             return out
 
+    def get_by_ids(self, ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        if not ids:
+            return {}
+        self.init()
+        marks = ",".join("?" for _ in ids)
+        with self._connect() as con:
+            rows = con.execute(
+                f"SELECT id, rag_type, title, text, created_at FROM rag_items WHERE id IN ({marks})",
+                [int(i) for i in ids],
+            ).fetchall()
+        return {
+            int(r["id"]): {
+                "id": int(r["id"]),
+                "rag_type": str(r["rag_type"]),
+                "title": str(r["title"] or ""),
+                "text": str(r["text"] or ""),
+                "created_at": str(r["created_at"] or ""),
+            }
+            for r in rows
+        }
+
+    @staticmethod
+    def _format_item(it: Dict[str, Any]) -> str:
+        title = (it.get("title") or "").strip()
+        text = (it.get("text") or "").strip()
+        if not text:
+            return ""
+        return f"- {title}\n{text}" if title else text
+
     def get_concat_text(self, *, rag_type: str, limit: int = 50) -> str:
         items = self.list(rag_type=rag_type, limit=limit)
         # Reverse so oldest->newest for readability.
         items = list(reversed(items))
+        chunks = [c for c in (self._format_item(it) for it in items) if c]
+        return "\n\n".join(chunks).strip()
+
+    def get_relevant_text(self, *, rag_type: str, query: str, top_k: int = 8, token_budget: int = 1500) -> str:
+        """Items most relevant to `query`, best first, within `token_budget`.
+
+        Uses the local vector index, so prompt size is bounded by top_k and
+        the budget rather than by the number of stored items.
+        """
+        rt = self._normalize_type(rag_type)
+        if not rt:
+            raise ValueError("invalid_rag_type")
+        hits = get_vector_index(self.db_path).search(query or "", rag_type=rt, k=max(1, int(top_k)))
+        by_id = self.get_by_ids([i for i, _ in hits])
+        budget = max(0, int(token_budget))
+        used = 0
         chunks: List[str] = []
-        for it in items:
-            title = (it.get("title") or "").strip()
-            text = (it.get("text") or "").strip()
-            if not text:
+        for item_id, _score in hits:
+            it = by_id.get(item_id)
+            chunk = self._format_item(it) if it else ""
+            if not chunk:
+                continue
+            cost = estimate_tokens(chunk)
+            if used + cost > budget:
                 continue
-            if title:
-                chunks.append(f"- {title}\n{text}")
-            else:
-                chunks.append(text)
+            used += cost
+            chunks.append(chunk)
         return "\n\n".join(chunks).strip()
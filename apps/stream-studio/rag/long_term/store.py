@@ -1,89 +1,219 @@
 from __future__ import annotations
 
+import re
 import sqlite3
+import unicodedata
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from core.sqlite_pool import ensure_schema, get_connection
+from rag.versions import bump_version, store_version
+
+# Runs of letters/digits; everything else (spaces, punctuation, symbols) separates terms.
+_TERM_RE = re.compile(r"[^\W_]+", re.UNICODE)
+_MAX_QUERY_TERMS = 32
+_SNIPPET_CHARS = 240
+
+
+def _is_ascii(s: str) -> bool:
+    return all(ord(ch) < 128 for ch in s)
+
+
+def build_match_query(query: str) -> Tuple[str, List[str], List[str]]:
+    """Sanitize free text into an FTS5 trigram MATCH expression.
+
+    Returns (match_expr, terms, short_terms). ASCII words of 3+ chars become quoted
+    terms; CJK runs become their overlapping 3-char windows, OR-ed so bm25
+    ranks documents sharing more of the query first. Terms shorter than 3
+    chars cannot use the trigram index and are returned separately.
+    """
+    s = unicodedata.normalize("NFKC", query or "").lower()
+    terms: List[str] = []
+    short: List[str] = []
+    for run in _TERM_RE.findall(s):
+        if len(run) < 3:
+            short.append(run)
+        elif _is_ascii(run):
+            terms.append(run)
+        else:
+            terms.extend(run[i : i + 3] for i in range(len(run) - 2))
+    seen = set()
+    uniq: List[str] = []
+    for t in terms:
+        if t not in seen:
+            seen.add(t)
+            uniq.append(t)
+    uniq = uniq[:_MAX_QUERY_TERMS]
+    expr = " OR ".join('"' + t.replace('"', '""') + '"' for t in uniq)
+    return expr, uniq, short
+
+
+def make_snippet(text: str, terms: List[str], *, width: int = _SNIPPET_CHARS) -> str:
+    """Window of `text` around the first occurrence of any term."""
+    raw = text or ""
+    if len(raw) <= width:
+        return raw
+    low = unicodedata.normalize("NFKC", raw).lower()
+    if len(low) != len(raw):
+        low = raw.lower()
+    hits = [i for i in (low.find(t) for t in terms if t) if i >= 0]
+    if not hits:
+        return raw[: width - 1] + "…"
+    start = max(0, min(hits) - width // 4)
+    end = min(len(raw), start + width)
+    start = max(0, end - width)
+    return ("…" if start > 0 else "") + raw[start:end] + ("…" if end < len(raw) else "")
+
 
 @dataclass
 class LongTermStore:
+    """Long-term documents with a trigram FTS5 index (works for Japanese).
+
+    Rows live in `lt_docs` (doc_id unique); `lt_docs_fts` is an external
+    content FTS5 table kept in sync by triggers, with doc_id and metadata as
+    UNINDEXED columns. Without FTS5/trigram support search falls back to LIKE.
+    """
+
     db_path: Path
 
     def _connect(self) -> sqlite3.Connection:
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_connection(self.db_path)
 
     def init(self) -> None:
-        with self._connect() as conn:
-            # FTS5 is preferred; if unavailable, fall back to a simple table.
-            try:
-                conn.execute(
-                    "CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(doc_id, text, source, created_at);"
+        ensure_schema(self.db_path, "long_term", self._create_schema)
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS lt_docs (
+              id INTEGER PRIMARY KEY AUTOINCREMENT,
+              doc_id TEXT NOT NULL UNIQUE,
+              text TEXT NOT NULL,
+              source TEXT,
+              created_at TEXT
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_lt_docs_created ON lt_docs(created_at)")
+        conn.execute("CREATE TABLE IF NOT EXISTS docs_meta(doc_id TEXT PRIMARY KEY, metadata_json TEXT);")
+        try:
+            conn.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS lt_docs_fts USING fts5(
+                  doc_id UNINDEXED, text, source UNINDEXED, created_at UNINDEXED,
+                  content='lt_docs', content_rowid='id', tokenize='trigram'
                 )
+                """
+            )
+            conn.executescript(
+                """
+                CREATE TRIGGER IF NOT EXISTS lt_docs_ai AFTER INSERT ON lt_docs BEGIN
+                  INSERT INTO lt_docs_fts(rowid, doc_id, text, source, created_at)
+                  VALUES (new.id, new.doc_id, new.text, new.source, new.created_at);
+                END;
+                CREATE TRIGGER IF NOT EXISTS lt_docs_ad AFTER DELETE ON lt_docs BEGIN
+                  INSERT INTO lt_docs_fts(lt_docs_fts, rowid, doc_id, text, source, created_at)
+                  VALUES ('delete', old.id, old.doc_id, old.text, old.source, old.created_at);
+                END;
+                CREATE TRIGGER IF NOT EXISTS lt_docs_au AFTER UPDATE ON lt_docs BEGIN
+                  INSERT INTO lt_docs_fts(lt_docs_fts, rowid, doc_id, text, source, created_at)
+                  VALUES ('delete', old.id, old.doc_id, old.text, old.source, old.created_at);
+                  INSERT INTO lt_docs_fts(rowid, doc_id, text, source, created_at)
+                  VALUES (new.id, new.doc_id, new.text, new.source, new.created_at);
+                END;
+                """
+            )
+        except sqlite3.OperationalError:
+            # SQLite without FTS5 or the trigram tokenizer (< 3.34): LIKE search only.
+            pass
+        # Migrate the previous layouts (unicode61 `docs` FTS table / `docs_simple`).
+        for legacy in ("docs", "docs_simple"):
+            if not LongTermStore._has_table(conn, legacy):
+                continue
+            try:
                 conn.execute(
-                    "CREATE TABLE IF NOT EXISTS docs_meta(doc_id TEXT PRIMARY KEY, metadata_json TEXT);"
+                    f"""
+                    INSERT INTO lt_docs(doc_id, text, source, created_at)
+                    SELECT doc_id, COALESCE(text, ''), source, created_at FROM {legacy} WHERE doc_id IS NOT NULL
+                    ON CONFLICT(doc_id) DO NOTHING
+                    """
                 )
+                conn.execute(f"DROP TABLE {legacy}")
             except sqlite3.OperationalError:
-                conn.execute(
-                    "CREATE TABLE IF NOT EXISTS docs_simple(doc_id TEXT PRIMARY KEY, text TEXT, source TEXT, created_at TEXT);"
-                )
-            conn.commit()
+                continue
 
-    def _has_table(self, conn: sqlite3.Connection, name: str) -> bool:
+    @staticmethod
+    def _has_table(conn: sqlite3.Connection, name: str) -> bool:
         row = conn.execute(
             "SELECT 1 FROM sqlite_master WHERE type IN ('table','view') AND name = ? LIMIT 1",
             (name,),
         ).fetchone()
         return row is not None
 
+    @staticmethod
+    def _row(row: sqlite3.Row) -> Dict[str, str]:
+        return {
+            "doc_id": str(row["doc_id"]),
+            "text": str(row["text"] or ""),
+            "source": str(row["source"] or ""),
+            "created_at": str(row["created_at"] or ""),
+        }
+
     def upsert(self, *, doc_id: str, text: str, source: str, created_at: str) -> None:
         self.init()
         with self._connect() as conn:
-            try:
-                # FTS tables do not enforce uniqueness. Ensure a single row per doc_id.
-                conn.execute("DELETE FROM docs WHERE doc_id = ?", (doc_id,))
-                conn.execute(
-                    "INSERT INTO docs(doc_id, text, source, created_at) VALUES(?,?,?,?)",
-                    (doc_id, text, source, created_at),
-                )
-            except sqlite3.OperationalError:
-                conn.execute(
-                    "INSERT OR REPLACE INTO docs_simple(doc_id, text, source, created_at) VALUES(?,?,?,?)",
-                    (doc_id, text, source, created_at),
-                )
+            # ON CONFLICT ... DO UPDATE fires the update trigger (REPLACE would skip the delete trigger).
+            conn.execute(
+                """
+                INSERT INTO lt_docs(doc_id, text, source, created_at) VALUES(?,?,?,?)
+                ON CONFLICT(doc_id) DO UPDATE SET
+                  text = excluded.text, source = excluded.source, created_at = excluded.created_at
+                """,
+                (doc_id, text or "", source, created_at),
+            )
             conn.commit()
+        bump_version("long_term", self.db_path)
+
+    def version(self) -> int:
+        """In-process change counter (bumped on every write)."""
+        return store_version("long_term", self.db_path)
 
     def search(self, *, query: str, limit: int = 5) -> List[Tuple[str, str]]:
+        """Best-matching (doc_id, snippet) pairs, ranked by bm25."""
         self.init()
         q = (query or "").strip()
         if not q:
             return []
+        lim = max(1, int(limit))
+        expr, terms, short = build_match_query(q)
 
         with self._connect() as conn:
-            # Prefer FTS table if present.
-            if self._has_table(conn, "docs"):
+            if expr and self._has_table(conn, "lt_docs_fts"):
                 try:
                     rows = conn.execute(
-                        "SELECT doc_id, text FROM docs WHERE docs MATCH ? LIMIT ?",
-                        (q, limit),
+                        """
+                        SELECT c.doc_id, c.text FROM lt_docs_fts
+                        JOIN lt_docs c ON c.id = lt_docs_fts.rowid
+                        WHERE lt_docs_fts MATCH ?
+                        ORDER BY bm25(lt_docs_fts)
+                        LIMIT ?
+                        """,
+                        (expr, lim),
                     ).fetchall()
-                    return [(str(r["doc_id"]), str(r["text"])[:240]) for r in rows]
+                    return [(str(r["doc_id"]), make_snippet(str(r["text"] or ""), terms)) for r in rows]
                 except sqlite3.OperationalError:
-                    # If MATCH isn't available for some reason, fall through.
                     pass
 
-            # Fallback: simple LIKE table (created only when FTS5 isn't available)
-            if self._has_table(conn, "docs_simple"):
-                rows = conn.execute(
-                    "SELECT doc_id, text FROM docs_simple WHERE text LIKE ? LIMIT ?",
-                    (f"%{q}%", limit),
-                ).fetchall()
-                return [(str(r["doc_id"]), str(r["text"])[:240]) for r in rows]
-
-            return []
+            # Short (1-2 char) queries, or no FTS5: unindexed substring scan.
+            needles = short or [q]
+            where = " OR ".join("text LIKE ?" for _ in needles)
+            rows = conn.execute(
+                f"SELECT doc_id, text FROM lt_docs WHERE {where} ORDER BY created_at DESC LIMIT ?",
+                [f"%{n}%" for n in needles] + [lim],
+            ).fetchall()
+            return [(str(r["doc_id"]), make_snippet(str(r["text"] or ""), needles)) for r in rows]
 
     def get(self, *, doc_id: str) -> Optional[Dict[str, str]]:
         self.init()
@@ -91,34 +221,11 @@ class LongTermStore:
         if not did:
             return None
         with self._connect() as conn:
-            if self._has_table(conn, "docs"):
-                try:
-                    row = conn.execute(
-                        "SELECT doc_id, text, source, created_at FROM docs WHERE doc_id = ? LIMIT 1",
-                        (did,),
-                    ).fetchone()
-                    if row:
-                        return {
-                            "doc_id": str(row["doc_id"]),
-                            "text": str(row["text"] or ""),
-                            "source": str(row["source"] or ""),
-                            "created_at": str(row["created_at"] or ""),
-                        }
-                except sqlite3.OperationalError:
-                    pass
-            if self._has_table(conn, "docs_simple"):
-                row = conn.execute(
-                    "SELECT doc_id, text, source, created_at FROM docs_simple WHERE doc_id = ? LIMIT 1",
-                    (did,),
-                ).fetchone()
-                if row:
-                    return {
-                        "doc_id": str(row["doc_id"]),
-                        "text": str(row["text"] or ""),
-                        "source": str(row["source"] or ""),
-                        "created_at": str(row["created_at"] or ""),
-                    }
-        return None
+            row = conn.execute(
+                "SELECT doc_id, text, source, created_at FROM lt_docs WHERE doc_id = ? LIMIT 1",
+                (did,),
+            ).fetchone()
+        return self._row(row) if row else None
 
     def list(self, *, limit: int = 100) -> List[Dict[str, str]]:
         self.init()
@@ -128,42 +235,16 @@ class LongTermStore:
             lim = 100
         out: List[Dict[str, str]] = []
         with self._connect() as conn:
-            if self._has_table(conn, "docs"):
-                try:
-                    rows = conn.execute(
-                        "SELECT doc_id, text, source, created_at FROM docs ORDER BY created_at DESC LIMIT ?",
-                        (lim,),
-                    ).fetchall()
-                    for row in rows:
-                        raw = str(row["text"] or "")
-                        out.append(
-                            {
-                                "doc_id": str(row["doc_id"]),
-                                "text": raw[:240],
-                                "source": str(row["source"] or ""),
-                                "created_at": str(row["created_at"] or ""),
-                                "text_len": len(raw),
-                            }
-                        )
-                    return out
-                except sqlite3.OperationalError:
-                    pass
-            if self._has_table(conn, "docs_simple"):
-                rows = conn.execute(
-                    "SELECT doc_id, text, source, created_at FROM docs_simple ORDER BY created_at DESC LIMIT ?",
-                    (lim,),
-                ).fetchall()
-                for row in rows:
-                    raw = str(row["text"] or "")
-                    out.append(
-                        {
-                            "doc_id": str(row["doc_id"]),
-                            "text": raw[:240],
-                            "source": str(row["source"] or ""),
-                            "created_at": str(row["created_at"] or ""),
-                            "text_len": len(raw),
-                        }
-                    )
+            rows = conn.execute(
+                "SELECT doc_id, text, source, created_at FROM lt_docs ORDER BY created_at DESC LIMIT ?",
+                (lim,),
+            ).fetchall()
+        for row in rows:
+            item = self._row(row)
+            raw = item["text"]
+            item["text"] = raw[:240]
+            item["text_len"] = len(raw)  # type: ignore[assignment]
+            out.append(item)
         return out
 
     def delete(self, *, doc_id: str) -> bool:
@@ -172,13 +253,8 @@ class LongTermStore:
         if not did:
             return False
         with self._connect() as conn:
-            before = conn.total_changes
-            if self._has_table(conn, "docs"):
-                try:
-                    conn.execute("DELETE FROM docs WHERE doc_id = ?", (did,))
-                except sqlite3.OperationalError:
-                    pass
-            if self._has_table(conn, "docs_simple"):
-                conn.execute("DELETE FROM docs_simple WHERE doc_id = ?", (did,))
+            cur = conn.execute("DELETE FROM lt_docs WHERE doc_id = ?", (did,))
             conn.commit()
-            return conn.total_changes > before
+            changed = int(cur.rowcount or 0) > 0
+        bump_version("long_term", self.db_path)
+        return changed
@@ -1,57 +1,35 @@
 from __future__ import annotations
 
-import sqlite3
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from core.storage import tail_jsonl, utc_iso
+from core.storage import tail_jsonl
+from rag.conversation_store import ConversationStore, conversation_db_path, get_conversation_store
 
 
 @dataclass
 class ShortTermMemory:
+    """Short-term context view over the conversation store."""
+
     events_path: Path
     db_path: Optional[Path] = None
 
     def _resolve_db_path(self) -> Path:
         if self.db_path is not None:
             return self.db_path
-        return self.events_path.parent / "rag" / "short_term.sqlite"
+        return conversation_db_path(self.events_path.parent)
 
-    def _connect(self) -> sqlite3.Connection:
-        path = self._resolve_db_path()
-        path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(str(path))
-        conn.row_factory = sqlite3.Row
-        return conn
+    @property
+    def _store(self) -> ConversationStore:
+        return get_conversation_store(self._resolve_db_path())
 
     def init(self) -> None:
-        with self._connect() as conn:
-            conn.execute(
-                "CREATE TABLE IF NOT EXISTS short_turns("
-                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
-                "role TEXT, "
-                "text TEXT, "
-                "ts TEXT"
-                ");"
-            )
-            conn.commit()
+        self._store.init()
 
     def append(self, *, role: str, text: str, ts: Optional[str] = None) -> Optional[int]:
-        t = str(text or "").strip()
-        if not t:
-            return None
-        r = str(role or "").strip() or "user"
-        stamp = ts or utc_iso()
         try:
-            self.init()
-            with self._connect() as conn:
-                cur = conn.execute(
-                    "INSERT INTO short_turns(role, text, ts) VALUES(?,?,?)",
-                    (r, t, stamp),
-                )
-                conn.commit()
-                return int(cur.lastrowid)
+            return self._store.append(role=role, text=text, ts=ts)
         except Exception:
             return None
 
@@ -60,29 +38,11 @@ class ShortTermMemory:
             lim = max(0, int(limit))
         except Exception:
             lim = 50
-        if lim <= 0:
-            return []
         try:
-            self.init()
-            order = "DESC" if newest_first else "ASC"
-            with self._connect() as conn:
-                rows = conn.execute(
-                    f"SELECT id, role, text, ts FROM short_turns ORDER BY id {order} LIMIT ?",
-                    (lim,),
-                ).fetchall()
-            out: List[Dict[str, Any]] = []
-            for row in rows:
-                out.append(
-                    {
-                        "id": int(row["id"]),
-                        "role": str(row["role"] or ""),
-                        "text": str(row["text"] or ""),
-                        "ts": str(row["ts"] or ""),
-                    }
-                )
-            return out
+            rows = self._store.recent(limit=lim, newest_first=newest_first)
         except Exception:
             return []
+        return [{"id": r["id"], "role": r["role"], "text": r["text"], "ts": r["ts"]} for r in rows]
 
     def delete(self, *, row_id: int) -> bool:
         try:
@@ -92,20 +52,25 @@ class ShortTermMemory:
         if rid <= 0:
             return False
         try:
-            self.init()
-            with self._connect() as conn:
-                cur = conn.execute("DELETE FROM short_turns WHERE id = ?", (rid,))
-                conn.commit()
-                return cur.rowcount > 0
+            return self._store.forget_message(row_id=rid)
         except Exception:
             return False
 
+    def summary_text(self) -> str:
+        """Running summary of messages older than `recent_text` covers."""
+        try:
+            return str(self._store.get_summary().get("text") or "").strip()
+        except Exception:
+            return ""
+
     def recent_text(self, *, max_events: int = 50) -> str:
+        """Recent in-context messages not yet folded into the summary."""
         try:
-            rows = self.list(limit=max_events, newest_first=True)
+            store = self._store
+            upto = int(store.get_summary().get("upto_id") or 0)
+            rows = store.recent(limit=max(0, int(max_events)), newest_first=False, after_id=upto)
             if not rows:
-                return self._fallback_recent_text(max_events=max_events)
-            rows = list(reversed(rows))
+                return "" if upto else self._fallback_recent_text(max_events=max_events)
             lines = [f"[{r.get('role')}] {r.get('text')}" for r in rows if r.get("text")]
             return "\n".join(lines[-max_events:])
         except Exception:
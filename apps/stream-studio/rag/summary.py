@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from rag.conversation_store import ConversationStore
+
+SUMMARY_SYSTEM_PROMPT = (
+    "あなたは配信の会話ログを要約するアシスタントです。"
+    "これまでの要約と新しい会話を統合し、話題・視聴者の名前や発言・約束事・キャラクターの発言内容を"
+    "事実ベースで簡潔な日本語の箇条書きにまとめてください。前置きや説明は不要です。"
+)
+
+# (previous summary, new lines, max_chars) -> new summary
+SummarizeFn = Callable[[str, List[str], int], str]
+
+
+def _clip(s: str, n: int) -> str:
+    t = " ".join((s or "").split())
+    return t if len(t) <= n else t[: max(0, n - 1)] + "…"
+
+
+def stub_summarize(previous: str, lines: List[str], max_chars: int) -> str:
+    """Local extractive summary: clipped lines appended, oldest dropped past max_chars."""
+    out = [ln for ln in (previous or "").split("\n") if ln.strip()]
+    out.extend("- " + _clip(ln, 80) for ln in lines if ln.strip())
+    while out and len("\n".join(out)) > max_chars:
+        out.pop(0)
+    return "\n".join(out)
+
+
+def llm_summarizer(generate_text: Callable[..., str]) -> SummarizeFn:
+    """Wrap a `generate_text(prompt=..., system_prompt=...)` callable; falls back to the stub."""
+
+    def _summarize(previous: str, lines: List[str], max_chars: int) -> str:
+        prompt = (
+            f"[これまでの要約]\n{previous or '(なし)'}\n\n[新しい会話]\n"
+            + "\n".join(lines)
+            + f"\n\n{max_chars}文字以内で更新後の要約だけを出力してください。"
+        )
+        text = (generate_text(prompt=prompt, system_prompt=SUMMARY_SYSTEM_PROMPT) or "").strip()
+        if not text:
+            return stub_summarize(previous, lines, max_chars)
+        return text[:max_chars]
+
+    return _summarize
+
+
+@dataclass
+class ConversationSummarizer:
+    """Folds older conversation messages into a running summary.
+
+    Everything except the newest `keep_recent` in-context messages is
+    eligible; once at least `min_batch` new ones have accumulated they are
+    merged into the stored summary (bounded by `max_chars`). Prompt views
+    read only messages after the summary's `upto_id`.
+    """
+
+    store: ConversationStore
+    summarize: SummarizeFn = stub_summarize
+    keep_recent: int = 16
+    min_batch: int = 8
+    max_chars: int = 800
+
+    def compact_once(self) -> bool:
+        cur = self.store.get_summary()
+        pending = self.store.unsummarized(after_id=int(cur.get("upto_id") or 0), keep_recent=self.keep_recent)
+        if len(pending) < max(1, self.min_batch):
+            return False
+        lines = [f"[{m['role']}] {m['text']}" for m in pending]
+        text = self.summarize(str(cur.get("text") or ""), lines, self.max_chars)
+        self.store.set_summary(text=text, upto_id=int(pending[-1]["id"]))
+        return True
+
+
+class _CompactionWorker:
+    """Single background thread; requests for the same store are coalesced."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending: Dict[str, Callable[[], Optional[ConversationSummarizer]]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def request(self, key: str, factory: Callable[[], Optional[ConversationSummarizer]]) -> None:
+        with self._lock:
+            self._pending[key] = factory
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="conversation-summary", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(timeout=30.0)
+            self._wake.clear()
+            with self._lock:
+                jobs = list(self._pending.values())
+                self._pending.clear()
+            for factory in jobs:
+                try:
+                    summarizer = factory()
+                    # Catch up in batches if many messages arrived at once.
+                    for _ in range(16):
+                        if summarizer is None or not summarizer.compact_once():
+                            break
+                except Exception:
+                    continue
+
+
+_worker = _CompactionWorker()
+
+
+def schedule_compaction(key: str, factory: Callable[[], Optional[ConversationSummarizer]]) -> None:
+    """Run `factory().compact_once()` off the request path (coalesced per key)."""
+    _worker.request(key, factory)
+
+
+def summary_config(appcfg: Dict[str, Any]) -> Dict[str, Any]:
+    rag = appcfg.get("rag") if isinstance(appcfg, dict) else None
+    raw = (rag or {}).get("summary") if isinstance(rag, dict) else None
+    cfg = raw if isinstance(raw, dict) else {}
+    return {
+        "enabled": bool(cfg.get("enabled", True)),
+        "provider": str(cfg.get("provider") or "llm").strip().lower(),
+        "keep_recent": int(cfg.get("keep_recent_messages", 16)),
+        "min_batch": int(cfg.get("min_batch", 8)),
+        "max_chars": int(cfg.get("max_chars", 800)),
+    }
@@ -1,102 +1,62 @@
 from __future__ import annotations
 
-import sqlite3
+import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List
+
+from rag.conversation_store import get_conversation_store
 
 
 @dataclass
 class TurnsStore:
+    """Console "Short-Term Turns" view over the conversation store.
+
+    `db_path` is the conversation database; turns are user/assistant message
+    pairs sharing a run_id.
+    """
+
     db_path: Path
 
-    def _connect(self) -> sqlite3.Connection:
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        con = sqlite3.connect(str(self.db_path))
-        con.row_factory = sqlite3.Row
-        return con
+    @property
+    def _store(self):
+        return get_conversation_store(self.db_path)
 
     def init(self) -> None:
-        with self._connect() as con:
-            con.execute(
-                """
-                CREATE TABLE IF NOT EXISTS turns (
-                  id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  user_text TEXT NOT NULL,
-                  assistant_text TEXT NOT NULL,
-                  created_at TEXT NOT NULL
-                )
-                """
-            )
-            con.execute("CREATE INDEX IF NOT EXISTS idx_turns_created ON turns(created_at)")
-            con.commit()
+        self._store.init()
+
+    def version(self) -> int:
+        return self._store.version()
 
-    def add_turn(self, *, user_text: str, assistant_text: str, created_at: str, max_keep: int) -> int:
+    def add_turn(self, *, user_text: str, assistant_text: str, created_at: str, max_keep: int = 0) -> int:
+        """Append a user/assistant pair (retention is handled by the conversation store)."""
         u = (user_text or "").strip()
         a = (assistant_text or "").strip()
         if not u or not a:
             raise ValueError("missing_text")
-
-        self.init()
-        with self._connect() as con:
-            cur = con.execute(
-                "INSERT INTO turns(user_text, assistant_text, created_at) VALUES(?,?,?)",
-                (u, a, created_at),
-            )
-            con.commit()
-
-            # Best-effort retention
-            try:
-                keep = max(1, min(5000, int(max_keep)))
-                con.execute(
-                    "DELETE FROM turns WHERE id NOT IN (SELECT id FROM turns ORDER BY id DESC LIMIT ?)",
-                    (keep,),
-                )
-                con.commit()
-            except Exception:
-                pass
-
-            return int(cur.lastrowid)
+        run_id = f"turn_{uuid.uuid4().hex[:12]}"
+        self._store.append(role="user", text=u, run_id=run_id, ts=created_at)
+        return int(self._store.append(role="assistant", text=a, run_id=run_id, ts=created_at) or 0)
 
     def list(self, *, limit: int = 200) -> List[Dict[str, Any]]:
-        lim = max(1, min(2000, int(limit)))
-        self.init()
-        with self._connect() as con:
-            rows = con.execute(
-                "SELECT id, user_text, assistant_text, created_at FROM turns ORDER BY id DESC LIMIT ?",
-                (lim,),
-            ).fetchall()
-            out: List[Dict[str, Any]] = []
-            for r in rows:
-                out.append(
-                    {
-                        "id": int(r["id"]),
-                        "user_text": str(r["user_text"] or ""),
-                        "assistant_text": str(r["assistant_text"] or ""),
-                        "created_at": str(r["created_at"] or ""),
-                    }
-                )
-            return out
+        return self._store.turns(limit=limit)
 
     def delete(self, *, row_id: int) -> bool:
-        self.init()
-        with self._connect() as con:
-            cur = con.execute("DELETE FROM turns WHERE id = ?", (int(row_id),))
-            con.commit()
-            return int(cur.rowcount or 0) > 0
+        return self._store.forget_run_of(row_id=int(row_id))
 
     def clear(self) -> None:
-        self.init()
-        with self._connect() as con:
-            con.execute("DELETE FROM turns")
-            con.commit()
+        self._store.forget_all()
+
+    def summary_text(self) -> str:
+        return str(self._store.get_summary().get("text") or "").strip()
 
     def get_prompt_context(self, *, turns_to_prompt: int) -> str:
         n = max(0, min(100, int(turns_to_prompt)))
         if n <= 0:
             return ""
-        items = self.list(limit=n)
-        items = list(reversed(items))
+        # Turns already folded into the running summary are not repeated.
+        upto = int(self._store.get_summary().get("upto_id") or 0)
+        items = list(reversed(self._store.turns(limit=n, after_id=upto)))
         parts: List[str] = []
         for it in items:
             u = (it.get("user_text") or "").strip()
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import math
+import re
+import sqlite3
+import threading
+import unicodedata
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.sqlite_pool import ensure_schema, get_connection
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token estimate: ~4 ASCII chars per token, 1 per CJK char."""
+    s = text or ""
+    ascii_n = sum(1 for ch in s if ord(ch) < 128)
+    return int(math.ceil(ascii_n / 4.0)) + (len(s) - ascii_n)
+
+
+class HashingEncoder:
+    """Local CPU encoder: signed feature hashing of char n-grams and words.
+
+    Character 2/3-grams work for Japanese without a tokenizer; ASCII words add
+    whole-term matches. Hashing uses crc32 so vectors are stable across
+    processes and can be persisted.
+    """
+
+    def __init__(self, *, dim: int = 512, ngrams: Tuple[int, ...] = (2, 3)) -> None:
+        self.dim = int(dim)
+        self.ngrams = tuple(int(n) for n in ngrams)
+        self.name = f"hash-v1-{self.dim}-{'.'.join(str(n) for n in self.ngrams)}"
+
+    def _features(self, text: str) -> Counter:
+        s = unicodedata.normalize("NFKC", text or "").lower()
+        s = _SPACE_RE.sub(" ", s).strip()
+        feats: Counter = Counter()
+        for n in self.ngrams:
+            for i in range(0, max(0, len(s) - n + 1)):
+                g = s[i : i + n]
+                if " " in g:
+                    continue
+                feats[g] += 1
+        for w in _WORD_RE.findall(s):
+            feats["w:" + w] += 1
+        return feats
+
+    def encode(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for feat, tf in self._features(text).items():
+            h = zlib.crc32(feat.encode("utf-8"))
+            sign = -1.0 if (h >> 31) & 1 else 1.0
+            vec[h % self.dim] += sign * (1.0 + math.log(tf))
+        norm = float(np.linalg.norm(vec))
+        if norm > 0:
+            vec /= norm
+        return vec
+
+    def encode_many(self, texts: Iterable[str]) -> np.ndarray:
+        rows = [self.encode(t) for t in texts]
+        if not rows:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.vstack(rows)
+
+
+class _Matrix:
+    """In-memory vectors of one rag_type (brute-force inner product)."""
+
+    def __init__(self, dim: int) -> None:
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.vecs = np.zeros((0, dim), dtype=np.float32)
+
+    def put(self, item_id: int, vec: np.ndarray) -> None:
+        self.remove(item_id)
+        self.ids = np.append(self.ids, np.int64(item_id))
+        self.vecs = np.vstack([self.vecs, vec[None, :]])
+
+    def remove(self, item_id: int) -> bool:
+        mask = self.ids != item_id
+        if bool(mask.all()):
+            return False
+        self.ids = self.ids[mask]
+        self.vecs = self.vecs[mask]
+        return True
+
+
+class VectorIndex:
+    """Embedding index stored next to `rag_items` in the same SQLite file.
+
+    Vectors live in `rag_vectors` (one row per item) and are mirrored in
+    memory per rag_type; updates are incremental. Items missing a vector (or
+    encoded by a different encoder) are backfilled on first load.
+    """
+
+    def __init__(self, db_path: Path, *, encoder: Optional[HashingEncoder] = None) -> None:
+        self.db_path = Path(db_path)
+        self.encoder = encoder or HashingEncoder()
+        self._lock = threading.Lock()
+        self._mats: Dict[str, _Matrix] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        return get_connection(self.db_path)
+
+    def init(self) -> None:
+        ensure_schema(self.db_path, "rag_vectors", self._create_schema)
+
+    @staticmethod
+    def _create_schema(con: sqlite3.Connection) -> None:
+        con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rag_vectors (
+              item_id INTEGER PRIMARY KEY,
+              rag_type TEXT NOT NULL,
+              encoder TEXT NOT NULL,
+              vec BLOB NOT NULL
+            )
+            """
+        )
+        con.execute("CREATE INDEX IF NOT EXISTS idx_rag_vectors_type ON rag_vectors(rag_type)")
+
+    @staticmethod
+    def item_text(title: str, text: str) -> str:
+        return f"{(title or '').strip()}\n{(text or '').strip()}".strip()
+
+    def _load(self, rag_type: str) -> _Matrix:
+        mat = self._mats.get(rag_type)
+        if mat is not None:
+            return mat
+        self.init()
+        mat = _Matrix(self.encoder.dim)
+        with self._connect() as con:
+            has_items = con.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rag_items'"
+            ).fetchone()
+            if has_items:
+                # Backfill items written before the index existed (or by another encoder).
+                missing = con.execute(
+                    """
+                    SELECT i.id, i.title, i.text FROM rag_items i
+                    LEFT JOIN rag_vectors v ON v.item_id = i.id AND v.encoder = ?
+                    WHERE i.rag_type = ? AND v.item_id IS NULL
+                    """,
+                    (self.encoder.name, rag_type),
+                ).fetchall()
+                for r in missing:
+                    vec = self.encoder.encode(self.item_text(r["title"], r["text"]))
+                    con.execute(
+                        "INSERT OR REPLACE INTO rag_vectors(item_id, rag_type, encoder, vec) VALUES(?,?,?,?)",
+                        (int(r["id"]), rag_type, self.encoder.name, vec.tobytes()),
+                    )
+                con.execute(
+                    "DELETE FROM rag_vectors WHERE rag_type = ? AND item_id NOT IN (SELECT id FROM rag_items)",
+                    (rag_type,),
+                )
+            rows = con.execute(
+                "SELECT item_id, vec FROM rag_vectors WHERE rag_type = ? AND encoder = ? ORDER BY item_id",
+                (rag_type, self.encoder.name),
+            ).fetchall()
+            con.commit()
+        if rows:
+            mat.ids = np.array([int(r["item_id"]) for r in rows], dtype=np.int64)
+            mat.vecs = np.vstack([np.frombuffer(r["vec"], dtype=np.float32) for r in rows])
+        self._mats[rag_type] = mat
+        return mat
+
+    def add(self, *, item_id: int, rag_type: str, title: str, text: str) -> None:
+        vec = self.encoder.encode(self.item_text(title, text))
+        self.init()
+        with self._lock:
+            with self._connect() as con:
+                con.execute(
+                    "INSERT OR REPLACE INTO rag_vectors(item_id, rag_type, encoder, vec) VALUES(?,?,?,?)",
+                    (int(item_id), rag_type, self.encoder.name, vec.tobytes()),
+                )
+                con.commit()
+            mat = self._mats.get(rag_type)
+            if mat is not None:
+                mat.put(int(item_id), vec)
+
+    def remove(self, *, item_id: int) -> None:
+        self.init()
+        with self._lock:
+            with self._connect() as con:
+                con.execute("DELETE FROM rag_vectors WHERE item_id = ?", (int(item_id),))
+                con.commit()
+            for mat in self._mats.values():
+                mat.remove(int(item_id))
+
+    def count(self, rag_type: str) -> int:
+        with self._lock:
+            return int(self._load(rag_type).ids.shape[0])
+
+    def search(self, query: str, *, rag_type: str, k: int = 8, min_score: float = 0.05) -> List[Tuple[int, float]]:
+        """Top-k (item_id, cosine score), best first."""
+        q = self.encoder.encode(query)
+        if not np.any(q):
+            return []
+        with self._lock:
+            mat = self._load(rag_type)
+            ids, vecs = mat.ids, mat.vecs
+        if ids.shape[0] == 0:
+            return []
+        scores = vecs @ q
+        kk = max(1, min(int(k), ids.shape[0]))
+        if kk < ids.shape[0]:
+            top = np.argpartition(-scores, kk - 1)[:kk]
+        else:
+            top = np.arange(ids.shape[0])
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(ids[i]), float(scores[i])) for i in top if float(scores[i]) >= min_score]
+
+
+_indexes: Dict[str, VectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_vector_index(db_path: Path) -> VectorIndex:
+    """Process-wide index per database (keeps the in-memory matrix warm)."""
+    key = str(Path(db_path).resolve())
+    with _indexes_lock:
+        idx = _indexes.get(key)
+        if idx is None:
+            idx = VectorIndex(Path(db_path))
+            _indexes[key] = idx
+        return idx
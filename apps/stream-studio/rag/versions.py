@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Dict
+
+# In-process change counters for RAG/turn stores. Caches key derived text on
+# these instead of re-querying SQLite on every prompt.
+_versions: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def _key(kind: str, db_path: Path, part: str = "") -> str:
+    return f"{kind}:{Path(db_path)}:{part}"
+
+
+def bump_version(kind: str, db_path: Path, part: str = "") -> int:
+    k = _key(kind, db_path, part)
+    with _lock:
+        v = _versions.get(k, 0) + 1
+        _versions[k] = v
+        return v
+
+
+def store_version(kind: str, db_path: Path, part: str = "") -> int:
+    with _lock:
+        return _versions.get(_key(kind, db_path, part), 0)
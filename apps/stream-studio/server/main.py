@@ -9,12 +9,13 @@ import threading
 import time
 import traceback
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import yaml
 import anyio
-from fastapi import FastAPI, File, Form, UploadFile
+from fastapi import FastAPI, File, Form, Request, UploadFile
 from fastapi.responses import RedirectResponse
+from fastapi.responses import StreamingResponse
 from fastapi.responses import JSONResponse
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -22,7 +23,15 @@ from fastapi.staticfiles import StaticFiles
 from starlette.responses import Response
 from pydantic import BaseModel, Field
 
+from core.config_cache import invalidate_config_cache, load_yaml_cached, read_json_cached
+from core.event_store import EventLogWriter, event_store_root, flush_all_event_stores, get_event_store
+from core.jsonl_index import get_jsonl_index
+from core.metrics import get_metrics
+from core.tracing import get_tracer, record_span, span, trace_context
+from core.log_sink import LogSinkConfig, configure_log_sinks, flush_all_log_sinks
+from core.pending_store import PendingStore
 from core.settings import load_settings
+from core.state_store import VersionedStateStore, flush_all_state_stores, get_state_store
 from core.storage import JsonlWriter, read_json, tail_jsonl, utc_iso, write_json
 from core.types import ApproveIn, AssistantOutput, EventIn, PendingItem, RejectIn
 from live2d.hotkeys import HotkeyMap
@@ -31,20 +40,39 @@ from obs.writer import OBSOverlayWriter
 from orchestrator.mvp_service import OrchestratorMVP
 from rag.long_term.store import LongTermStore
 from rag.short_term.memory import ShortTermMemory
+from rag.conversation_store import conversation_db_path, get_conversation_store
+from rag.summary import ConversationSummarizer, llm_summarizer, schedule_compaction, stub_summarize, summary_config
+from rag.context_assembler import ContextAssembler, ContextSection, get_context_assembler
 from rag.items_store import RagItemsStore
+from rag.vector_index import get_vector_index
 from rag.turns_store import TurnsStore
 from core.prompts import read_prompt_text
+from tts.pipeline import OrderedSegmentPipeline, configure_provider_limits, provider_slot
+from tts.audio_chain import AudioChainConfig
+from tts.cache import get_tts_cache
+from tts.client_pool import get_google_tts_pool
 from tts.service import TTSService
 from vlm.screenshot import ScreenshotCapturer
 from vlm.summarizer import VLMSummarizer
 from llm.gemini_mvp import GeminiMVP
+from llm.genai_pool import get_genai_client
+from llm.streaming import (
+    ACK_PREFIXES,
+    LeadingSpeechFilter,
+    SentenceSegmenter,
+    StreamingReplyParser,
+    clamp_reply_text,
+    split_sentences,
+)
 from llm.anim_selector import AnimationLLMConfig, AnimationSelectOut, select_animation
 from stt.vad import VADConfig
 from stt.whisper_service import WhisperConfig, transcribe_pcm_with_vad, get_model
 
-from lip_sync.curve import build_curve_from_timeline, wav_duration_ms
+from lip_sync.curve import LipSyncCurve, build_curve_from_timeline, samples_duration_ms, wav_duration_ms
+from lip_sync.curve_codec import iter_binary_chunks
+from lip_sync.worker import submit_upgrade
 from lip_sync.mapper import LipSyncMapper, MouthPose
-from lip_sync.aligner import MFAAligner, WhisperAligner
+from lip_sync.aligner import MFAAligner, WhisperAligner, warm_up_tokenizer
 
 
 def _try_inject_motions_into_model3(model3_path: Path) -> None:
@@ -84,22 +112,11 @@ def _try_inject_motions_into_model3(model3_path: Path) -> None:
 
 
 def _load_app_yaml(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        return {}
-    try:
-        return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
-    except Exception:
-        return {}
+    return load_yaml_cached(path)
 
 
 def _load_lip_sync_yaml() -> Dict[str, Any]:
-    path = Path("config/stream-studio/lip_sync.yaml")
-    if not path.exists():
-        return {}
-    try:
-        return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
-    except Exception:
-        return {}
+    return load_yaml_cached(Path("config/stream-studio/lip_sync.yaml"))
 
 
 def _make_lip_sync_mapper(cfg: Dict[str, Any]) -> LipSyncMapper:
@@ -130,14 +147,129 @@ def _make_lip_sync_mapper(cfg: Dict[str, Any]) -> LipSyncMapper:
     )
 
 
+def _whisper_aligner(wcfg: Any) -> WhisperAligner:
+    """Aligner from lip_sync.yaml `aligner.whisper` (the model itself is shared via stt.whisper_service)."""
+    wcfg = wcfg if isinstance(wcfg, dict) else {}
+    return WhisperAligner(
+        model_size=str(wcfg.get("model_size", "small") or "small"),
+        language=str(wcfg.get("language", "ja") or "ja"),
+        beam_size=int(wcfg.get("beam_size", 1) or 1),
+        vad_filter=bool(wcfg.get("vad_filter", True)),
+        device=str(wcfg.get("device", "auto") or "auto"),
+        compute_type=str(wcfg.get("compute_type", "default") or "default"),
+    )
+
+
 def _generate_lipsync_json_best_effort(
     *,
     data_dir: Path,
     wav_path: Path,
     text: str,
     out_json_path: Path,
+    audio: Optional[Tuple[Any, int]] = None,
+    use_aligner: bool = True,
+) -> Optional[str]:
+    """Return web path like /audio/... or None (never raises).
+
+    `audio` is the synthesized (samples, sample_rate) buffer; when given the WAV is not re-read.
+    With `output.binary` set (u8|f16) the compact curve is written next to the JSON
+    (`.lipsync.bin`) and its path is returned instead. `use_aligner=False` skips the
+    configured forced aligner (envelope-only curve).
+    """
+    with span("lipsync.generate", wav=wav_path.name, aligned=use_aligner):
+        return _generate_lipsync_json(
+            data_dir=data_dir,
+            wav_path=wav_path,
+            text=text,
+            out_json_path=out_json_path,
+            audio=audio,
+            use_aligner=use_aligner,
+        )
+
+
+def _lipsync_aligner_type() -> str:
+    try:
+        return str(((_load_lip_sync_yaml() or {}).get("aligner") or {}).get("type", "none")).lower()
+    except Exception:
+        return "none"
+
+
+def _schedule_lipsync_upgrade(
+    *,
+    data_dir: Path,
+    wav_path: Path,
+    text: str,
+    out_json_path: Path,
+    audio: Optional[Tuple[Any, int]],
+    apply: Callable[[Dict[str, Any], str], None],
+) -> bool:
+    """Compute the aligned curve on the lip-sync pool, then patch stage state.
+
+    Audio is published first with a provisional envelope-only curve (see
+    `use_aligner=False`); once the aligned curve is written, `apply(state, path)`
+    runs inside a state-store mutation so the stage can swap curves mid-playback.
+    Returns False when no aligner is configured (the provisional curve is final).
+    """
+    if _lipsync_aligner_type() not in ("whisper", "mfa"):
+        return False
+    name = out_json_path.name
+    stem = name[: -len(".lipsync.json")] if name.endswith(".lipsync.json") else out_json_path.stem
+    aligned_json = out_json_path.with_name(f"{stem}.aligned.lipsync.json")
+    submit_upgrade(
+        lambda: _generate_lipsync_json_best_effort(
+            data_dir=data_dir, wav_path=wav_path, text=text, out_json_path=aligned_json, audio=audio
+        ),
+        lambda path: _stage_state(data_dir).mutate(lambda st: apply(st, path)),
+    )
+    return True
+
+
+def _schedule_legacy_lipsync_upgrade(
+    *,
+    data_dir: Path,
+    wav_path: Path,
+    text: str,
+    audio: Optional[Tuple[Any, int]],
+    state: Dict[str, Any],
+) -> None:
+    """Aligned-curve upgrade for the single-file (tts_latest.wav) stage path.
+
+    `wav_path` must be the per-run WAV (`audio/<run_id>.wav`), not tts_latest.wav:
+    the next reply overwrites tts_latest.wav, and the aligned curve is named from
+    this stem so concurrent jobs never write the same file.
+    """
+    if not state.get("tts_lipsync_path"):
+        return
+    version = state.get("tts_version")
+
+    def _apply(st: Dict[str, Any], path: str) -> None:
+        # tts_latest.wav is reused by every reply: only upgrade the playback it was made for.
+        if st.get("tts_version") == version:
+            st["tts_lipsync_path"] = path
+            st["updated_at"] = utc_iso()
+
+    try:
+        _schedule_lipsync_upgrade(
+            data_dir=data_dir,
+            wav_path=wav_path,
+            text=text,
+            out_json_path=wav_path.with_suffix(".lipsync.json"),
+            audio=audio,
+            apply=_apply,
+        )
+    except Exception:
+        pass
+
+
+def _generate_lipsync_json(
+    *,
+    data_dir: Path,
+    wav_path: Path,
+    text: str,
+    out_json_path: Path,
+    audio: Optional[Tuple[Any, int]] = None,
+    use_aligner: bool = True,
 ) -> Optional[str]:
-    """Return web path like /audio/... or None (never raises)."""
     try:
         cfg = _load_lip_sync_yaml()
         out_cfg = (cfg or {}).get("output", {})
@@ -150,13 +282,20 @@ def _generate_lipsync_json_best_effort(
         attack_ms = int(smooth_cfg.get("attack_ms", 45))
         release_ms = int(smooth_cfg.get("release_ms", 90))
         alpha = float(mix_cfg.get("alpha_viseme_open", 0.75))
+        binary = str(out_cfg.get("binary", "u8") or "").strip().lower()
+        if binary not in ("u8", "f16"):
+            binary = ""
 
-        duration_ms = wav_duration_ms(wav_path)
+        if audio is not None and audio[0] is not None and audio[1]:
+            duration_ms = samples_duration_ms(audio[0], audio[1])
+        else:
+            audio = None
+            duration_ms = wav_duration_ms(wav_path)
         mapper = _make_lip_sync_mapper(cfg)
 
         phonemes = None
         try:
-            aligner_type = str(aligner_cfg.get("type", "none")).lower()
+            aligner_type = str(aligner_cfg.get("type", "none")).lower() if use_aligner else "none"
             if aligner_type == "mfa":
                 mfa_cfg = aligner_cfg.get("mfa", {})
                 dict_path = str(mfa_cfg.get("dict_path", "") or "").strip()
@@ -170,13 +309,7 @@ def _generate_lipsync_json_best_effort(
                     phonemes = aligner.align(audio_wav_path=wav_path, text=text)
             elif aligner_type == "whisper":
                 wcfg = aligner_cfg.get("whisper", {})
-                aligner = WhisperAligner(
-                    model_size=str((wcfg or {}).get("model_size", "small") or "small"),
-                    language=str((wcfg or {}).get("language", "ja") or "ja"),
-                    beam_size=int((wcfg or {}).get("beam_size", 1) or 1),
-                    vad_filter=bool((wcfg or {}).get("vad_filter", True)),
-                )
-                phonemes = aligner.align(audio_wav_path=wav_path, text=text)
+                phonemes = _whisper_aligner(wcfg).align(audio_wav_path=wav_path, text=text)
         except Exception:
             phonemes = None
 
@@ -186,27 +319,36 @@ def _generate_lipsync_json_best_effort(
             mapper=mapper,
             phoneme_events=phonemes,
             viseme_events=None,
-            wav_path_for_envelope=wav_path,
+            wav_path_for_envelope=None if audio is not None else wav_path,
+            envelope_audio=audio,
             alpha_viseme_open=alpha,
             speech_pad_ms=speech_pad_ms,
             attack_ms=attack_ms,
             release_ms=release_ms,
         )
         curve.write_json(out_json_path)
+        out_path = out_json_path
+        if binary:
+            try:
+                out_bin_path = out_json_path.with_suffix(".bin")
+                curve.write_binary(out_bin_path, encoding=binary)
+                out_path = out_bin_path
+            except Exception:
+                out_path = out_json_path
 
         # Compute a stable web path (/audio/...) even if caller mixes relative/absolute Paths.
         audio_root = (data_dir / "audio")
         rel = None
         try:
-            rel = out_json_path.relative_to(audio_root)
+            rel = out_path.relative_to(audio_root)
         except Exception:
             try:
-                rel = out_json_path.resolve().relative_to(audio_root.resolve())
+                rel = out_path.resolve().relative_to(audio_root.resolve())
             except Exception:
                 try:
                     import os
 
-                    rel = Path(os.path.relpath(str(out_json_path), str(audio_root)))
+                    rel = Path(os.path.relpath(str(out_path), str(audio_root)))
                 except Exception:
                     rel = None
 
@@ -328,7 +470,7 @@ def _console_settings_path(settings: "Settings") -> Path:
 
 
 def _load_console_settings(settings: "Settings") -> Dict[str, Any]:
-    raw = read_json(_console_settings_path(settings))
+    raw = read_json_cached(_console_settings_path(settings))
     return raw if isinstance(raw, dict) else {}
 
 
@@ -361,9 +503,88 @@ def _rag_items_db_path(settings: Settings) -> Path:
 
 
 def _turns_db_path(settings: Settings) -> Path:
+    # Turns are a view over the unified conversation store.
+    return conversation_db_path(settings.data_dir)
+
+
+def _legacy_turns_db_path(settings: Settings) -> Path:
     return settings.data_dir / "rag" / "short_term_turns.sqlite"
 
 
+def _context_assembler(appcfg: Dict[str, Any]) -> ContextAssembler:
+    ctx = appcfg.get("context") if isinstance(appcfg, dict) else None
+    return get_context_assembler((ctx or {}).get("budgets") if isinstance(ctx, dict) else None)
+
+
+def _build_web_rag_context(*, settings: Settings, appcfg: Dict[str, Any], query: str) -> str:
+    """Prompt context for web_submit: recent turns + shortRAG (cached) + retrieved longRAG."""
+    asm = _context_assembler(appcfg)
+    sections: List[ContextSection] = []
+    try:
+        if settings.short_term_enabled and settings.short_term_turns_to_prompt > 0:
+            turns_store = TurnsStore(db_path=_turns_db_path(settings))
+            n = settings.short_term_turns_to_prompt
+            sections.append(asm.dynamic("conversation_summary", turns_store.summary_text()))
+            sections.append(
+                asm.static(
+                    "short_term_turns",
+                    version=(str(turns_store.db_path), turns_store.version(), n),
+                    build=lambda: turns_store.get_prompt_context(turns_to_prompt=n),
+                )
+            )
+    except Exception:
+        pass
+    try:
+        if settings.rag_enabled:
+            rag_store = RagItemsStore(db_path=_rag_items_db_path(settings))
+            # shortRAG is the small always-on note set; longRAG is the knowledge base.
+            sections.append(
+                asm.static(
+                    "shortRAG",
+                    version=(str(rag_store.db_path), rag_store.version("short")),
+                    build=lambda: rag_store.get_concat_text(rag_type="short", limit=50),
+                )
+            )
+            top_k = settings.rag_top_k
+            budget = asm.budget_for("longRAG", settings.rag_token_budget)
+            sections.append(
+                asm.static(
+                    "longRAG",
+                    version=(str(rag_store.db_path), rag_store.version("long"), query, top_k),
+                    build=lambda: rag_store.get_relevant_text(
+                        rag_type="long", query=query, top_k=top_k, token_budget=budget
+                    ),
+                    budget=budget,
+                    keep="head",
+                )
+            )
+    except Exception:
+        pass
+    return asm.render(sections)
+
+
+def _conversation_summarizer(data_dir: Path) -> Optional[ConversationSummarizer]:
+    settings = load_settings()
+    cfg = summary_config(_load_app_yaml(Path("config/stream-studio/app.yaml")))
+    if not cfg["enabled"]:
+        return None
+    summarize = stub_summarize
+    if cfg["provider"] == "llm" and (settings.gemini_api_key or "").strip():
+        gem = GeminiMVP(
+            api_key=settings.gemini_api_key,
+            model=settings.gemini_model,
+            generation_config={"thinking_config": {"thinking_budget": 0}},
+        )
+        summarize = llm_summarizer(gem.generate_text)
+    return ConversationSummarizer(
+        store=get_conversation_store(conversation_db_path(data_dir)),
+        summarize=summarize,
+        keep_recent=cfg["keep_recent"],
+        min_batch=cfg["min_batch"],
+        max_chars=cfg["max_chars"],
+    )
+
+
 def _make_llm_and_vlm(
     *, settings: Settings, lt: LongTermStore, llm_provider: Optional[str] = None
 ) -> tuple[Any, VLMSummarizer]:
@@ -516,6 +737,10 @@ def _log_gemini_status(writer: JsonlWriter, *, candidate: AssistantOutput, model
     info = _classify_gemini_notes(notes)
     status = info.get("status") or "succeeded"
     reason = info.get("reason")
+    if status == "failed":
+        get_metrics().inc("fallbacks_total", kind="gemini_failed")
+    elif status == "not_called":
+        get_metrics().inc("fallbacks_total", kind="gemini_not_called")
     if status == "not_called":
         message = "Gemini not called"
     elif status == "failed":
@@ -781,12 +1006,29 @@ def _anim_state_path(data_dir: Path) -> Path:
     return data_dir / "state_anim.json"
 
 
-def _load_pending(data_dir: Path) -> Dict[str, Any]:
-    return read_json(_pending_path(data_dir)) or {"items": []}
+_pending_stores: Dict[str, PendingStore] = {}
+_pending_stores_lock = threading.Lock()
 
 
-def _chat_log_path(data_dir: Path) -> Path:
-    return data_dir / "logs" / "chat.jsonl"
+def _pending_db_path(data_dir: Path) -> Path:
+    return data_dir / "manager" / "pending.sqlite"
+
+
+def _pending_store(data_dir: Path) -> PendingStore:
+    key = str(_pending_db_path(data_dir).resolve())
+    with _pending_stores_lock:
+        store = _pending_stores.get(key)
+        if store is None:
+            appcfg = _load_app_yaml(Path("config/stream-studio/app.yaml"))
+            keep = int((appcfg.get("manager", {}) or {}).get("pending_keep_decided") or 500)
+            store = PendingStore(db_path=_pending_db_path(data_dir), keep_decided=keep)
+            try:
+                # Legacy pending.json is imported once, then renamed to *.migrated.
+                store.import_legacy_json(_pending_path(data_dir))
+            except Exception:
+                pass
+            _pending_stores[key] = store
+        return store
 
 
 def _anim_select_log_path(data_dir: Path) -> Path:
@@ -853,71 +1095,63 @@ def _append_anim_select_log(
         pass
 
 
-def _append_chat_log(*, data_dir: Path, run_id: str, role: str, text: str, source: str, meta: Optional[Dict[str, Any]] = None) -> None:
+def _append_chat_log(
+    *,
+    data_dir: Path,
+    run_id: str,
+    role: str,
+    text: str,
+    source: str,
+    meta: Optional[Dict[str, Any]] = None,
+    in_context: bool = True,
+) -> None:
+    """Single write per message: chat export, short-term context and turns derive from it."""
     try:
-        t = (text or "").strip()
-        if not t:
-            return
-        writer = JsonlWriter(_chat_log_path(data_dir))
-        writer.append(
-            {
-                "ts": utc_iso(),
-                "run_id": run_id,
-                "role": role,
-                "source": source,
-                "text": t,
-                "meta": meta or {},
-            }
+        get_conversation_store(conversation_db_path(data_dir)).append(
+            role=role,
+            text=text,
+            run_id=run_id,
+            source=source,
+            meta=meta,
+            in_context=in_context,
         )
+        if in_context and role == "assistant":
+            # Fold older turns into the running summary in the background.
+            schedule_compaction(
+                str(conversation_db_path(data_dir)),
+                lambda: _conversation_summarizer(data_dir),
+            )
     except Exception:
         pass
 
 
-def _save_pending(data_dir: Path, obj: Any) -> None:
-    write_json(_pending_path(data_dir), obj)
-
-
 def _append_pending(data_dir: Path, item: PendingItem) -> None:
-    p = _load_pending(data_dir)
-    items = list(p.get("items", []))
-    items.append(item.model_dump(mode="json"))
-    p["items"] = items
-    _save_pending(data_dir, p)
+    _pending_store(data_dir).add(item)
 
 
 def _update_pending(data_dir: Path, pending_id: str, patch: Dict[str, Any]) -> Optional[PendingItem]:
-    p = _load_pending(data_dir)
-    items = list(p.get("items", []))
-    out_items = []
-    found: Optional[PendingItem] = None
-    for raw in items:
-        try:
-            it = PendingItem.model_validate(raw)
-        except Exception:
-            continue
-        if it.pending_id == pending_id:
-            merged = it.model_copy(deep=True)
-            for k, v in patch.items():
-                setattr(merged, k, v)
-            found = merged
-            out_items.append(merged.model_dump(mode="json"))
-        else:
-            out_items.append(it.model_dump(mode="json"))
-    p["items"] = out_items
-    _save_pending(data_dir, p)
-    return found
+    return _pending_store(data_dir).update(pending_id, patch)
+
+
+def _stage_state(data_dir: Path) -> VersionedStateStore:
+    # state.json is only an async snapshot; the in-memory store is authoritative.
+    return get_state_store(_state_path(data_dir))
+
+
+def _anim_state(data_dir: Path) -> VersionedStateStore:
+    return get_state_store(_anim_state_path(data_dir))
 
 
 def _load_state(data_dir: Path) -> Dict[str, Any]:
-    return read_json(_state_path(data_dir)) or {}
+    return _stage_state(data_dir).get()
 
 
 def _save_state(data_dir: Path, state: Dict[str, Any]) -> None:
-    write_json(_state_path(data_dir), state)
+    _stage_state(data_dir).replace(state)
 
 
 def _save_anim_state(data_dir: Path, state: Dict[str, Any]) -> None:
-    write_json(_anim_state_path(data_dir), state)
+    _anim_state(data_dir).replace(state)
 
 
 def _bump_live2d_seq(state: Dict[str, Any], *, tags: List[str], last_tag: Optional[str]) -> Dict[str, Any]:
@@ -1033,6 +1267,11 @@ def _update_last_vlm_summary(summary: str) -> None:
 
 
 def _get_latest_vlm_summary(events_path: Path, max_events: int = 200) -> str:
+    """Newest VLM summary among the last `max_events` events ("" if none is that recent).
+
+    Bounded on purpose: an old screen summary must not be presented as current.
+    The tail is read backwards from EOF, so no offset index is built here.
+    """
     try:
         for e in reversed(tail_jsonl(events_path, max_events)):
             if str(e.get("source") or "") == "vlm":
@@ -1059,6 +1298,31 @@ def _text_requests_vlm(text: str) -> bool:
     return False
 
 
+def _tts_service(*, settings: Settings, appcfg: Dict[str, Any], provider: str) -> TTSService:
+    """TTSService backed by the shared content-addressed audio cache (tts.cache in app.yaml)."""
+    tcfg = appcfg.get("tts") if isinstance(appcfg, dict) and isinstance(appcfg.get("tts"), dict) else {}
+    ccfg = tcfg.get("cache") if isinstance(tcfg.get("cache"), dict) else {}
+    cache = None
+    if bool(ccfg.get("enabled", True)):
+        try:
+            max_mb = float(ccfg.get("max_mb") or 256)
+            cache = get_tts_cache(settings.data_dir / "tts_cache", max_bytes=int(max_mb * 1024 * 1024))
+        except Exception:
+            cache = None
+    post = AudioChainConfig.from_dict(tcfg.get("postprocess") if isinstance(tcfg.get("postprocess"), dict) else None)
+    return TTSService(provider=provider, voice=settings.tts_voice, cache=cache, postprocess=post)
+
+
+def _resolve_tts_provider(settings: Settings, override: Optional[str] = None) -> str:
+    """Per-request override, else the configured provider (settings, env-overridable)."""
+    return (override or settings.tts_provider or "stub").strip().lower()
+
+
+def _should_warm_up_google_tts(*, settings: Settings, appcfg: Dict[str, Any]) -> bool:
+    tcfg = appcfg.get("tts") if isinstance(appcfg, dict) and isinstance(appcfg.get("tts"), dict) else {}
+    return bool(tcfg.get("warm_up", True)) and _resolve_tts_provider(settings) == "google"
+
+
 def _log_phase_timing(
     writer: JsonlWriter,
     *,
@@ -1082,6 +1346,27 @@ def _log_phase_timing(
     if payload:
         body["payload"].update(payload)
     writer.append(body)
+    _observe_phase_metrics(source=source, phase=phase, elapsed_ms=elapsed_ms, payload=payload)
+    try:
+        args = {k: v for k, v in (payload or {}).items() if isinstance(v, (str, int, float, bool)) or v is None}
+        record_span(f"{source}.{phase}", start=start, end=end, request_id=run_id, **args)
+    except Exception:
+        pass
+
+
+def _observe_phase_metrics(*, source: str, phase: str, elapsed_ms: float, payload: Optional[Dict[str, Any]]) -> None:
+    """Feed /metrics: latency per (phase, provider), plus error/fallback counters."""
+    try:
+        p = payload or {}
+        provider = str(p.get("provider") or p.get("llm_provider") or "")
+        metrics = get_metrics()
+        metrics.observe_latency(phase, elapsed_ms, provider=provider)
+        if p.get("error"):
+            metrics.inc("errors_total", source=source, phase=phase)
+        if source == "tts" and provider == "stub":
+            metrics.inc("fallbacks_total", kind="tts_stub")
+    except Exception:
+        pass
 
 
 def _should_summarize_vlm(
@@ -1105,7 +1390,7 @@ def _run_vlm_summary_sync(
 ) -> str:
     data_dir = settings.data_dir
     events_path = data_dir / "events.jsonl"
-    writer = JsonlWriter(events_path)
+    writer = EventLogWriter(events_path)
     run_id = _now_id()
     screenshot_path = Path(appcfg.get("vlm", {}).get("screenshot_path", settings.vlm_screenshot_path))
 
@@ -1391,11 +1676,55 @@ def _startup() -> None:
     (settings.data_dir / "manager").mkdir(parents=True, exist_ok=True)
     (settings.data_dir / "obs").mkdir(parents=True, exist_ok=True)
     (settings.data_dir / "logs").mkdir(parents=True, exist_ok=True)
+    appcfg: Dict[str, Any] = {}
     try:
         appcfg = _load_app_yaml(Path("config/stream-studio/app.yaml"))
+        configure_log_sinks(LogSinkConfig.from_dict(appcfg.get("logging")))
         _purge_legacy_long_term_docs(settings=settings, appcfg=appcfg)
     except Exception:
         pass
+    try:
+        # Create/migrate SQLite schemas once so request handlers skip DDL.
+        _get_long_term_store(settings=settings, appcfg=appcfg).init()
+        RagItemsStore(db_path=_rag_items_db_path(settings)).init()
+        # Load (and backfill) the RAG vector index before the first request.
+        for rt in ("short", "long"):
+            get_vector_index(_rag_items_db_path(settings)).count(rt)
+        get_conversation_store(conversation_db_path(settings.data_dir)).import_legacy_turns(
+            _legacy_turns_db_path(settings)
+        )
+    except Exception:
+        pass
+    try:
+        # Build the shared GenAI client up front (first LLM call skips SDK setup).
+        get_genai_client(settings.gemini_api_key)
+    except Exception:
+        pass
+    try:
+        # Connect the shared Google TTS clients and run one tiny synthesis so the
+        # first utterance does not pay credential discovery / channel setup.
+        if _should_warm_up_google_tts(settings=settings, appcfg=appcfg):
+            threading.Thread(
+                target=get_google_tts_pool().warm_up,
+                kwargs={"voice_name": settings.tts_voice or ""},
+                name="tts-warm-up",
+                daemon=True,
+            ).start()
+    except Exception:
+        pass
+    try:
+        # The whisper aligner needs the Janome dictionary and its own model; load both once, off-thread.
+        acfg = (_load_lip_sync_yaml() or {}).get("aligner") or {}
+        if str(acfg.get("type", "none")).lower() == "whisper":
+            aligner = _whisper_aligner(acfg.get("whisper"))
+
+            def _warm_aligner() -> None:
+                warm_up_tokenizer()
+                aligner.warm_up()
+
+            threading.Thread(target=_warm_aligner, name="lipsync-aligner-warm-up", daemon=True).start()
+    except Exception:
+        pass
     try:
         if settings.stt_enabled:
             device = (settings.whisper_device or "cpu").strip() or "cpu"
@@ -1408,6 +1737,15 @@ def _startup() -> None:
     _start_vlm_periodic_thread()
 
 
+@app.on_event("shutdown")
+def _shutdown() -> None:
+    # Persist the latest in-memory stage state snapshot and queued log lines
+    # (both are written asynchronously).
+    flush_all_state_stores()
+    flush_all_log_sinks()
+    flush_all_event_stores()
+
+
 class _NoCacheStaticFiles(StaticFiles):
     async def get_response(self, path: str, scope: Dict[str, Any]) -> Response:
         resp = await super().get_response(path, scope)
@@ -1524,10 +1862,48 @@ def tetris_videos(asset_path: str) -> Response:
 
 
 @app.get("/api/tetris/metrics")
-def tetris_metrics(run_id: str, limit: int = 2000) -> Dict[str, Any]:
+def tetris_metrics(run_id: str, limit: int = 2000, offset: Optional[int] = None) -> Dict[str, Any]:
+    """Last `limit` metric events, or a page starting at line `offset`."""
     path = _tetris_data_root() / "metrics" / run_id / "events.jsonl"
-    items = tail_jsonl(path, max_lines=limit)
-    return {"ok": True, "items": items}
+    if offset is None:
+        items = tail_jsonl(path, max_lines=limit)
+        return {"ok": True, "items": items}
+    idx = get_jsonl_index(path)
+    items = idx.read_lines(max(0, int(offset)), max(0, int(limit)))
+    return {"ok": True, "items": items, "offset": offset, "total": idx.indexed_lines}
+
+
+@app.get("/lipsync/bin/{json_path:path}")
+def lipsync_binary(json_path: str, encoding: str = "u8") -> Response:
+    """Stream a stored `.lipsync.json` curve (under /audio) in the compact LSC1 format.
+
+    Covers curves written without `output.binary`; new segments link the
+    `.lipsync.bin` file directly.
+    """
+    settings = load_settings()
+    audio_root = (settings.data_dir / "audio").resolve()
+    try:
+        path = (audio_root / json_path).resolve()
+        path.relative_to(audio_root)
+    except Exception:
+        return JSONResponse(status_code=404, content={"ok": False, "error": "not_found"})
+    if not path.name.endswith(".lipsync.json") or not path.is_file():
+        return JSONResponse(status_code=404, content={"ok": False, "error": "not_found"})
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        curve = LipSyncCurve(
+            fps=int(raw.get("fps") or 60),
+            duration_ms=int(raw.get("duration_ms") or 0),
+            mode=str(raw.get("mode") or ""),
+            series={str(k): list(v or []) for k, v in dict(raw.get("series") or {}).items()},
+            meta=dict(raw.get("meta") or {}),
+        )
+        chunks = iter_binary_chunks(curve, encoding=encoding)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"ok": False, "error": str(e)})
+    except Exception:
+        return JSONResponse(status_code=500, content={"ok": False, "error": "invalid_curve"})
+    return StreamingResponse(chunks, media_type="application/octet-stream", headers={"Cache-Control": "no-store"})
 
 
 @app.get("/api/models/index")
@@ -1609,6 +1985,34 @@ async def models_upload(
     return {"ok": True, "written": written, "skipped": skipped}
 
 
+@app.get("/metrics")
+def metrics() -> Response:
+    """Prometheus text exposition of pipeline latency histograms and counters."""
+    return Response(
+        content=get_metrics().render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+@app.get("/debug/traces")
+def debug_traces() -> Dict[str, Any]:
+    """Request ids with recorded spans (newest first)."""
+    return {"ok": True, "request_ids": get_tracer().request_ids()}
+
+
+@app.get("/debug/trace/{request_id}")
+def debug_trace(request_id: str) -> Response:
+    """Chrome trace JSON for one request (open in chrome://tracing or ui.perfetto.dev)."""
+    trace = get_tracer().export_chrome(request_id)
+    if trace is None:
+        return JSONResponse(status_code=404, content={"ok": False, "error": "trace_not_found"})
+    return JSONResponse(
+        content=trace,
+        headers={"Content-Disposition": f'inline; filename="trace_{re.sub(r"[^A-Za-z0-9_.-]", "_", request_id)}.json"'},
+    )
+
+
 @app.get("/diagnostics")
 def diagnostics() -> Dict[str, Any]:
     """Non-secret diagnostics for API connectivity.
@@ -1865,6 +2269,8 @@ def config_save_all(payload: Dict[str, Any]) -> Dict[str, Any]:
         for key, value in updates.items():
             os.environ[key] = value
 
+    # Settings/prompt snapshots are mtime-checked; drop them so the next request sees this save.
+    invalidate_config_cache()
     return {"ok": True}
 
 
@@ -2287,7 +2693,7 @@ def rag_long_term_upsert(payload: Dict[str, Any]) -> Dict[str, Any]:
         return {"ok": False, "error": "missing_text"}
 
     lt.upsert(doc_id=doc_id, text=text, source=source, created_at=utc_iso())
-    JsonlWriter(settings.data_dir / "events.jsonl").append(
+    EventLogWriter(settings.data_dir / "events.jsonl").append(
         {
             "ts": utc_iso(),
             "run_id": doc_id,
@@ -2307,7 +2713,7 @@ def vlm_capture() -> Dict[str, Any]:
     appcfg = _load_app_yaml(Path("config/stream-studio/app.yaml"))
     screenshot_path = Path(appcfg.get("vlm", {}).get("screenshot_path", settings.vlm_screenshot_path))
     out = ScreenshotCapturer(out_path=screenshot_path).capture()
-    JsonlWriter(settings.data_dir / "events.jsonl").append(
+    EventLogWriter(settings.data_dir / "events.jsonl").append(
         {
             "ts": utc_iso(),
             "run_id": _now_id(),
@@ -2331,7 +2737,7 @@ def vlm_summary() -> Dict[str, Any]:
         model=settings.gemini_model,
         system_prompt=_get_vlm_system_prompt(settings=settings, appcfg=appcfg),
     ).summarize_screenshot(screenshot_path=screenshot_path)
-    JsonlWriter(settings.data_dir / "events.jsonl").append(
+    EventLogWriter(settings.data_dir / "events.jsonl").append(
         {
             "ts": utc_iso(),
             "run_id": _now_id(),
@@ -2367,7 +2773,7 @@ def vlm_summary_from_path(payload: Dict[str, Any]) -> Dict[str, Any]:
         model=settings.gemini_model,
         system_prompt=_get_vlm_system_prompt(settings=settings, appcfg=appcfg),
     ).summarize_screenshot(screenshot_path=safe)
-    JsonlWriter(settings.data_dir / "events.jsonl").append(
+    EventLogWriter(settings.data_dir / "events.jsonl").append(
         {
             "ts": utc_iso(),
             "run_id": _now_id(),
@@ -2399,20 +2805,60 @@ def live2d_hotkeys() -> Dict[str, Any]:
 @app.get("/state")
 def get_state() -> Dict[str, Any]:
     settings = load_settings()
-    st = read_json(_state_path(settings.data_dir)) or {}
+    version, st = _stage_state(settings.data_dir).snapshot()
     try:
-        anim_st = read_json(_anim_state_path(settings.data_dir)) or {}
+        anim_st = _anim_state(settings.data_dir).get()
         if isinstance(anim_st, dict) and anim_st:
             st["anim_select_last"] = anim_st
     except Exception:
         pass
-    return {"ok": True, "state": st}
+    return {"ok": True, "version": version, "state": st}
+
+
+def _sse_message(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.get("/state/stream")
+async def state_stream(request: Request) -> StreamingResponse:
+    """Server-Sent Events feed of stage state changes.
+
+    Sends one `snapshot` on connect, then `patch` events (changed top-level keys)
+    as soon as the pipeline updates state. Stage/console fall back to polling
+    /overlay_text and /state when this stream is unavailable.
+    """
+    settings = load_settings()
+    store = _stage_state(settings.data_dir)
+    queue = store.subscribe()
+
+    async def _gen():
+        try:
+            version, st = store.snapshot()
+            yield _sse_message("snapshot", {"type": "snapshot", "version": version, "state": st})
+            while True:
+                if await request.is_disconnected():
+                    break
+                try:
+                    msg = await asyncio.wait_for(queue.get(), timeout=15.0)
+                except asyncio.TimeoutError:
+                    # Keep proxies/browsers from closing an idle stream.
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse_message(str(msg.get("type") or "patch"), msg)
+        finally:
+            store.unsubscribe(queue)
+
+    return StreamingResponse(
+        _gen(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.get("/overlay_text")
 def overlay_text() -> Dict[str, Any]:
     settings = load_settings()
-    st = _load_state(settings.data_dir)
+    version, st = _stage_state(settings.data_dir).snapshot()
     overlay = str(st.get("overlay_text") or "")
     speech = str(st.get("speech_text") or "")
     tts_path = str(st.get("tts_path") or "")
@@ -2442,6 +2888,7 @@ def overlay_text() -> Dict[str, Any]:
         "tts_queue_version": tts_queue_version,
         "tts_lipsync_path": tts_lipsync_path,
         "updated_at": st.get("updated_at"),
+        "version": version,
     }
 
 
@@ -2459,6 +2906,23 @@ def rag_list(type: str) -> Dict[str, Any]:
         return {"ok": False, "error": f"{type(e).__name__}: {e}"[:200]}
 
 
+@app.get("/rag/search")
+def rag_search(q: str, type: str = "long", limit: int = 8) -> Dict[str, Any]:
+    rt = (type or "").strip().lower()
+    if rt not in ("short", "long"):
+        return {"ok": False, "error": "invalid_type"}
+    settings = load_settings()
+    store = RagItemsStore(db_path=_rag_items_db_path(settings))
+    try:
+        hits = get_vector_index(store.db_path).search(q, rag_type=rt, k=max(1, min(50, int(limit))))
+        items = store.get_by_ids([i for i, _ in hits])
+        out = [dict(items[i], score=round(score, 4)) for i, score in hits if i in items]
+        return {"ok": True, "items": out}
+    except Exception as e:
+        # `type` is shadowed by the query parameter here.
+        return {"ok": False, "error": f"{e.__class__.__name__}: {e}"[:200]}
+
+
 @app.post("/rag/add")
 def rag_add(payload: Dict[str, Any]) -> Dict[str, Any]:
     if not isinstance(payload, dict):
@@ -2491,6 +2955,19 @@ def rag_delete(payload: Dict[str, Any]) -> Dict[str, Any]:
         return {"ok": False, "error": f"{type(e).__name__}: {e}"[:200]}
 
 
+@app.get("/chat/export")
+def chat_export(since_id: int = 0, limit: int = 100000) -> StreamingResponse:
+    """Full chat log as NDJSON (oldest first), derived from the conversation store."""
+    settings = load_settings()
+    rows = get_conversation_store(conversation_db_path(settings.data_dir)).iter_export(since_id=since_id, limit=limit)
+
+    def _gen():
+        for obj in rows:
+            yield json.dumps(obj, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(_gen(), media_type="application/x-ndjson", headers={"Cache-Control": "no-store"})
+
+
 @app.get("/turns/list")
 def turns_list(limit: int = 200) -> Dict[str, Any]:
     settings = load_settings()
@@ -2531,20 +3008,7 @@ def turns_clear() -> Dict[str, Any]:
 
 def _split_sentences(text: str) -> tuple[list[str], str]:
     """Return (completed_sentences, remainder)."""
-    if not text:
-        return [], ""
-    buf = text
-    out: list[str] = []
-    seps = set(["。", "、", "?", "？", "!", "！", "\n"])
-    start = 0
-    for i, ch in enumerate(buf):
-        if ch in seps:
-            s = buf[start : i + 1].strip()
-            start = i + 1
-            if s:
-                out.append(s)
-    rem = buf[start:]
-    return out, rem
+    return split_sentences(text)
 
 
 def _sanitize_speech_text_for_tts(*, text: str) -> str:
@@ -2571,13 +3035,7 @@ def _sanitize_speech_text_for_tts(*, text: str) -> str:
 
     # Strip common acknowledgements that models sometimes prepend.
     # (Do NOT over-strip; only remove if it appears at the very beginning.)
-    ack_prefixes = (
-        "了解です。",
-        "了解しました。",
-        "承知しました。",
-        "かしこまりました。",
-        "はい。",
-    )
+    ack_prefixes = ACK_PREFIXES
     changed = True
     while changed:
         changed = False
@@ -2608,49 +3066,6 @@ def _build_stream_prompt(*, user_text: str, rag_context: str, vlm_summary: str,
     return sys, prompt
 
 
-def _stream_llm_text(
-    *,
-    llm_provider: str,
-    settings: Settings,
-    system_prompt: str,
-    prompt: str,
-    max_tokens: int,
-) -> str:
-    """Best-effort streaming: returns full text, but yields early through state updates in the caller."""
-    prov = (llm_provider or "").strip().lower() or "gemini"
-    # Gemini fallback (non-stream or SDK-dependent stream)
-    if not (settings.gemini_api_key or "").strip():
-        return "Gemini API key is missing; fallback response."
-
-    timeout_seconds = 20
-    try:
-        import concurrent.futures
-
-        from google import genai
-
-        client = genai.Client(api_key=settings.gemini_api_key)
-
-        def _call() -> Any:
-            kwargs: Dict[str, Any] = {
-                "model": settings.gemini_model,
-                "contents": [
-                    {"role": "user", "parts": [{"text": system_prompt + "\n\n" + prompt}]},
-                ],
-            }
-            return client.models.generate_content(**kwargs)
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ex:
-            fut = ex.submit(_call)
-            resp = fut.result(timeout=timeout_seconds)
-
-        out = (getattr(resp, "text", "") or "").strip()
-        return out or "(empty response)"
-    except concurrent.futures.TimeoutError:
-        return "Gemini timeout: request exceeded time limit."
-    except Exception:
-        return "Gemini request failed."
-
-
 @app.get("/state/live2d")
 def state_live2d() -> Dict[str, Any]:
     settings = load_settings()
@@ -2671,14 +3086,18 @@ def state_live2d() -> Dict[str, Any]:
 def post_motion(req: MotionIn) -> Dict[str, Any]:
     settings = load_settings()
     data_dir = settings.data_dir
-    st = _load_state(data_dir)
     tag = (req.tag or "").strip()
     if not tag:
         return {"ok": False, "error": "missing_tag"}
-    st = _bump_live2d_seq(st, tags=[tag], last_tag=tag)
-    st["updated_at"] = utc_iso()
-    _save_state(data_dir, st)
-    JsonlWriter(data_dir / "events.jsonl").append(
+
+    def _bump(st: Dict[str, Any]) -> None:
+        _bump_live2d_seq(st, tags=[tag], last_tag=tag)
+        st["updated_at"] = utc_iso()
+
+    store = _stage_state(data_dir)
+    store.mutate(_bump)
+    st = store.get()
+    EventLogWriter(data_dir / "events.jsonl").append(
         {
             "ts": utc_iso(),
             "run_id": _now_id(),
@@ -2706,7 +3125,7 @@ async def vlm_frame(
     settings = load_settings()
     data_dir = settings.data_dir
     events_path = data_dir / "events.jsonl"
-    writer = JsonlWriter(events_path)
+    writer = EventLogWriter(events_path)
 
     img_bytes: bytes = b""
     mime: Optional[str] = None
@@ -2726,11 +3145,11 @@ async def vlm_frame(
         return {"ok": False, "error": "missing_image"}
 
     appcfg = _load_app_yaml(Path("config/stream-studio/app.yaml"))
-    summ = VLMSummarizer(
+    summ = await VLMSummarizer(
         api_key=settings.gemini_api_key,
         model=settings.gemini_model,
         system_prompt=_get_vlm_system_prompt(settings=settings, appcfg=appcfg),
-    ).summarize_image_bytes(
+    ).asummarize_image_bytes(
         image_bytes=img_bytes,
         mime_type=mime,
     )
@@ -2759,7 +3178,7 @@ def _handle_event(event: EventIn) -> Dict[str, Any]:
 
     data_dir = settings.data_dir
     events_path = data_dir / "events.jsonl"
-    writer = JsonlWriter(events_path)
+    writer = EventLogWriter(events_path)
 
     screenshot_path = Path(appcfg.get("vlm", {}).get("screenshot_path", settings.vlm_screenshot_path))
     event.include_vlm = bool(event.include_vlm and settings.vlm_enabled)
@@ -2785,7 +3204,6 @@ def _handle_event(event: EventIn) -> Dict[str, Any]:
     llm_provider = (event.llm_provider or settings.llm_provider or "gemini").strip().lower()
     try:
         st = ShortTermMemory(events_path=events_path)
-        st.append(role="user", text=event.text)
         lt = _get_long_term_store(settings=settings, appcfg=appcfg)
         llm, vlm = _make_llm_and_vlm(settings=settings, lt=lt, llm_provider=llm_provider)
 
@@ -2797,6 +3215,7 @@ def _handle_event(event: EventIn) -> Dict[str, Any]:
             ng_words=settings.ng_words_list,
             rag_enabled=settings.rag_enabled,
             short_term_max_events=settings.short_term_max_events,
+            assembler=_context_assembler(appcfg),
         )
         llm_start = time.perf_counter()
         candidate = orchestrator.run(event=event, include_vlm=event.include_vlm, screenshot_path=screenshot_path)
@@ -2817,6 +3236,7 @@ def _handle_event(event: EventIn) -> Dict[str, Any]:
             pass
     except Exception as e:
         tb = traceback.format_exc()
+        get_metrics().inc("errors_total", source="server", phase="handle_event")
         writer.append(
             {
                 "ts": utc_iso(),
@@ -2863,6 +3283,7 @@ def _handle_event(event: EventIn) -> Dict[str, Any]:
             text=(candidate.speech_text or candidate.overlay_text or "").strip(),
             source="llm",
             meta={"status": "pending", "provider": llm_provider},
+            in_context=False,
         )
     except Exception:
         pass
@@ -2891,7 +3312,7 @@ def _apply_output(
 
     data_dir = settings.data_dir
     events_path = data_dir / "events.jsonl"
-    writer = JsonlWriter(events_path)
+    writer = EventLogWriter(events_path)
 
     # OBS overlay
     overlay_path = Path(appcfg.get("paths", {}).get("obs_overlay_path", settings.obs_overlay_path))
@@ -2912,11 +3333,12 @@ def _apply_output(
     audio_dir.mkdir(parents=True, exist_ok=True)
     audio_path = audio_dir / f"{run_id}.wav"
     # NOTE: legacy single-file TTS path (kept for non-web flows).
-    provider = (tts_provider or settings.tts_provider or "stub").strip().lower()
-    tts = TTSService(provider=provider, voice=settings.tts_voice)
+    provider = _resolve_tts_provider(settings, tts_provider)
+    tts = _tts_service(settings=settings, appcfg=appcfg, provider=provider)
     tts_start = time.perf_counter()
     safe_speech = _sanitize_speech_text_for_tts(text=final.speech_text)
-    audio_path, tts_used, tts_error = tts.synthesize_with_meta(text=safe_speech, out_path=audio_path)
+    tts_res = tts.synthesize_audio(text=safe_speech, out_path=audio_path)
+    audio_path, tts_used, tts_error = tts_res.path, tts_res.provider, tts_res.error
     tts_end = time.perf_counter()
     _log_phase_timing(
         writer,
@@ -2938,14 +3360,17 @@ def _apply_output(
 
     # Lip sync curve for legacy single-file stage path
     tts_lipsync_path = ""
+    run_audio = (tts_res.samples, tts_res.sample_rate) if tts_res.samples is not None else None
     try:
         if tts_latest.exists():
-            out_json = tts_latest.with_suffix(".lipsync.json")
+            # Provisional envelope-only curve; the aligned one is scheduled once state is published.
             p = _generate_lipsync_json_best_effort(
                 data_dir=data_dir,
                 wav_path=tts_latest,
                 text=final.speech_text,
-                out_json_path=out_json,
+                out_json_path=tts_latest.with_suffix(".lipsync.json"),
+                audio=run_audio,
+                use_aligner=False,
             )
             if p:
                 tts_lipsync_path = p
@@ -2991,8 +3416,11 @@ def _apply_output(
     }
     state = _bump_live2d_seq(state, tags=list(final.motion_tags or []), last_tag=None)
     state_start = time.perf_counter()
-    write_json(_state_path(data_dir), state)
+    _save_state(data_dir, state)
     state_end = time.perf_counter()
+    _schedule_legacy_lipsync_upgrade(
+        data_dir=data_dir, wav_path=audio_path, text=final.speech_text, audio=run_audio, state=state
+    )
     _log_phase_timing(
         writer,
         run_id=req_id,
@@ -3003,7 +3431,7 @@ def _apply_output(
     )
 
     if _should_store_short_term(notes):
-        ShortTermMemory(events_path=events_path).append(role="assistant", text=final.speech_text)
+        _append_chat_log(data_dir=data_dir, run_id=req_id, role="assistant", text=final.speech_text, source="web")
 
     writer.append(
         {
@@ -3046,7 +3474,7 @@ def web_submit(req: WebSubmitIn) -> Dict[str, Any]:
 
     data_dir = settings.data_dir
     events_path = data_dir / "events.jsonl"
-    writer = JsonlWriter(events_path)
+    writer = EventLogWriter(events_path)
 
     screenshot_path = Path(appcfg.get("vlm", {}).get("screenshot_path", settings.vlm_screenshot_path))
     event.include_vlm = bool(event.include_vlm and settings.vlm_enabled)
@@ -3071,8 +3499,6 @@ def web_submit(req: WebSubmitIn) -> Dict[str, Any]:
     recv_start = time.perf_counter()
 
     try:
-        st = ShortTermMemory(events_path=events_path)
-        st.append(role="user", text=event.text)
         lt = _get_long_term_store(settings=settings, appcfg=appcfg)
         # Locked provider
         llm_provider = "gemini"
@@ -3081,36 +3507,13 @@ def web_submit(req: WebSubmitIn) -> Dict[str, Any]:
         llm, _vlm = _make_llm_and_vlm(settings=settings, lt=lt, llm_provider=llm_provider)
 
         # Build RAG context from DB-managed rag_items and short-term turns (separate).
-        rag_context = "no_rag"
-        try:
-            if settings.rag_enabled:
-                rag_store = RagItemsStore(db_path=_rag_items_db_path(settings))
-                short_text = rag_store.get_concat_text(rag_type="short", limit=50)
-                long_text = rag_store.get_concat_text(rag_type="long", limit=200)
-                chunks: list[str] = []
-                if short_text:
-                    chunks.append("[shortRAG]\n" + short_text)
-                if long_text:
-                    chunks.append("[longRAG]\n" + long_text)
-                rag_context = "\n\n".join(chunks).strip() or "no_rag"
-        except Exception:
-            rag_context = "no_rag"
-
-        turns_context = ""
-        try:
-            if settings.short_term_enabled and settings.short_term_turns_to_prompt > 0:
-                turns_store = TurnsStore(db_path=_turns_db_path(settings))
-                turns_context = turns_store.get_prompt_context(turns_to_prompt=settings.short_term_turns_to_prompt)
-        except Exception:
-            turns_context = ""
-
-        if turns_context:
-            rag_context = ("[short_term_turns]\n" + turns_context + "\n\n" + rag_context).strip()
+        with span("context.assemble"):
+            rag_context = _build_web_rag_context(settings=settings, appcfg=appcfg, query=event.text)
 
         def _run_stream() -> None:
-            writer2 = JsonlWriter(events_path)
+            writer2 = EventLogWriter(events_path)
             data_dir2 = settings.data_dir
-            st_path = _state_path(data_dir2)
+            store = _stage_state(data_dir2)
 
             # Full chat log (user)
             _append_chat_log(data_dir=data_dir2, run_id=request_id, role="user", text=event.text, source="web")
@@ -3129,50 +3532,24 @@ def web_submit(req: WebSubmitIn) -> Dict[str, Any]:
                 "tts_version": 0,
                 "vlm_summary": (event.vlm_summary or "").strip(),
             }
-            write_json(st_path, state)
+            store.replace(state)
 
             llm_start = time.perf_counter()
             full_text = ""
             try:
-                out = llm.generate_full(
-                    user_text=event.text,
-                    rag_context=rag_context,
-                    vlm_summary=(event.vlm_summary or ""),
-                )
-
-                full_text = _sanitize_speech_text_for_tts(text=(out.speech_text or ""))
-                overlay_text = (out.overlay_text or full_text[-120:]).strip()
-
-                st_now = read_json(st_path) or {}
-                st_now["speech_text"] = full_text
-                st_now["overlay_text"] = overlay_text
-                # Reset per-run queue so the UI represents the current utterance's segments.
-                st_now["tts_queue"] = []
-                st_now["tts_queue_version"] = int(time.time() * 1000)
-                st_now["tts_path"] = ""
-                st_now["tts_version"] = 0
-                st_now["updated_at"] = utc_iso()
-                write_json(st_path, st_now)
-
-                # Full chat log (assistant)
-                _append_chat_log(
-                    data_dir=data_dir2,
-                    run_id=request_id,
-                    role="assistant",
-                    text=full_text,
-                    source="llm",
-                    meta={"provider": llm_provider},
-                )
-
                 # Sentence-level TTS (web flow)
                 audio_root = settings.data_dir / "audio" / "segments" / request_id
                 audio_root.mkdir(parents=True, exist_ok=True)
                 tts_provider_used = "google"
-                tts = TTSService(provider=tts_provider_used, voice=settings.tts_voice)
+                tts = _tts_service(settings=settings, appcfg=appcfg, provider=tts_provider_used)
 
                 # Prefer click-free single-shot SSML synthesis when configured.
                 tts_mode = str((appcfg.get("tts", {}) or {}).get("mode") or "segments").strip().lower()
                 ssml_break_ms = int((appcfg.get("tts", {}) or {}).get("ssml_break_ms") or 50)
+                # Segment mode streams the reply: each sentence goes to TTS while the LLM is still generating.
+                llm_stream = bool((appcfg.get("llm", {}) or {}).get("stream", True))
+                tts_concurrency = int((appcfg.get("tts", {}) or {}).get("concurrency") or 3)
+                configure_provider_limits((appcfg.get("tts", {}) or {}).get("provider_concurrency"))
 
                 def _xml_escape(s: str) -> str:
                     return (
@@ -3201,14 +3578,232 @@ def web_submit(req: WebSubmitIn) -> Dict[str, Any]:
                     inner = f" {br} ".join(parts)
                     return f"<speak>{inner}</speak>"
 
-                if tts_mode == "ssml_full" and (full_text or "").strip():
+                def _synth_segment(idx: int, s: str) -> Optional[Dict[str, Any]]:
+                    """Synthesize one sentence (+ lip-sync); runs on the TTS pool."""
+                    out_wav = audio_root / f"{idx:03d}.wav"
+                    t0 = time.perf_counter()
+                    err = None
+                    audio = None
+                    try:
+                        with provider_slot(tts_provider_used):
+                            res = tts.synthesize_audio(text=s, out_path=out_wav)
+                        provider_used, err = res.provider, res.error
+                        if res.samples is not None:
+                            audio = (res.samples, res.sample_rate)
+                    except Exception as e:
+                        provider_used = tts_provider_used
+                        err = f"{type(e).__name__}: {e}"[:200]
+                    t1 = time.perf_counter()
+                    _log_phase_timing(
+                        writer2,
+                        run_id=request_id,
+                        source="tts",
+                        phase="tts_segment",
+                        start=t0,
+                        end=t1,
+                        payload={"idx": idx, "provider": provider_used, "error": err},
+                    )
+                    if err:
+                        return None
+
+                    # Provisional envelope-only curve; the aligned one follows from the lip-sync pool.
+                    lipsync_path = ""
+                    out_json = out_wav.with_suffix(".lipsync.json")
+                    try:
+                        p = _generate_lipsync_json_best_effort(
+                            data_dir=settings.data_dir,
+                            wav_path=out_wav,
+                            text=s,
+                            out_json_path=out_json,
+                            audio=audio,
+                            use_aligner=False,
+                        )
+                        if p:
+                            lipsync_path = p
+                    except Exception:
+                        lipsync_path = ""
+
+                    item: Dict[str, Any] = {"idx": idx, "path": f"/audio/segments/{request_id}/{idx:03d}.wav", "text": s}
+                    if lipsync_path:
+                        item["lipsync_path"] = lipsync_path
+                    upgrade = {"wav_path": out_wav, "text": s, "out_json_path": out_json, "audio": audio}
+                    return {"item": item, "provider": provider_used, "error": err, "lipsync_upgrade": upgrade}
+
+                def _publish_segment(res: Dict[str, Any]) -> None:
+                    item = res["item"]
+                    qv = int(time.time() * 1000)
+
+                    def _append_segment(st_now: Dict[str, Any]) -> None:
+                        q = st_now.get("tts_queue") if isinstance(st_now.get("tts_queue"), list) else []
+                        q.append(item)
+                        st_now["tts_queue"] = q
+                        st_now["tts_queue_version"] = qv
+                        st_now["tts_path"] = item["path"]
+                        st_now["tts_version"] = qv
+                        st_now["tts"] = {"provider": res["provider"], "error": res["error"]}
+                        st_now["updated_at"] = utc_iso()
+
+                    with span("state.publish_segment", idx=item["idx"]):
+                        store.mutate(_append_segment)
+
+                    def _upgrade_segment(st_now: Dict[str, Any], path: str) -> None:
+                        for it in st_now.get("tts_queue") or []:
+                            if isinstance(it, dict) and it.get("path") == item["path"]:
+                                it["lipsync_path"] = path
+                                st_now["updated_at"] = utc_iso()
+
+                    try:
+                        _schedule_lipsync_upgrade(
+                            data_dir=settings.data_dir, apply=_upgrade_segment, **res["lipsync_upgrade"]
+                        )
+                    except Exception:
+                        pass
+
+                # Segments are synthesized concurrently and published to tts_queue in index order.
+                segments = OrderedSegmentPipeline(
+                    work=_synth_segment,
+                    publish=_publish_segment,
+                    max_in_flight=tts_concurrency,
+                )
+
+                def _speak_segment(s: str) -> bool:
+                    """Queue one sentence for synthesis; False if NG-blocked."""
+                    # NG word filter
+                    if any(w and w in s for w in settings.ng_words_list):
+                        # Let earlier segments land first, as with sequential synthesis.
+                        segments.close()
+                        store.update(
+                            {
+                                "speech_text": "content blocked",
+                                "overlay_text": "content blocked",
+                                "updated_at": utc_iso(),
+                            }
+                        )
+                        return False
+                    segments.submit(s)
+                    return True
+
+                def _speak_streaming() -> Optional[Dict[str, Any]]:
+                    """Stream the reply into TTS sentence by sentence.
+
+                    Returns the parsed reply fields, or None when the stream produced
+                    nothing (the caller then falls back to `generate_full`).
+                    """
+                    parser = StreamingReplyParser()
+                    lead = LeadingSpeechFilter(system_prompt=(llm.system_prompt or read_prompt_text(name="llm_system")))
+                    segmenter = SentenceSegmenter()
+                    spoken = ""
+                    first = True
+
+                    def _emit(sents: List[str]) -> bool:
+                        nonlocal spoken, first
+                        for s in sents:
+                            spoken = (spoken + s) if spoken else s
+                            store.update({"speech_text": spoken, "updated_at": utc_iso()})
+                            if first:
+                                first = False
+                                _log_phase_timing(
+                                    writer2,
+                                    run_id=request_id,
+                                    source="llm",
+                                    phase="llm_first_sentence",
+                                    start=llm_start,
+                                    end=time.perf_counter(),
+                                    payload={"provider": llm_provider},
+                                )
+                            if not _speak_segment(s):
+                                return False
+                        return True
+
+                    stream_err = None
+                    try:
+                        with span("llm.generate_stream", provider=llm_provider):
+                            for chunk in llm.generate_stream(
+                                user_text=event.text,
+                                rag_context=rag_context,
+                                vlm_summary=(event.vlm_summary or ""),
+                            ):
+                                if not _emit(segmenter.feed(lead.feed(parser.feed(chunk)))):
+                                    return {"blocked": True}
+                    except Exception as e:
+                        stream_err = f"{type(e).__name__}: {e}"[:200]
+                        if not parser.text.strip():
+                            return None
+
+                    tail, fields = parser.finish()
+                    if not _emit(segmenter.feed(lead.feed(tail) + lead.flush()) + segmenter.flush()):
+                        return {"blocked": True}
+                    out_fields = dict(fields)
+                    out_fields["speech_text"] = spoken
+                    if stream_err:
+                        out_fields["stream_error"] = stream_err
+                    return out_fields
+
+                streamed: Optional[Dict[str, Any]] = None
+                if llm_stream and tts_mode != "ssml_full" and callable(getattr(llm, "generate_stream", None)):
+                    streamed = _speak_streaming()
+                    if streamed is not None and streamed.get("blocked"):
+                        return
+
+                if streamed is not None:
+                    full_text, overlay_text = clamp_reply_text(
+                        str(streamed.get("speech_text") or ""), str(streamed.get("overlay_text") or "")
+                    )
+                    store.update({"speech_text": full_text, "overlay_text": overlay_text, "updated_at": utc_iso()})
+                    _append_chat_log(
+                        data_dir=data_dir2,
+                        run_id=request_id,
+                        role="assistant",
+                        text=full_text,
+                        source="llm",
+                        meta={"provider": llm_provider, "stream": True},
+                    )
+                else:
+                    with span("llm.generate_full", provider=llm_provider):
+                        out = llm.generate_full(
+                            user_text=event.text,
+                            rag_context=rag_context,
+                            vlm_summary=(event.vlm_summary or ""),
+                        )
+
+                    full_text = _sanitize_speech_text_for_tts(text=(out.speech_text or ""))
+                    overlay_text = (out.overlay_text or full_text[-120:]).strip()
+
+                    store.update(
+                        {
+                            "speech_text": full_text,
+                            "overlay_text": overlay_text,
+                            # Reset per-run queue so the UI represents the current utterance's segments.
+                            "tts_queue": [],
+                            "tts_queue_version": int(time.time() * 1000),
+                            "tts_path": "",
+                            "tts_version": 0,
+                            "updated_at": utc_iso(),
+                        }
+                    )
+
+                    # Full chat log (assistant)
+                    _append_chat_log(
+                        data_dir=data_dir2,
+                        run_id=request_id,
+                        role="assistant",
+                        text=full_text,
+                        source="llm",
+                        meta={"provider": llm_provider},
+                    )
+
+                if streamed is None and tts_mode == "ssml_full" and (full_text or "").strip():
                     out_wav = audio_root / "full.wav"
                     t0 = time.perf_counter()
                     err = None
                     provider_used = tts_provider_used
+                    full_audio = None
                     try:
                         ssml = _build_ssml(full_text)
-                        _p, provider_used, err = tts.synthesize_with_meta(text=ssml, out_path=out_wav, ssml=True)
+                        res = tts.synthesize_audio(text=ssml, out_path=out_wav, ssml=True)
+                        provider_used, err = res.provider, res.error
+                        if res.samples is not None:
+                            full_audio = (res.samples, res.sample_rate)
                     except Exception as e:
                         err = f"{type(e).__name__}: {e}"[:200]
                     t1 = time.perf_counter()
@@ -3224,13 +3819,15 @@ def web_submit(req: WebSubmitIn) -> Dict[str, Any]:
 
                     if not err:
                         lipsync_path = ""
+                        out_json = out_wav.with_suffix(".lipsync.json")
                         try:
-                            out_json = out_wav.with_suffix(".lipsync.json")
                             p = _generate_lipsync_json_best_effort(
                                 data_dir=settings.data_dir,
                                 wav_path=out_wav,
                                 text=full_text,
                                 out_json_path=out_json,
+                                audio=full_audio,
+                                use_aligner=False,
                             )
                             if p:
                                 lipsync_path = p
@@ -3238,97 +3835,62 @@ def web_submit(req: WebSubmitIn) -> Dict[str, Any]:
                             lipsync_path = ""
 
                         qv = int(time.time() * 1000)
-                        st_now = read_json(st_path) or {}
-                        st_now["tts_queue"] = []
-                        st_now["tts_queue_version"] = qv
-                        st_now["tts_path"] = f"/audio/segments/{request_id}/full.wav"
-                        st_now["tts_version"] = qv
+                        patch: Dict[str, Any] = {
+                            "tts_queue": [],
+                            "tts_queue_version": qv,
+                            "tts_path": f"/audio/segments/{request_id}/full.wav",
+                            "tts_version": qv,
+                            "tts": {"provider": provider_used, "error": err, "mode": "ssml_full"},
+                            "updated_at": utc_iso(),
+                        }
                         if lipsync_path:
-                            st_now["tts_lipsync_path"] = lipsync_path
-                        st_now["tts"] = {"provider": provider_used, "error": err, "mode": "ssml_full"}
-                        st_now["updated_at"] = utc_iso()
-                        write_json(st_path, st_now)
-                        return
+                            patch["tts_lipsync_path"] = lipsync_path
+                        store.update(patch)
 
-                seg_idx = 0
-                rem2 = full_text
-                while rem2.strip():
-                    sents, rem2 = _split_sentences(rem2)
-                    if not sents:
-                        sents = [rem2.strip()]
-                        rem2 = ""
-                    for s in sents:
-                        # NG word filter
-                        if any(w and w in s for w in settings.ng_words_list):
-                            st_now = read_json(st_path) or {}
-                            st_now["speech_text"] = "content blocked"
-                            st_now["overlay_text"] = "content blocked"
-                            st_now["updated_at"] = utc_iso()
-                            write_json(st_path, st_now)
-                            return
-
-                        seg_idx += 1
-                        out_wav = audio_root / f"{seg_idx:03d}.wav"
-                        t0 = time.perf_counter()
-                        err = None
-                        try:
-                            _p, provider_used, err = tts.synthesize_with_meta(text=s, out_path=out_wav)
-                        except Exception as e:
-                            provider_used = tts_provider_used
-                            err = f"{type(e).__name__}: {e}"[:200]
-                        t1 = time.perf_counter()
-                        _log_phase_timing(
-                            writer2,
-                            run_id=request_id,
-                            source="tts",
-                            phase="tts_segment",
-                            start=t0,
-                            end=t1,
-                            payload={"idx": seg_idx, "provider": provider_used, "error": err},
-                        )
-                        if err:
-                            continue
+                        def _upgrade_full(st_now: Dict[str, Any], path: str) -> None:
+                            if st_now.get("tts_path") == patch["tts_path"] and st_now.get("tts_version") == qv:
+                                st_now["tts_lipsync_path"] = path
+                                st_now["updated_at"] = utc_iso()
 
-                        lipsync_path = ""
                         try:
-                            out_json = out_wav.with_suffix(".lipsync.json")
-                            p = _generate_lipsync_json_best_effort(
+                            _schedule_lipsync_upgrade(
                                 data_dir=settings.data_dir,
                                 wav_path=out_wav,
-                                text=s,
+                                text=full_text,
                                 out_json_path=out_json,
+                                audio=full_audio,
+                                apply=_upgrade_full,
                             )
-                            if p:
-                                lipsync_path = p
                         except Exception:
-                            lipsync_path = ""
+                            pass
+                        return
 
-                        qv = int(time.time() * 1000)
-                        st_now = read_json(st_path) or {}
-                        q = st_now.get("tts_queue") if isinstance(st_now.get("tts_queue"), list) else []
-                        item = {"idx": seg_idx, "path": f"/audio/segments/{request_id}/{seg_idx:03d}.wav", "text": s}
-                        if lipsync_path:
-                            item["lipsync_path"] = lipsync_path
-                        q.append(item)
-                        st_now["tts_queue"] = q
-                        st_now["tts_queue_version"] = qv
-                        st_now["tts_path"] = f"/audio/segments/{request_id}/{seg_idx:03d}.wav"
-                        st_now["tts_version"] = qv
-                        st_now["tts"] = {"provider": provider_used, "error": err}
-                        st_now["updated_at"] = utc_iso()
-                        write_json(st_path, st_now)
+                if streamed is None:
+                    rem2 = full_text
+                    while rem2.strip():
+                        sents, rem2 = _split_sentences(rem2)
+                        if not sents:
+                            sents = [rem2.strip()]
+                            rem2 = ""
+                        for s in sents:
+                            if not _speak_segment(s):
+                                return
+                segments.close()
 
                 # If generation yielded nothing, make it explicit so the UI has something to render.
                 if not (full_text or "").strip():
-                    st_now = read_json(st_path) or {}
-                    st_now["speech_text"] = "(no output)"
-                    st_now["overlay_text"] = "(no output)"
-                    st_now["tts"] = {"provider": "google", "error": "empty_llm_output"}
-                    st_now["updated_at"] = utc_iso()
-                    write_json(st_path, st_now)
+                    store.update(
+                        {
+                            "speech_text": "(no output)",
+                            "overlay_text": "(no output)",
+                            "tts": {"provider": "google", "error": "empty_llm_output"},
+                            "updated_at": utc_iso(),
+                        }
+                    )
 
             except Exception as e:
                 tb = traceback.format_exc()
+                get_metrics().inc("errors_total", source="server", phase="web_submit_worker")
                 try:
                     writer2.append(
                         {
@@ -3345,12 +3907,14 @@ def web_submit(req: WebSubmitIn) -> Dict[str, Any]:
                     pass
 
                 try:
-                    st_now = read_json(st_path) or {}
-                    st_now["speech_text"] = "(error)"
-                    st_now["overlay_text"] = "(error)"
-                    st_now["tts"] = {"provider": "google", "error": f"{type(e).__name__}: {e}"[:200]}
-                    st_now["updated_at"] = utc_iso()
-                    write_json(st_path, st_now)
+                    store.update(
+                        {
+                            "speech_text": "(error)",
+                            "overlay_text": "(error)",
+                            "tts": {"provider": "google", "error": f"{type(e).__name__}: {e}"[:200]},
+                            "updated_at": utc_iso(),
+                        }
+                    )
                 except Exception:
                     pass
 
@@ -3366,19 +3930,12 @@ def web_submit(req: WebSubmitIn) -> Dict[str, Any]:
                     payload={"provider": llm_provider},
                 )
 
-                # Always store conversation log for Console's "Short-Term Turns" table.
-                try:
-                    turns_store = TurnsStore(db_path=_turns_db_path(settings))
-                    turns_store.add_turn(
-                        user_text=event.text,
-                        assistant_text=(full_text or "").strip() or "(empty)",
-                        created_at=utc_iso(),
-                        max_keep=settings.short_term_max_events,
-                    )
-                except Exception:
-                    pass
+        def _run_stream_traced() -> None:
+            # Spans from the worker thread are attributed to this request.
+            with trace_context(request_id), span("web_submit.worker"):
+                _run_stream()
 
-        threading.Thread(target=_run_stream, daemon=True).start()
+        threading.Thread(target=_run_stream_traced, name=f"web-submit-{request_id}", daemon=True).start()
 
         recv_end = time.perf_counter()
         _log_phase_timing(
@@ -3392,6 +3949,7 @@ def web_submit(req: WebSubmitIn) -> Dict[str, Any]:
         )
     except Exception as e:
         tb = traceback.format_exc()
+        get_metrics().inc("errors_total", source="server", phase="web_submit")
         writer.append(
             {
                 "ts": utc_iso(),
@@ -3415,6 +3973,40 @@ def post_event(event: EventIn) -> Dict[str, Any]:
     return _handle_event(event)
 
 
+@app.get("/events/query")
+def events_query(
+    run_id: Optional[str] = None,
+    source: Optional[str] = None,
+    type: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = 1000,
+    order: str = "asc",
+) -> StreamingResponse:
+    """Stream matching events as NDJSON using the event store index.
+
+    Filters: run_id (also matches payload.request_id), source, type and an
+    ISO8601 ts range. order=desc returns newest first.
+    """
+    settings = load_settings()
+    store = get_event_store(event_store_root(settings.data_dir / "events.jsonl"))
+    rows = store.query(
+        run_id=run_id,
+        source=source,
+        type=type,
+        since=since,
+        until=until,
+        limit=limit,
+        newest_first=(order or "").strip().lower() == "desc",
+    )
+
+    def _gen():
+        for obj in rows:
+            yield json.dumps(obj, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(_gen(), media_type="application/x-ndjson", headers={"Cache-Control": "no-store"})
+
+
 @app.post("/stt/text")
 def stt_text(req: STTIn) -> Dict[str, Any]:
     event = EventIn(source="stt", text=req.text, include_vlm=False)
@@ -3438,7 +4030,7 @@ async def stt_audio(
     console_cfg = _load_console_settings(settings)
     data_dir = settings.data_dir
     events_path = data_dir / "events.jsonl"
-    writer = JsonlWriter(events_path)
+    writer = EventLogWriter(events_path)
     run_id = _now_id()
 
     stt_on = _parse_bool_flag(stt_enabled, default=True)
@@ -3816,10 +4408,21 @@ def stt_warmup(payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
 
 
 @app.get("/manager/pending")
-def manager_pending() -> Dict[str, Any]:
+def manager_pending(status: str = "pending", limit: int = 200, offset: int = 0, order: str = "asc") -> Dict[str, Any]:
+    # Default is the actionable queue; status=all includes decided items.
     settings = load_settings()
-    p = _load_pending(settings.data_dir)
-    return {"ok": True, "items": p.get("items", [])}
+    st = (status or "").strip().lower() or "pending"
+    if st == "all":
+        st = None
+    if st is not None and st not in ("pending", "approved", "rejected"):
+        return {"ok": False, "error": "invalid_status"}
+    items, total = _pending_store(settings.data_dir).list(
+        status=st,
+        limit=limit,
+        offset=offset,
+        newest_first=(order or "").strip().lower() == "desc",
+    )
+    return {"ok": True, "items": items, "total": total, "limit": limit, "offset": offset}
 
 
 @app.post("/manager/reject")
@@ -3831,7 +4434,7 @@ def manager_reject(req: RejectIn) -> Dict[str, Any]:
     if updated is None:
         return {"ok": False, "error": "pending_not_found"}
 
-    JsonlWriter(data_dir / "events.jsonl").append(
+    EventLogWriter(data_dir / "events.jsonl").append(
         {
             "ts": utc_iso(),
             "run_id": req.pending_id,
@@ -3853,21 +4456,10 @@ def manager_approve(req: ApproveIn) -> Dict[str, Any]:
 
     data_dir = settings.data_dir
     events_path = data_dir / "events.jsonl"
-    writer = JsonlWriter(events_path)
+    writer = EventLogWriter(events_path)
 
     # Load item
-    p = _load_pending(data_dir)
-    items = []
-    target: Optional[PendingItem] = None
-    for raw in p.get("items", []):
-        try:
-            it = PendingItem.model_validate(raw)
-        except Exception:
-            continue
-        items.append(it)
-        if it.pending_id == req.pending_id:
-            target = it
-
+    target = _pending_store(data_dir).get(req.pending_id)
     if target is None:
         return {"ok": False, "error": "pending_not_found"}
 
@@ -3881,10 +4473,11 @@ def manager_approve(req: ApproveIn) -> Dict[str, Any]:
     # TTS
     audio_dir = Path(appcfg.get("tts", {}).get("audio_dir", data_dir / "audio"))
     audio_path = audio_dir / f"{req.pending_id}.wav"
-    provider = (target.event.tts_provider or settings.tts_provider or "stub").strip().lower()
-    tts = TTSService(provider=provider, voice=settings.tts_voice)
+    provider = _resolve_tts_provider(settings, target.event.tts_provider)
+    tts = _tts_service(settings=settings, appcfg=appcfg, provider=provider)
     tts_start = time.perf_counter()
-    audio_path, tts_used, tts_error = tts.synthesize_with_meta(text=final.speech_text, out_path=audio_path)
+    tts_res = tts.synthesize_audio(text=final.speech_text, out_path=audio_path)
+    audio_path, tts_used, tts_error = tts_res.path, tts_res.provider, tts_res.error
     tts_end = time.perf_counter()
     _log_phase_timing(
         writer,
@@ -3906,14 +4499,17 @@ def manager_approve(req: ApproveIn) -> Dict[str, Any]:
 
     # Lip sync curve for legacy single-file stage path
     tts_lipsync_path = ""
+    run_audio = (tts_res.samples, tts_res.sample_rate) if tts_res.samples is not None else None
     try:
         if tts_latest.exists():
-            out_json = tts_latest.with_suffix(".lipsync.json")
+            # Provisional envelope-only curve; the aligned one is scheduled once state is published.
             p = _generate_lipsync_json_best_effort(
                 data_dir=data_dir,
                 wav_path=tts_latest,
                 text=final.speech_text,
-                out_json_path=out_json,
+                out_json_path=tts_latest.with_suffix(".lipsync.json"),
+                audio=run_audio,
+                use_aligner=False,
             )
             if p:
                 tts_lipsync_path = p
@@ -3958,9 +4554,19 @@ def manager_approve(req: ApproveIn) -> Dict[str, Any]:
         "live2d": live2d_result,
     }
     state = _bump_live2d_seq(state, tags=list(final.motion_tags or []), last_tag=None)
-    write_json(_state_path(data_dir), state)
+    _save_state(data_dir, state)
+    _schedule_legacy_lipsync_upgrade(
+        data_dir=data_dir, wav_path=audio_path, text=final.speech_text, audio=run_audio, state=state
+    )
 
-    ShortTermMemory(events_path=events_path).append(role="assistant", text=final.speech_text)
+    _append_chat_log(
+        data_dir=data_dir,
+        run_id=req.pending_id,
+        role="assistant",
+        text=final.speech_text,
+        source="manager",
+        meta={"status": "approved"},
+    )
 
     _update_pending(data_dir, req.pending_id, {"status": "approved", "final": final, "notes": req.notes})
 
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import os
 import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import numpy as np
 
@@ -16,9 +18,20 @@ class WhisperConfig:
     language: str = "ja"
 
 
-_model_lock = threading.Lock()
-_model = None
-_model_cfg: Optional[WhisperConfig] = None
+# Loaded models keyed by (model, device, compute_type). Language is a per-call
+# transcribe option, so STT and the lip-sync aligner share weights whenever
+# they agree on those three; least recently used models beyond the limit are dropped.
+ModelKey = Tuple[str, str, str]
+
+_MAX_MODELS = max(1, int(os.getenv("AITUBER_WHISPER_MAX_MODELS", "2") or 2))
+_models: "OrderedDict[ModelKey, Any]" = OrderedDict()
+_registry_lock = threading.Lock()
+_load_locks: Dict[ModelKey, threading.Lock] = {}
+_model_loader: Optional[Callable[[WhisperConfig], Any]] = None
+
+
+def model_key(cfg: WhisperConfig) -> ModelKey:
+    return (str(cfg.model), str(cfg.device), str(cfg.compute_type))
 
 
 def _load_model(cfg: WhisperConfig):
@@ -27,13 +40,45 @@ def _load_model(cfg: WhisperConfig):
     return WhisperModel(cfg.model, device=cfg.device, compute_type=cfg.compute_type)
 
 
+def set_model_loader(loader: Optional[Callable[[WhisperConfig], Any]]) -> None:
+    """Override how models are constructed (tests); clears the registry."""
+    global _model_loader
+    with _registry_lock:
+        _model_loader = loader
+        _models.clear()
+
+
+def release_models() -> None:
+    with _registry_lock:
+        _models.clear()
+
+
 def get_model(cfg: WhisperConfig):
-    global _model, _model_cfg
-    with _model_lock:
-        if _model is None or _model_cfg != cfg:
-            _model = _load_model(cfg)
-            _model_cfg = cfg
-        return _model
+    """Shared model for `cfg`, loaded at most once per key (thread-safe).
+
+    Loads of different keys run in parallel; concurrent callers for the same
+    key wait for the first load instead of loading twice.
+    """
+    key = model_key(cfg)
+    with _registry_lock:
+        model = _models.get(key)
+        if model is not None:
+            _models.move_to_end(key)
+            return model
+        load_lock = _load_locks.setdefault(key, threading.Lock())
+    with load_lock:
+        with _registry_lock:
+            model = _models.get(key)
+            if model is not None:
+                _models.move_to_end(key)
+                return model
+            loader = _model_loader or _load_model
+        model = loader(cfg)
+        with _registry_lock:
+            _models[key] = model
+            while len(_models) > _MAX_MODELS:
+                _models.popitem(last=False)
+        return model
 
 
 def transcribe_pcm(
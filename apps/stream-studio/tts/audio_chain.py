@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# In-memory post-processing for synthesized speech. Audio is handled as mono
+# float32 in [-1, 1]; PCM is decoded once, processed, and written once.
+
+
+@dataclass(frozen=True)
+class AudioChainConfig:
+    fade_in_ms: int = 8
+    fade_out_ms: int = 8
+    remove_dc: bool = False
+    # Target RMS level in dBFS; None disables loudness normalization.
+    normalize_dbfs: Optional[float] = None
+    max_gain_db: float = 12.0
+    peak_ceiling: float = 0.98
+    trim_silence: bool = False
+    silence_dbfs: float = -50.0
+    keep_silence_ms: int = 40
+
+    @classmethod
+    def from_dict(cls, raw: Optional[Dict[str, Any]]) -> "AudioChainConfig":
+        if not isinstance(raw, dict):
+            return cls()
+        d = cls()
+        norm = raw.get("normalize_dbfs", d.normalize_dbfs)
+        return cls(
+            fade_in_ms=int(raw.get("fade_in_ms", d.fade_in_ms)),
+            fade_out_ms=int(raw.get("fade_out_ms", d.fade_out_ms)),
+            remove_dc=bool(raw.get("remove_dc", d.remove_dc)),
+            normalize_dbfs=float(norm) if norm is not None else None,
+            max_gain_db=float(raw.get("max_gain_db", d.max_gain_db)),
+            peak_ceiling=float(raw.get("peak_ceiling", d.peak_ceiling)),
+            trim_silence=bool(raw.get("trim_silence", d.trim_silence)),
+            silence_dbfs=float(raw.get("silence_dbfs", d.silence_dbfs)),
+            keep_silence_ms=int(raw.get("keep_silence_ms", d.keep_silence_ms)),
+        )
+
+    def signature(self) -> str:
+        """Stable description of the chain (part of the TTS cache key)."""
+        return (
+            f"fade{self.fade_in_ms}/{self.fade_out_ms}"
+            f"|dc{int(self.remove_dc)}"
+            f"|norm{self.normalize_dbfs}/{self.max_gain_db}/{self.peak_ceiling}"
+            f"|trim{int(self.trim_silence)}/{self.silence_dbfs}/{self.keep_silence_ms}"
+        )
+
+
+def pcm16_to_float(raw: bytes, *, channels: int = 1) -> np.ndarray:
+    """Little-endian 16-bit PCM -> mono float32 in [-1, 1]."""
+    n = len(raw) // 2
+    x = np.frombuffer(raw[: n * 2], dtype="<i2").astype(np.float32) / 32768.0
+    ch = max(1, int(channels))
+    if ch > 1:
+        x = x[: (len(x) // ch) * ch].reshape(-1, ch).mean(axis=1)
+    return x
+
+
+def float_to_pcm16(x: np.ndarray) -> bytes:
+    y = np.clip(np.asarray(x, dtype=np.float32) * 32768.0, -32768.0, 32767.0)
+    return y.astype("<i2").tobytes()
+
+
+def apply_fade(x: np.ndarray, sample_rate: int, *, fade_in_ms: int, fade_out_ms: int) -> np.ndarray:
+    """Linear fade-in/out (first/last sample reach exactly zero gain)."""
+    n = len(x)
+    if n <= 1:
+        return x
+    fi = max(0, min(int(sample_rate * max(0, fade_in_ms) / 1000), n))
+    fo = max(0, min(int(sample_rate * max(0, fade_out_ms) / 1000), n))
+    y = np.array(x, dtype=np.float32, copy=True)
+    if fi >= 2:
+        y[:fi] *= np.linspace(0.0, 1.0, fi, dtype=np.float32)
+    if fo >= 2:
+        y[n - fo :] *= np.linspace(1.0, 0.0, fo, dtype=np.float32)
+    return y
+
+
+def remove_dc(x: np.ndarray) -> np.ndarray:
+    if len(x) == 0:
+        return x
+    return (x - np.float32(x.mean())).astype(np.float32, copy=False)
+
+
+def normalize_loudness(
+    x: np.ndarray, *, target_dbfs: float, max_gain_db: float = 12.0, peak_ceiling: float = 0.98
+) -> np.ndarray:
+    """Scale to a target RMS level, limited by max gain and a peak ceiling."""
+    if len(x) == 0:
+        return x
+    rms = float(np.sqrt(np.mean(np.square(x, dtype=np.float64))))
+    if rms <= 1e-6:
+        return x
+    gain = (10.0 ** (float(target_dbfs) / 20.0)) / rms
+    gain = min(gain, 10.0 ** (float(max_gain_db) / 20.0))
+    peak = float(np.max(np.abs(x)))
+    if peak > 0:
+        gain = min(gain, float(peak_ceiling) / peak)
+    return (x * np.float32(gain)).astype(np.float32, copy=False)
+
+
+def trim_silence(x: np.ndarray, sample_rate: int, *, threshold_dbfs: float = -50.0, keep_ms: int = 40) -> np.ndarray:
+    """Drop leading/trailing samples below the threshold, keeping `keep_ms` of padding.
+
+    Levels are measured around the median so a DC offset does not count as sound.
+    """
+    if len(x) == 0:
+        return x
+    thr = 10.0 ** (float(threshold_dbfs) / 20.0)
+    loud = np.flatnonzero(np.abs(x - np.float32(np.median(x))) > thr)
+    if len(loud) == 0:
+        return x
+    pad = int(sample_rate * max(0, keep_ms) / 1000)
+    start = max(0, int(loud[0]) - pad)
+    end = min(len(x), int(loud[-1]) + 1 + pad)
+    return x[start:end]
+
+
+def process(x: np.ndarray, sample_rate: int, cfg: AudioChainConfig) -> np.ndarray:
+    """Run the configured chain: trim, DC removal, loudness, fades."""
+    y = np.asarray(x, dtype=np.float32)
+    if cfg.trim_silence:
+        y = trim_silence(y, sample_rate, threshold_dbfs=cfg.silence_dbfs, keep_ms=cfg.keep_silence_ms)
+    if cfg.remove_dc:
+        y = remove_dc(y)
+    if cfg.normalize_dbfs is not None:
+        y = normalize_loudness(
+            y, target_dbfs=cfg.normalize_dbfs, max_gain_db=cfg.max_gain_db, peak_ceiling=cfg.peak_ceiling
+        )
+    return apply_fade(y, sample_rate, fade_in_ms=cfg.fade_in_ms, fade_out_ms=cfg.fade_out_ms)
+
+
+def write_wav(path: Path, x: np.ndarray, sample_rate: int) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(int(sample_rate))
+        wf.writeframes(float_to_pcm16(x))
+    return path
+
+
+def read_wav(path: Path) -> Tuple[np.ndarray, int]:
+    """16-bit PCM WAV -> (mono float32, sample_rate)."""
+    with wave.open(str(path), "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"Only 16-bit PCM WAV supported; got sampwidth={wf.getsampwidth()}")
+        ch = wf.getnchannels()
+        sr = wf.getframerate()
+        raw = wf.readframes(wf.getnframes())
+    return pcm16_to_float(raw, channels=ch), int(sr)
@@ -1,17 +1,175 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, Optional
+
+from core.metrics import get_metrics
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def cache_key(
+    *,
+    provider: str,
+    voice: str,
+    text: str,
+    ssml: bool,
+    sample_rate_hz: int,
+    postprocess_version: str,
+) -> str:
+    """Content hash identifying one synthesized WAV."""
+    h = hashlib.sha256()
+    for part in (
+        (provider or "").strip().lower(),
+        voice or "",
+        "ssml" if ssml else "text",
+        str(int(sample_rate_hz)),
+        postprocess_version or "",
+        text or "",
+    ):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def _materialize(src: Path, dst: Path) -> None:
+    """Hard-link `src` to `dst` (copy across filesystems), replacing `dst`."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.{threading.get_ident()}.tmp")
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
 
 
 @dataclass
 class TTSCache:
-    """TTS cache stub.
+    """Content-addressed WAV cache with LRU eviction under a byte budget.
 
-    Replace with content-hash cache later.
+    Files live at `cache_dir/<key[:2]>/<key>.wav`; the in-memory index
+    (key -> size, LRU order) is rebuilt from mtimes on startup, and hits
+    touch the file so the order survives restarts. Entries are hard-linked
+    into (and out of) segment directories, so a hit costs a link(2), and
+    deleting old segment audio never invalidates the cache.
     """
 
     cache_dir: Path
+    max_bytes: int = DEFAULT_MAX_BYTES
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _index: "OrderedDict[str, int]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _bytes: int = field(default=0, init=False, repr=False)
 
     def __post_init__(self) -> None:
+        self.cache_dir = Path(self.cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for p in self.cache_dir.glob("*/*.wav"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, p.stem, int(st.st_size)))
+        entries.sort()
+        for _mtime, key, size in entries:
+            self._index[key] = size
+            self._bytes += size
+        with self._lock:
+            self._evict_locked()
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.wav"
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def get(self, key: str, out_path: Path) -> bool:
+        """Materialize a cached WAV at `out_path`; False on miss."""
+        m = get_metrics()
+        with self._lock:
+            hit = key in self._index
+            if hit:
+                self._index.move_to_end(key)
+        if not hit:
+            m.inc("tts_cache_total", result="miss")
+            return False
+        src = self.path_for(key)
+        try:
+            _materialize(src, Path(out_path))
+            os.utime(src)
+        except OSError:
+            # Evicted or removed behind our back.
+            with self._lock:
+                size = self._index.pop(key, None)
+                if size is not None:
+                    self._bytes -= size
+            m.inc("tts_cache_total", result="miss")
+            return False
+        m.inc("tts_cache_total", result="hit")
+        return True
+
+    def put(self, key: str, src_path: Path) -> None:
+        """Add a finished (post-processed) WAV; best-effort."""
+        try:
+            size = int(Path(src_path).stat().st_size)
+        except OSError:
+            return
+        if size <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+                return
+        try:
+            _materialize(Path(src_path), self.path_for(key))
+        except OSError:
+            return
+        with self._lock:
+            if key not in self._index:
+                self._index[key] = size
+                self._bytes += size
+            self._evict_locked()
+            m = get_metrics()
+            m.set_gauge("tts_cache_bytes", self._bytes)
+            m.set_gauge("tts_cache_entries", len(self._index))
+
+    def _evict_locked(self) -> None:
+        while self._bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._bytes -= size
+            try:
+                self.path_for(key).unlink()
+            except OSError:
+                pass
+            get_metrics().inc("tts_cache_evictions_total")
+
+
+_caches: Dict[str, TTSCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_tts_cache(cache_dir: Path, *, max_bytes: Optional[int] = None) -> TTSCache:
+    """Process-wide cache per directory (the index is loaded once)."""
+    key = str(Path(cache_dir))
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = TTSCache(cache_dir=Path(cache_dir), max_bytes=int(max_bytes or DEFAULT_MAX_BYTES))
+            _caches[key] = cache
+        elif max_bytes:
+            with cache._lock:
+                cache.max_bytes = int(max_bytes)
+                cache._evict_locked()
+        return cache
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from core.metrics import get_metrics
+
+# gRPC channel options: keep idle channels alive between utterances so the
+# next sentence does not pay a reconnect/TLS handshake.
+KEEPALIVE_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
+# Exception class names that mean the channel is unusable (reconnect and retry once).
+_TRANSPORT_ERRORS = ("ServiceUnavailable", "DeadlineExceeded", "RpcError", "Cancelled", "_InactiveRpcError")
+
+
+def _default_factory() -> Any:
+    from google.cloud import texttospeech
+
+    try:
+        from google.cloud.texttospeech_v1.services.text_to_speech.transports import TextToSpeechGrpcTransport
+
+        channel = TextToSpeechGrpcTransport.create_channel(options=KEEPALIVE_OPTIONS)
+        return texttospeech.TextToSpeechClient(transport=TextToSpeechGrpcTransport(channel=channel))
+    except Exception:
+        # Older/newer SDK layouts: default transport (still reused across calls).
+        return texttospeech.TextToSpeechClient()
+
+
+def _is_transport_error(e: BaseException) -> bool:
+    names = {c.__name__ for c in type(e).__mro__}
+    return any(n in names for n in _TRANSPORT_ERRORS)
+
+
+class GoogleTTSClientPool:
+    """Long-lived Google Cloud TTS clients shared by every synthesis path.
+
+    Clients (credential discovery + gRPC channel) are created once and used
+    round-robin; a call failing with a transport error drops that client,
+    reconnects and retries once.
+    """
+
+    def __init__(self, *, size: int = 2, factory: Optional[Callable[[], Any]] = None) -> None:
+        self.size = max(1, int(size))
+        self.factory = factory or _default_factory
+        self._lock = threading.Lock()
+        self._clients: List[Optional[Any]] = [None] * self.size
+        self._next = 0
+
+    def _checkout(self) -> tuple[int, Any]:
+        with self._lock:
+            slot = self._next
+            self._next = (self._next + 1) % self.size
+            client = self._clients[slot]
+            if client is None:
+                client = self.factory()
+                self._clients[slot] = client
+                get_metrics().inc("tts_client_connects_total")
+            return slot, client
+
+    def _drop(self, slot: int, client: Any) -> None:
+        with self._lock:
+            if self._clients[slot] is client:
+                self._clients[slot] = None
+        get_metrics().inc("tts_client_reconnects_total")
+
+    def call(self, fn: Callable[[Any], Any]) -> Any:
+        """Run `fn(client)`; on a transport error reconnect and retry once."""
+        slot, client = self._checkout()
+        try:
+            return fn(client)
+        except Exception as e:
+            if not _is_transport_error(e):
+                raise
+            self._drop(slot, client)
+        slot, client = self._checkout()
+        return fn(client)
+
+    def synthesize_linear16(
+        self,
+        *,
+        text: str,
+        ssml: bool = False,
+        language_code: str = "ja-JP",
+        voice_name: str = "",
+        sample_rate_hz: int = 24000,
+        speaking_rate: Optional[float] = None,
+        pitch: Optional[float] = None,
+    ) -> bytes:
+        """Raw LINEAR16 PCM (even length) for `text`."""
+        from google.cloud import texttospeech
+
+        synthesis_input = texttospeech.SynthesisInput(ssml=text) if ssml else texttospeech.SynthesisInput(text=text)
+        voice_params = texttospeech.VoiceSelectionParams(language_code=language_code, name=voice_name or "")
+        audio_kwargs: dict = {
+            "audio_encoding": texttospeech.AudioEncoding.LINEAR16,
+            "sample_rate_hertz": int(sample_rate_hz),
+        }
+        if speaking_rate is not None:
+            audio_kwargs["speaking_rate"] = float(speaking_rate)
+        if pitch is not None:
+            audio_kwargs["pitch"] = float(pitch)
+        audio_config = texttospeech.AudioConfig(**audio_kwargs)
+
+        response = self.call(
+            lambda c: c.synthesize_speech(input=synthesis_input, voice=voice_params, audio_config=audio_config)
+        )
+        pcm = response.audio_content or b""
+        if len(pcm) % 2 == 1:
+            pcm = pcm[:-1]
+        return pcm
+
+    def warm_up(self, *, voice_name: str = "", text: str = "あ") -> Optional[float]:
+        """Connect every client and run one tiny synthesis; seconds taken, or None on failure."""
+        t0 = time.perf_counter()
+        try:
+            for _ in range(self.size):
+                self._checkout()
+            self.synthesize_linear16(text=text, voice_name=voice_name)
+        except Exception:
+            get_metrics().inc("errors_total", source="tts", phase="warm_up")
+            return None
+        dt = time.perf_counter() - t0
+        get_metrics().set_gauge("tts_warm_up_seconds", round(dt, 4))
+        return dt
+
+    def reset(self) -> None:
+        with self._lock:
+            self._clients = [None] * self.size
+
+
+_pool: Optional[GoogleTTSClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_google_tts_pool() -> GoogleTTSClientPool:
+    """Process-wide pool used by TTSService and the lip-sync TTS adapter."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = GoogleTTSClientPool()
+        return _pool
+
+
+def set_google_tts_pool(pool: Optional[GoogleTTSClientPool]) -> None:
+    """Replace the shared pool (tests, or a different size from config)."""
+    global _pool
+    with _pool_lock:
+        _pool = pool
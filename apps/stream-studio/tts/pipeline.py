@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from core.metrics import get_metrics
+
+JsonDict = Dict[str, Any]
+
+# Concurrent synthesis requests per TTS provider, across all utterances.
+DEFAULT_PROVIDER_LIMITS: Dict[str, int] = {"google": 4, "stub": 8}
+_FALLBACK_LIMIT = 2
+
+_limits: Dict[str, int] = dict(DEFAULT_PROVIDER_LIMITS)
+_slots: Dict[str, threading.BoundedSemaphore] = {}
+_slots_lock = threading.Lock()
+
+_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def configure_provider_limits(limits: Optional[Dict[str, Any]]) -> None:
+    """Override per-provider limits (e.g. from app.yaml `tts.provider_concurrency`)."""
+    if not isinstance(limits, dict):
+        return
+    with _slots_lock:
+        for k, v in limits.items():
+            try:
+                n = max(1, int(v))
+            except Exception:
+                continue
+            key = str(k).strip().lower()
+            if _limits.get(key) != n:
+                _limits[key] = n
+                # Holders of the old semaphore release it; new calls use the new limit.
+                _slots.pop(key, None)
+
+
+@contextmanager
+def provider_slot(provider: str) -> Iterator[None]:
+    """Hold one of the provider's concurrency slots for the duration of a call."""
+    key = (provider or "").strip().lower() or "stub"
+    with _slots_lock:
+        sem = _slots.get(key)
+        if sem is None:
+            sem = threading.BoundedSemaphore(_limits.get(key, _FALLBACK_LIMIT))
+            _slots[key] = sem
+    with sem:
+        yield
+
+
+def _tts_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(max_workers=16, thread_name_prefix="tts")
+        return _executor
+
+
+class OrderedSegmentPipeline:
+    """Synthesizes utterance segments concurrently, publishes them in order.
+
+    `work(idx, text)` runs on a shared pool with at most `max_in_flight`
+    segments of this utterance at once (`submit` blocks when full). Results
+    are handed to `publish` strictly by index as soon as every earlier
+    segment is done; a `None` result (failed segment) is skipped.
+    """
+
+    def __init__(
+        self,
+        *,
+        work: Callable[[int, str], Optional[JsonDict]],
+        publish: Callable[[JsonDict], None],
+        max_in_flight: int = 3,
+        first_idx: int = 1,
+    ) -> None:
+        self.work = work
+        self.publish = publish
+        self.max_in_flight = max(1, int(max_in_flight))
+        self._room = threading.BoundedSemaphore(self.max_in_flight)
+        self._lock = threading.Lock()
+        self._next_idx = int(first_idx)
+        self._next_publish = int(first_idx)
+        self._done: Dict[int, Optional[JsonDict]] = {}
+        self._futures: List[concurrent.futures.Future] = []
+
+    def submit(self, text: str) -> int:
+        self._room.acquire()
+        with self._lock:
+            idx = self._next_idx
+            self._next_idx += 1
+            self._futures.append(_tts_executor().submit(self._run, idx, text))
+        return idx
+
+    def _run(self, idx: int, text: str) -> None:
+        result: Optional[JsonDict] = None
+        try:
+            result = self.work(idx, text)
+        except Exception:
+            get_metrics().inc("errors_total", source="tts", phase="segment_pipeline")
+            result = None
+        finally:
+            self._room.release()
+            with self._lock:
+                self._done[idx] = result
+                while self._next_publish in self._done:
+                    item = self._done.pop(self._next_publish)
+                    self._next_publish += 1
+                    if item is not None:
+                        try:
+                            self.publish(item)
+                        except Exception:
+                            get_metrics().inc("errors_total", source="tts", phase="segment_publish")
+
+    @property
+    def submitted(self) -> int:
+        with self._lock:
+            return len(self._futures)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Wait until every submitted segment has been synthesized and published."""
+        with self._lock:
+            futures = list(self._futures)
+        concurrent.futures.wait(futures, timeout=timeout)
@@ -1,131 +1,83 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from typing import Optional, Tuple
 
-import array
-import wave
+import numpy as np
 
+from tts.audio_chain import AudioChainConfig, pcm16_to_float, process, write_wav
+from tts.cache import TTSCache, cache_key
+from tts.client_pool import get_google_tts_pool
 from tts.engine import TTSEngine
 
+GOOGLE_SAMPLE_RATE_HZ = 24000
+# Bump when the WAV post-processing code changes so cached audio is regenerated
+# (the chain settings themselves are part of the key via AudioChainConfig.signature()).
+POSTPROCESS_VERSION = "chain1"
+
 
 @dataclass
-class TTSService:
+class SynthesisResult:
+    path: Path
     provider: str
-    voice: str
-
-    @staticmethod
-    def _apply_wav_fade(*, wav_path: Path, fade_in_ms: int = 8, fade_out_ms: int = 8) -> None:
-        """Apply a short linear fade-in/out to a 16-bit PCM WAV.
-
-        This suppresses audible clicks when playback starts/ends at a non-zero
-        sample value (common with synthesized audio).
-        """
-        if fade_in_ms <= 0 and fade_out_ms <= 0:
-            return
-
-        try:
-            with wave.open(str(wav_path), "rb") as wf:
-                nch = int(wf.getnchannels())
-                sampwidth = int(wf.getsampwidth())
-                rate = int(wf.getframerate())
-                nframes = int(wf.getnframes())
-                comptype = wf.getcomptype()
-                if comptype != "NONE":
-                    return
-                if sampwidth != 2 or nch <= 0 or rate <= 0 or nframes <= 0:
-                    return
-                raw = wf.readframes(nframes)
-
-            # 16-bit signed little-endian
-            samples = array.array("h")
-            samples.frombytes(raw)
-            if not samples:
-                return
-
-            total_frames = len(samples) // nch
-            if total_frames <= 1:
-                return
-
-            fi = int(rate * max(0, fade_in_ms) / 1000)
-            fo = int(rate * max(0, fade_out_ms) / 1000)
-            fi = max(0, min(fi, total_frames))
-            fo = max(0, min(fo, total_frames))
-
-            # Fade-in
-            if fi >= 2:
-                for frame_i in range(fi):
-                    g = frame_i / float(fi - 1)
-                    base = frame_i * nch
-                    for c in range(nch):
-                        v = int(samples[base + c] * g)
-                        if v > 32767:
-                            v = 32767
-                        elif v < -32768:
-                            v = -32768
-                        samples[base + c] = v
-
-            # Fade-out
-            if fo >= 2:
-                start = max(0, total_frames - fo)
-                for j, frame_i in enumerate(range(start, total_frames)):
-                    # j=0 => gain=1, j=fo-1 => gain=0
-                    g = 1.0 - (j / float(fo - 1))
-                    base = frame_i * nch
-                    for c in range(nch):
-                        v = int(samples[base + c] * g)
-                        if v > 32767:
-                            v = 32767
-                        elif v < -32768:
-                            v = -32768
-                        samples[base + c] = v
-
-            out_bytes = samples.tobytes()
-            with wave.open(str(wav_path), "wb") as wf2:
-                wf2.setnchannels(nch)
-                wf2.setsampwidth(2)
-                wf2.setframerate(rate)
-                wf2.writeframes(out_bytes)
-        except Exception:
-            # Best-effort: do not break TTS if postprocessing fails.
-            return
-
-    def _synthesize_google(self, *, text: str, out_path: Path, ssml: bool) -> Path:
-        from google.cloud import texttospeech
+    error: Optional[str] = None
+    # Post-processed mono float32 audio when it was produced in memory (not on cache hits / stub).
+    samples: Optional[np.ndarray] = None
+    sample_rate: int = 0
 
-        client = texttospeech.TextToSpeechClient()
-        synthesis_input = texttospeech.SynthesisInput(ssml=text) if ssml else texttospeech.SynthesisInput(text=text)
 
-        voice_params = texttospeech.VoiceSelectionParams(
+@dataclass
+class TTSService:
+    provider: str
+    voice: str
+    cache: Optional[TTSCache] = None
+    postprocess: AudioChainConfig = field(default_factory=AudioChainConfig)
+
+    def _synthesize_google_audio(self, *, text: str, out_path: Path, ssml: bool) -> Tuple[Path, Optional[np.ndarray]]:
+        """Synthesize, post-process in memory, write the WAV once; returns (path, samples)."""
+        sample_rate_hz = GOOGLE_SAMPLE_RATE_HZ
+        pcm = get_google_tts_pool().synthesize_linear16(
+            text=text,
+            ssml=ssml,
             language_code="ja-JP",
-            name=self.voice or "",
-        )
-        sample_rate_hz = 24000
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.LINEAR16,
-            sample_rate_hertz=sample_rate_hz,
+            voice_name=self.voice or "",
+            sample_rate_hz=sample_rate_hz,
         )
+        # DC removal / loudness / trim / click-suppressing fades.
+        samples = process(pcm16_to_float(pcm), sample_rate_hz, self.postprocess)
+        write_wav(out_path, samples, sample_rate_hz)
+        return out_path, samples
 
-        response = client.synthesize_speech(
-            input=synthesis_input,
-            voice=voice_params,
-            audio_config=audio_config,
+    def _synthesize_google(self, *, text: str, out_path: Path, ssml: bool) -> Path:
+        return self._synthesize_google_audio(text=text, out_path=out_path, ssml=ssml)[0]
+
+    def _cache_key(self, *, text: str, ssml: bool) -> str:
+        return cache_key(
+            provider="google",
+            voice=self.voice or "",
+            text=text,
+            ssml=ssml,
+            sample_rate_hz=GOOGLE_SAMPLE_RATE_HZ,
+            postprocess_version=f"{POSTPROCESS_VERSION}|{self.postprocess.signature()}",
         )
 
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        pcm = response.audio_content or b""
-        if len(pcm) % 2 == 1:
-            pcm = pcm[:-1]
-        with wave.open(str(out_path), "wb") as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(sample_rate_hz)
-            wf.writeframes(pcm)
-        # Reduce start/end click artifacts.
-        self._apply_wav_fade(wav_path=out_path, fade_in_ms=8, fade_out_ms=8)
-        return out_path
+    def _synthesize_google_cached(self, *, text: str, out_path: Path, ssml: bool) -> Tuple[Path, Optional[np.ndarray]]:
+        """`_synthesize_google_audio` behind the content-addressed cache (if configured)."""
+        if self.cache is None:
+            return self._synthesize_google_audio(text=text, out_path=out_path, ssml=ssml)
+        key = self._cache_key(text=text, ssml=ssml)
+        if self.cache.get(key, out_path):
+            return out_path, None
+        # out_path may be a hard link to a cache entry from an earlier call; never write through it.
+        try:
+            out_path.unlink()
+        except OSError:
+            pass
+        p, samples = self._synthesize_google_audio(text=text, out_path=out_path, ssml=ssml)
+        self.cache.put(key, p)
+        return p, samples
 
     def synthesize(self, *, text: str, out_path: Path, ssml: bool = False) -> Path:
         """Generate speech audio.
@@ -137,7 +89,7 @@ class TTSService:
 
         if prov == "google":
             try:
-                return self._synthesize_google(text=text, out_path=out_path, ssml=ssml)
+                return self._synthesize_google_cached(text=text, out_path=out_path, ssml=ssml)[0]
             except Exception:
                 # Fall through to stub
                 pass
@@ -147,18 +99,24 @@ class TTSService:
 
     def synthesize_with_meta(self, *, text: str, out_path: Path, ssml: bool = False) -> Tuple[Path, str, Optional[str]]:
         """Same as synthesize() but returns (path, provider_used, error_message)."""
+        r = self.synthesize_audio(text=text, out_path=out_path, ssml=ssml)
+        return r.path, r.provider, r.error
+
+    def synthesize_audio(self, *, text: str, out_path: Path, ssml: bool = False) -> SynthesisResult:
+        """synthesize_with_meta() that also returns the in-memory audio for lip-sync."""
         prov = (self.provider or "").strip().lower()
 
         if prov == "google":
             try:
-                p = self._synthesize_google(text=text, out_path=out_path, ssml=ssml)
-                return p, "google", None
+                p, samples = self._synthesize_google_cached(text=text, out_path=out_path, ssml=ssml)
+                rate = GOOGLE_SAMPLE_RATE_HZ if samples is not None else 0
+                return SynthesisResult(path=p, provider="google", samples=samples, sample_rate=rate)
             except Exception as e:
                 # fall back
                 engine = TTSEngine(voice="stub")
                 p = engine.synthesize(text=text, out_wav_path=out_path, seconds=1.0)
-                return p, "stub", f"{type(e).__name__}: {e}"[:220]
+                return SynthesisResult(path=p, provider="stub", error=f"{type(e).__name__}: {e}"[:220])
 
         engine = TTSEngine(voice="stub")
         p = engine.synthesize(text=text, out_wav_path=out_path, seconds=1.0)
-        return p, "stub", None
+        return SynthesisResult(path=p, provider="stub")
@@ -6,6 +6,9 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 
 from core.prompts import read_prompt_text
+from llm.genai_pool import agenerate_content, call_with_timeout, get_genai_client
+
+_VLM_TIMEOUT_SECONDS = 20
 
 
 def _guess_mime_from_header(data: bytes) -> str:
@@ -36,40 +39,13 @@ class VLMSummarizer:
 
         # Gemini multimodal (optional dependency)
         try:
-            from google import genai
-
-            client = genai.Client(api_key=self.api_key)
             data = screenshot_path.read_bytes()
 
             suffix = screenshot_path.suffix.lower()
             mime = "image/png"
             if suffix in (".jpg", ".jpeg"):
                 mime = "image/jpeg"
-
-            prompt = (self.system_prompt or '').strip() or read_prompt_text(name="vlm_system").strip()
-
-            b64 = base64.b64encode(data).decode("ascii")
-            kwargs: Dict[str, Any] = {
-                "model": self.model,
-                "contents": [
-                    {
-                        "role": "user",
-                        "parts": [
-                            {"text": prompt},
-                            {"inline_data": {"mime_type": mime, "data": b64}},
-                        ],
-                    }
-                ],
-            }
-            if self.generation_config and isinstance(self.generation_config, dict):
-                kwargs["config"] = dict(self.generation_config)
-            try:
-                resp = client.models.generate_content(**kwargs)
-            except TypeError:
-                kwargs.pop("config", None)
-                resp = client.models.generate_content(**kwargs)
-            text = (resp.text or "").strip()
-            return text[:300] if text else "(vlm summary empty)"
+            return self._generate(self._request(data, mime))
         except Exception as e:
             msg = f"{type(e).__name__}: {e}"
             return ("(vlm summary failed: " + msg + ")")[:300]
@@ -88,34 +64,59 @@ class VLMSummarizer:
         mime = (mime_type or "").strip().lower() or _guess_mime_from_header(image_bytes)
 
         try:
-            from google import genai
-
-            client = genai.Client(api_key=self.api_key)
-
-            prompt = (self.system_prompt or '').strip() or read_prompt_text(name="vlm_system").strip()
-
-            b64 = base64.b64encode(image_bytes).decode("ascii")
-            kwargs: Dict[str, Any] = {
-                "model": self.model,
-                "contents": [
-                    {
-                        "role": "user",
-                        "parts": [
-                            {"text": prompt},
-                            {"inline_data": {"mime_type": mime, "data": b64}},
-                        ],
-                    }
-                ],
-            }
-            if self.generation_config and isinstance(self.generation_config, dict):
-                kwargs["config"] = dict(self.generation_config)
+            return self._generate(self._request(image_bytes, mime))
+        except Exception as e:
+            msg = f"{type(e).__name__}: {e}"
+            return ("(vlm summary failed: " + msg + ")")[:300]
+
+    async def asummarize_image_bytes(self, *, image_bytes: bytes, mime_type: str | None = None) -> str:
+        """Async `summarize_image_bytes` for request handlers (SDK aio client)."""
+        if not image_bytes:
+            return "(no image)"
+
+        if not (self.api_key or "").strip():
+            return "(vlm not configured: skipped)"
+
+        mime = (mime_type or "").strip().lower() or _guess_mime_from_header(image_bytes)
+        kwargs = self._request(image_bytes, mime)
+        try:
             try:
-                resp = client.models.generate_content(**kwargs)
+                resp = await agenerate_content(self.api_key, timeout=_VLM_TIMEOUT_SECONDS, **kwargs)
             except TypeError:
                 kwargs.pop("config", None)
-                resp = client.models.generate_content(**kwargs)
+                resp = await agenerate_content(self.api_key, timeout=_VLM_TIMEOUT_SECONDS, **kwargs)
             text = (resp.text or "").strip()
             return text[:300] if text else "(vlm summary empty)"
         except Exception as e:
             msg = f"{type(e).__name__}: {e}"
             return ("(vlm summary failed: " + msg + ")")[:300]
+
+    def _request(self, data: bytes, mime: str) -> Dict[str, Any]:
+        prompt = (self.system_prompt or '').strip() or read_prompt_text(name="vlm_system").strip()
+
+        b64 = base64.b64encode(data).decode("ascii")
+        kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "contents": [
+                {
+                    "role": "user",
+                    "parts": [
+                        {"text": prompt},
+                        {"inline_data": {"mime_type": mime, "data": b64}},
+                    ],
+                }
+            ],
+        }
+        if self.generation_config and isinstance(self.generation_config, dict):
+            kwargs["config"] = dict(self.generation_config)
+        return kwargs
+
+    def _generate(self, kwargs: Dict[str, Any]) -> str:
+        client = get_genai_client(self.api_key)
+        try:
+            resp = call_with_timeout(client.models.generate_content, _VLM_TIMEOUT_SECONDS, **kwargs)
+        except TypeError:
+            kwargs.pop("config", None)
+            resp = call_with_timeout(client.models.generate_content, _VLM_TIMEOUT_SECONDS, **kwargs)
+        text = (resp.text or "").strip()
+        return text[:300] if text else "(vlm summary empty)"
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+import numpy as np
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from lip_sync.curve import rms_envelope  # noqa: E402
+from tts.audio_chain import (  # noqa: E402
+    AudioChainConfig,
+    apply_fade,
+    float_to_pcm16,
+    normalize_loudness,
+    pcm16_to_float,
+    process,
+    read_wav,
+    trim_silence,
+    write_wav,
+)
+
+SR = 24000
+
+
+def _tone(seconds: float, amp: float = 0.5, dc: float = 0.0) -> np.ndarray:
+    t = np.arange(int(SR * seconds)) / SR
+    return (amp * np.sin(2 * np.pi * 220 * t) + dc).astype(np.float32)
+
+
+def _legacy_fade(samples: list, rate: int, fade_ms: int) -> list:
+    """Reference: the former per-sample loop (mono)."""
+    out = list(samples)
+    n = len(out)
+    f = max(0, min(int(rate * fade_ms / 1000), n))
+    for i in range(f):
+        out[i] = int(out[i] * (i / float(f - 1)))
+    start = n - f
+    for j, i in enumerate(range(start, n)):
+        out[i] = int(out[i] * (1.0 - j / float(f - 1)))
+    return out
+
+
+class TestAudioChain(unittest.TestCase):
+    def test_pcm_roundtrip_is_lossless(self) -> None:
+        ints = np.array([0, 1, -1, 32767, -32768, 1234], dtype="<i2")
+        self.assertEqual(float_to_pcm16(pcm16_to_float(ints.tobytes())), ints.tobytes())
+
+    def test_fade_matches_previous_implementation(self) -> None:
+        ints = (np.random.default_rng(0).integers(-20000, 20000, 3000)).astype("<i2")
+        got = np.frombuffer(float_to_pcm16(apply_fade(pcm16_to_float(ints.tobytes()), SR, fade_in_ms=8, fade_out_ms=8)), dtype="<i2")
+        ref = np.array(_legacy_fade(ints.tolist(), SR, 8))
+        self.assertLessEqual(int(np.max(np.abs(got.astype(int) - ref))), 1)
+        self.assertEqual(int(got[0]), 0)
+        self.assertEqual(int(got[-1]), 0)
+
+    def test_default_chain_only_fades(self) -> None:
+        x = _tone(0.2, amp=0.3) + np.float32(0.05)
+        np.testing.assert_array_equal(process(x, SR, AudioChainConfig()), apply_fade(x, SR, fade_in_ms=8, fade_out_ms=8))
+
+    def test_dc_normalize_and_trim(self) -> None:
+        x = np.concatenate([np.zeros(SR // 2, np.float32), _tone(0.5, amp=0.05), np.zeros(SR // 2, np.float32)]) + 0.1
+        cfg = AudioChainConfig(remove_dc=True, normalize_dbfs=-20.0, trim_silence=True, keep_silence_ms=10)
+        y = process(x, SR, cfg)
+        self.assertLess(len(y), len(x) * 0.6)
+        self.assertLess(abs(float(y.mean())), 1e-3)
+        rms_db = 20 * np.log10(np.sqrt(np.mean(y.astype(np.float64) ** 2)))
+        self.assertAlmostEqual(rms_db, -20.0, delta=0.5)
+        # Peak ceiling wins over the RMS target.
+        loud = normalize_loudness(_tone(0.1, amp=0.5), target_dbfs=0.0, peak_ceiling=0.9)
+        self.assertLessEqual(float(np.max(np.abs(loud))), 0.9 + 1e-6)
+        self.assertEqual(len(trim_silence(np.zeros(100, np.float32), SR)), 100)
+
+    def test_chain_signature_changes_with_settings(self) -> None:
+        self.assertNotEqual(AudioChainConfig().signature(), AudioChainConfig(normalize_dbfs=-20).signature())
+        self.assertEqual(AudioChainConfig.from_dict({"normalize_dbfs": -18}).normalize_dbfs, -18.0)
+
+    def test_envelope_from_buffer_matches_file(self) -> None:
+        x = _tone(0.3) * np.linspace(0, 1, int(SR * 0.3), dtype=np.float32)
+        with tempfile.TemporaryDirectory() as td:
+            p = write_wav(Path(td) / "a.wav", x, SR)
+            from_file = rms_envelope(wav_path=p)
+            samples, sr = read_wav(p)
+        from_buf = rms_envelope(samples=samples, sample_rate=sr)
+        self.assertEqual(from_file[0], from_buf[0])
+        np.testing.assert_allclose(from_file[1], from_buf[1], atol=1e-9)
+        # Reference: straightforward per-window RMS.
+        hop, win = SR // 100, int(SR * 0.03)
+        ref = []
+        for start in range(0, len(samples), hop):
+            seg = samples[start : start + win].astype(np.float64)
+            ref.append(min(1.0, max(0.0, (np.sqrt(np.mean(seg * seg)) - 0.02) * 2.0)))
+        np.testing.assert_allclose(from_buf[1], ref, atol=1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()
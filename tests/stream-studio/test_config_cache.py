@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from core.config_cache import ConfigCache, load_yaml_cached  # noqa: E402
+
+
+class TestConfigCache(unittest.TestCase):
+    def test_rebuilds_only_when_stamp_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "a.txt"
+            path.write_text("one", encoding="utf-8")
+            cache = ConfigCache()
+            builds = []
+
+            def _build() -> dict:
+                builds.append(1)
+                return {"text": path.read_text(encoding="utf-8")}
+
+            self.assertEqual(cache.get("k", paths=[path], build=_build), {"text": "one"})
+            self.assertEqual(cache.get("k", paths=[path], build=_build), {"text": "one"})
+            self.assertEqual(len(builds), 1)
+
+            path.write_text("two!", encoding="utf-8")
+            st = path.stat()
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            self.assertEqual(cache.get("k", paths=[path], build=_build), {"text": "two!"})
+            self.assertEqual(len(builds), 2)
+
+            cache.invalidate()
+            cache.get("k", paths=[path], build=_build)
+            self.assertEqual(len(builds), 3)
+
+            # `extra` participates in validation (e.g. environment fingerprint).
+            cache.get("k", paths=[path], build=_build, extra=("X", "1"))
+            self.assertEqual(len(builds), 4)
+
+    def test_returned_values_are_copies(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "app.yaml"
+            path.write_text("tts:\n  mode: ssml_full\n", encoding="utf-8")
+            cfg = load_yaml_cached(path)
+            cfg["tts"]["mode"] = "segments"
+            self.assertEqual(load_yaml_cached(path)["tts"]["mode"], "ssml_full")
+            self.assertEqual(load_yaml_cached(Path(td) / "missing.yaml"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
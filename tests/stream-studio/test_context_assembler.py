@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from rag.context_assembler import ContextAssembler, fit_to_budget  # noqa: E402
+from rag.vector_index import estimate_tokens  # noqa: E402
+
+
+class TestFitToBudget(unittest.TestCase):
+    def test_keeps_newest_lines_within_budget(self) -> None:
+        text = "\n".join(f"line {i} " + "あ" * 10 for i in range(50))
+        out, truncated = fit_to_budget(text, 60, keep="tail")
+        self.assertTrue(truncated)
+        self.assertLessEqual(estimate_tokens(out), 60)
+        self.assertTrue(out.endswith("line 49 " + "あ" * 10))
+
+    def test_oversized_single_line_is_cut(self) -> None:
+        out, truncated = fit_to_budget("い" * 100, 10, keep="head")
+        self.assertTrue(truncated)
+        self.assertEqual(out, "い" * 10)
+
+
+class TestContextAssembler(unittest.TestCase):
+    def test_static_section_rebuilt_only_on_version_change(self) -> None:
+        asm = ContextAssembler(budgets={"longRAG": 100})
+        calls = []
+
+        def build() -> str:
+            calls.append(1)
+            return "知識ベース"
+
+        a = asm.static("longRAG", version=1, build=build)
+        b = asm.static("longRAG", version=1, build=build)
+        self.assertEqual(len(calls), 1)
+        self.assertFalse(a.cached)
+        self.assertTrue(b.cached)
+        asm.static("longRAG", version=2, build=build)
+        self.assertEqual(len(calls), 2)
+
+    def test_render_orders_sections_and_skips_empty(self) -> None:
+        asm = ContextAssembler()
+        text = asm.render(
+            [
+                asm.dynamic("short_term", "User: hi"),
+                asm.static("shortRAG", version=0, build=lambda: ""),
+                asm.dynamic("long_term_search", "- doc: hit", keep="head"),
+            ]
+        )
+        self.assertEqual(text, "[short_term]\nUser: hi\n\n[long_term_search]\n- doc: hit")
+        self.assertEqual(asm.render([]), "no_rag")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from core.sqlite_pool import close_thread_connections  # noqa: E402
+from rag.conversation_store import ConversationStore  # noqa: E402
+from rag.short_term.memory import ShortTermMemory  # noqa: E402
+from rag.turns_store import TurnsStore  # noqa: E402
+
+
+class TestConversationStore(unittest.TestCase):
+    def tearDown(self) -> None:
+        close_thread_connections()
+
+    def test_views_derive_from_one_message_log(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db = Path(td) / "rag" / "conversation.sqlite"
+            conv = ConversationStore(db_path=db)
+            conv.append(role="user", text="こんにちは", run_id="r1", source="web")
+            conv.append(role="assistant", text="やあ", run_id="r1", source="llm")
+            conv.append(role="assistant", text="候補", run_id="p1", source="llm", in_context=False)
+
+            st = ShortTermMemory(events_path=Path(td) / "events.jsonl")
+            self.assertEqual(st.recent_text(max_events=10), "[user] こんにちは\n[assistant] やあ")
+
+            turns = TurnsStore(db_path=db).list(limit=10)
+            self.assertEqual(len(turns), 1)
+            self.assertEqual((turns[0]["user_text"], turns[0]["assistant_text"]), ("こんにちは", "やあ"))
+
+            self.assertTrue(TurnsStore(db_path=db).delete(row_id=turns[0]["id"]))
+            self.assertEqual(TurnsStore(db_path=db).list(limit=10), [])
+            # Forgotten messages stay in the chat export.
+            self.assertEqual([m["text"] for m in conv.iter_export()], ["こんにちは", "やあ", "候補"])
+
+    def test_ring_buffer_retention(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            conv = ConversationStore(db_path=Path(td) / "c.sqlite", max_messages=32)
+            for i in range(200):
+                conv.append(role="user", text=f"m{i}")
+            kept = list(conv.iter_export())
+            self.assertLessEqual(len(kept), 32 + conv._trim_every)
+            self.assertGreaterEqual(len(kept), 32)
+            self.assertEqual(kept[-1]["text"], "m199")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from core.event_store import EventStore, _segment_name  # noqa: E402
+
+
+def _ev(ts: str, run_id: str, source: str, typ: str, message: str) -> dict:
+    return {"ts": ts, "run_id": run_id, "source": source, "type": typ, "message": message, "payload": {}}
+
+
+class TestEventStore(unittest.TestCase):
+    def test_segment_name(self) -> None:
+        self.assertEqual(_segment_name("2026-10-17T04:33:40Z"), "20261017T04")
+
+    def test_query_by_run_source_and_time(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = EventStore(Path(td) / "events")
+            store.append(_ev("2026-10-17T04:59:59Z", "r1", "web", "input", "hello"))
+            store.append(_ev("2026-10-17T05:00:01Z", "r1", "llm", "timing", "llm_total"))
+            store.append(_ev("2026-10-17T05:00:02Z", "r2", "vlm", "decision", "screen A"))
+            store.append(_ev("2026-10-17T05:10:00Z", "r3", "vlm", "decision", "screen B"))
+            store.append(
+                {"ts": "2026-10-17T05:11:00Z", "source": "tts", "type": "timing", "payload": {"request_id": "r1"}}
+            )
+
+            self.assertEqual([e.get("message") for e in store.query(run_id="r1")][:2], ["hello", "llm_total"])
+            self.assertEqual(len(list(store.query(run_id="r1"))), 3)
+            latest = list(store.query(source="vlm", type="decision", limit=1, newest_first=True))
+            self.assertEqual(latest[0]["message"], "screen B")
+            ranged = list(store.query(since="2026-10-17T05:00:00Z", until="2026-10-17T05:05:00Z"))
+            self.assertEqual([e["message"] for e in ranged], ["llm_total", "screen A"])
+            segs = sorted(p.name for p in (Path(td) / "events" / "segments").iterdir())
+            self.assertEqual(segs, ["20261017T04.jsonl", "20261017T05.jsonl"])
+
+
+if __name__ == "__main__":
+    unittest.main()
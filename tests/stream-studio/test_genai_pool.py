@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from llm import genai_pool  # noqa: E402
+from llm.gemini_mvp import GeminiMVP  # noqa: E402
+
+
+class _FakeModels:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls = 0
+
+    def generate_content(self, **kwargs):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return SimpleNamespace(text="ok:" + str(kwargs.get("model")))
+
+
+class _FakeClient:
+    def __init__(self, api_key: str, delay: float = 0.0) -> None:
+        self.api_key = api_key
+        self.models = _FakeModels(delay)
+
+
+class TestGenAIPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.created = []
+        self.delay = 0.0
+
+        def factory(key: str) -> _FakeClient:
+            c = _FakeClient(key, self.delay)
+            self.created.append(c)
+            return c
+
+        genai_pool.set_client_factory(factory)
+
+    def tearDown(self) -> None:
+        genai_pool.set_client_factory(None)
+
+    def test_client_is_shared_per_key(self) -> None:
+        self.assertIsNone(genai_pool.get_genai_client(""))
+        a = genai_pool.get_genai_client("k1")
+        self.assertIs(a, genai_pool.get_genai_client(" k1 "))
+        self.assertIsNot(a, genai_pool.get_genai_client("k2"))
+        self.assertEqual(len(self.created), 2)
+
+    def test_gemini_calls_reuse_client_and_pool_threads(self) -> None:
+        llm = GeminiMVP(api_key="k1", model="m")
+        before = threading.active_count()
+        for _ in range(5):
+            self.assertEqual(llm.generate_text(prompt="hi"), "ok:m")
+        self.assertEqual(len(self.created), 1)
+        self.assertEqual(self.created[0].models.calls, 5)
+        self.assertLessEqual(threading.active_count(), before + 1)
+
+    def test_timeout_does_not_wait_for_hung_call(self) -> None:
+        self.delay = 0.5
+        t0 = time.perf_counter()
+        with self.assertRaises(concurrent.futures.TimeoutError):
+            genai_pool.generate_content("slow", timeout=0.05, model="m")
+        self.assertLess(time.perf_counter() - t0, 0.4)
+
+    def test_async_path_falls_back_to_pool(self) -> None:
+        resp = asyncio.run(genai_pool.agenerate_content("k1", timeout=2, model="m"))
+        self.assertEqual(resp.text, "ok:m")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from core.jsonl_index import JsonlOffsetIndex  # noqa: E402
+from core.storage import _tail_lines, tail_jsonl  # noqa: E402
+
+try:
+    import server.main as server_main
+except Exception as exc:  # pragma: no cover - environment dependency guard
+    server_main = None
+    _IMPORT_ERROR = exc
+else:
+    _IMPORT_ERROR = None
+
+
+def _write_events(path: Path, n: int, *, start: int = 0) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        for i in range(start, start + n):
+            src = "vlm" if i % 10 == 0 else "web"
+            f.write(json.dumps({"i": i, "source": src, "message": f"m{i} "}, ensure_ascii=False) + "\n")
+
+
+class TestTailJsonl(unittest.TestCase):
+    def test_tail_matches_full_read(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "events.jsonl"
+            _write_events(path, 500)
+            self.assertEqual([e["i"] for e in tail_jsonl(path, 3)], [497, 498, 499])
+            self.assertEqual(len(tail_jsonl(path, 10_000)), 500)
+            # Tiny blocks exercise the partial-first-line handling.
+            lines = _tail_lines(path, 7, block_size=16)
+            self.assertEqual([json.loads(x)["i"] for x in lines], list(range(493, 500)))
+            self.assertEqual(tail_jsonl(Path(td) / "missing.jsonl", 5), [])
+
+
+class TestJsonlOffsetIndex(unittest.TestCase):
+    def test_pages_and_source_tail(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "events.jsonl"
+            _write_events(path, 2500)
+            idx = JsonlOffsetIndex(path, stride=100)
+            self.assertEqual(idx.total_lines, 2500)
+            self.assertEqual([e["i"] for e in idx.read_lines(1234, 3)], [1234, 1235, 1236])
+            self.assertEqual([e["i"] for e in idx.tail_where(3, source="vlm")], [2470, 2480, 2490])
+
+            # Incremental refresh picks up appended lines; sidecar is reused.
+            _write_events(path, 5, start=2500)
+            again = JsonlOffsetIndex(path, stride=100)
+            self.assertEqual(again.indexed_lines, 2500)
+            self.assertEqual([e["i"] for e in again.tail_where(1, source="vlm")], [2500])
+            self.assertEqual(again.indexed_lines, 2505)
+
+    def test_rotated_file_is_reindexed(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "events.jsonl"
+            _write_events(path, 300)
+            idx = JsonlOffsetIndex(path, stride=50)
+            self.assertEqual(idx.total_lines, 300)
+            path.unlink()
+            _write_events(path, 20, start=9000)
+            self.assertEqual(idx.total_lines, 20)
+            self.assertEqual(idx.read_lines(0, 1)[0]["i"], 9000)
+
+
+
+class TestLatestVlmSummary(unittest.TestCase):
+    def test_only_recent_events_count(self) -> None:
+        if server_main is None:
+            raise unittest.SkipTest(f"server import failed: {_IMPORT_ERROR}")
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "events.jsonl"
+            _write_events(path, 500)
+            self.assertEqual(server_main._get_latest_vlm_summary(path), "m490")
+            with path.open("a", encoding="utf-8") as f:
+                for i in range(300):
+                    f.write(json.dumps({"i": 500 + i, "source": "web", "message": "x"}) + "\n")
+            # The last VLM summary is 300 events old: not current any more.
+            self.assertEqual(server_main._get_latest_vlm_summary(path), "")
+            self.assertFalse((Path(td) / "events.jsonl.idx").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
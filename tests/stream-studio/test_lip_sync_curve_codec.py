@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+import numpy as np
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from lip_sync.curve import LipSyncCurve  # noqa: E402
+from lip_sync.curve_codec import decode_curve, encode_curve, iter_binary_chunks  # noqa: E402
+
+
+def _curve(n: int = 600) -> LipSyncCurve:
+    rng = np.random.default_rng(7)
+    series = {
+        "mouth_open": rng.random(n).tolist(),
+        "mouth_form": (rng.random(n) * 2 - 1).tolist(),
+        "smile": [0.15] * n,
+    }
+    for k in "aiueo":
+        series[f"vowel_{k}"] = rng.random(n).tolist()
+    return LipSyncCurve(fps=60, duration_ms=int(n * 1000 / 60), mode="phoneme", series=series, meta={})
+
+
+class TestCurveCodec(unittest.TestCase):
+    def _assert_close(self, a: LipSyncCurve, b: LipSyncCurve, tol: float) -> None:
+        self.assertEqual(list(a.series), list(b.series))
+        for k, v in a.series.items():
+            np.testing.assert_allclose(b.series[k], v, atol=tol)
+
+    def test_u8_round_trip_is_small_and_close(self) -> None:
+        c = _curve()
+        data = encode_curve(c, encoding="u8")
+        back = decode_curve(data)
+        self.assertEqual((back.fps, back.duration_ms), (c.fps, c.duration_ms))
+        # mouth_form spans [-1, 1], so one step is 2/255.
+        self._assert_close(c, back, tol=1.0 / 255.0 + 1e-9)
+        self.assertLess(len(data) * 10, len(json.dumps(c.to_json_dict())))
+
+    def test_f16_round_trip(self) -> None:
+        c = _curve()
+        self._assert_close(c, decode_curve(encode_curve(c, encoding="f16")), tol=1e-3)
+
+    def test_stream_prefix_decodes_complete_frames(self) -> None:
+        c = _curve()
+        chunks = list(iter_binary_chunks(c, encoding="u8", chunk_frames=100))
+        self.assertEqual(len(chunks), 1 + 6)
+        partial = b"".join(chunks[:3]) + chunks[3][:5]
+        back = decode_curve(partial)
+        self.assertEqual(len(back.series["mouth_open"]), 200)
+        np.testing.assert_allclose(back.series["vowel_a"], c.series["vowel_a"][:200], atol=1.0 / 255.0)
+
+    def test_write_binary_and_errors(self) -> None:
+        c = _curve(10)
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "seg" / "001.lipsync.bin"
+            c.write_binary(p, encoding="f16")
+            self.assertEqual(p.read_bytes(), encode_curve(c, encoding="f16"))
+        with self.assertRaises(ValueError):
+            iter_binary_chunks(c, encoding="f32")
+        with self.assertRaises(ValueError):
+            decode_curve(b"JSON" + bytes(32))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import math
+import sys
+import time
+from pathlib import Path
+import unittest
+
+import numpy as np
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from lip_sync.aligner import PhonemeEvent  # noqa: E402
+from lip_sync.curve import (  # noqa: E402
+    _attack_release_filter_many,
+    _paint_intervals,
+    build_curve_from_timeline,
+    rms_envelope,
+)
+from lip_sync.mapper import LipSyncMapper, MouthPose, VisemeEvent  # noqa: E402
+
+
+def _mapper() -> LipSyncMapper:
+    return LipSyncMapper(
+        vowel_map={
+            "a": MouthPose(mouth_open=0.9, mouth_form=0.2),
+            "i": MouthPose(mouth_open=0.5, mouth_form=0.9),
+            "u": MouthPose(mouth_open=0.4, mouth_form=-0.7),
+            "e": MouthPose(mouth_open=0.6, mouth_form=0.6),
+            "o": MouthPose(mouth_open=0.8, mouth_form=-0.4),
+        },
+        closed_pose=MouthPose(mouth_open=0.05, mouth_form=0.0),
+    )
+
+
+def _scalar_filter(targets, fps, attack_ms, release_ms):
+    dt = 1000.0 / fps
+    a_up = 1.0 - math.exp(-dt / attack_ms)
+    a_dn = 1.0 - math.exp(-dt / release_ms)
+    cur = targets[0]
+    out = [cur]
+    for t in targets[1:]:
+        cur = cur + (t - cur) * (a_up if t >= cur else a_dn)
+        out.append(cur)
+    return out
+
+
+class TestCurveEngine(unittest.TestCase):
+    def test_paint_intervals_first_interval_wins(self) -> None:
+        times = np.arange(0, 100, 10)
+        got = _paint_intervals(times, np.array([20, 10, 70]), np.array([50, 40, 71]), fill=9)
+        self.assertEqual(got.tolist(), [9, 1, 0, 0, 0, 9, 9, 2, 9, 9])
+
+    def test_filter_many_matches_per_series(self) -> None:
+        rng = np.random.default_rng(3)
+        x = rng.random((4, 200))
+        got = _attack_release_filter_many(x, fps=60, attack_ms=45, release_ms=90)
+        for row, out in zip(x, got):
+            np.testing.assert_allclose(out, _scalar_filter(row.tolist(), 60, 45, 90))
+
+    def test_envelope_strided_matches_prefix_sum(self) -> None:
+        sr = 16000
+        x = (np.random.default_rng(0).standard_normal(sr + 123) * 0.2).astype(np.float32)
+        t1, e1 = rms_envelope(samples=x, sample_rate=sr, win_ms=30)  # whole hop blocks
+        t2, e2 = rms_envelope(samples=x, sample_rate=sr, win_ms=29)  # prefix-sum path
+        self.assertEqual(t1, t2)
+        self.assertEqual(t1[:3], [0, 10, 20])
+        win = int(sr * 0.03)
+        ref = np.sqrt(np.mean(x[160 : 160 + win].astype(np.float64) ** 2))
+        self.assertAlmostEqual(e1[1], min(1.0, max(0.0, (ref - 0.02) * 2.0)), places=5)
+        np.testing.assert_allclose(e1, e2, atol=0.05)
+
+    def test_visemes_hold_until_next_with_intensity(self) -> None:
+        curve = build_curve_from_timeline(
+            duration_ms=400,
+            fps=100,
+            mapper=_mapper(),
+            viseme_events=[VisemeEvent(200, "i"), VisemeEvent(100, "a", intensity=0.5)],
+            alpha_viseme_open=1.0,
+            attack_ms=1,
+            release_ms=1,
+        )
+        s = curve.series
+        self.assertEqual(curve.mode, "viseme")
+        self.assertAlmostEqual(s["mouth_open"][5], 0.05, places=3)
+        self.assertAlmostEqual(s["mouth_open"][15], 0.45, places=3)
+        self.assertAlmostEqual(s["vowel_i"][30], 0.5, places=3)
+        self.assertAlmostEqual(s["vowel_a"][30], 0.0, places=6)
+
+    def test_long_utterance_is_fast(self) -> None:
+        keys = ["a", "k", "i", "u", "e", "o"]
+        events = [PhonemeEvent(start_ms=i * 80, end_ms=i * 80 + 80, phoneme=keys[i % 6]) for i in range(375)]
+        sr = 24000
+        audio = ((np.random.default_rng(1).standard_normal(sr * 30) * 0.3).astype(np.float32), sr)
+        t0 = time.perf_counter()
+        curve = build_curve_from_timeline(
+            duration_ms=30000, fps=60, mapper=_mapper(), phoneme_events=events, envelope_audio=audio
+        )
+        dt = time.perf_counter() - t0
+        self.assertEqual(len(curve.series["mouth_open"]), 1800)
+        self.assertLess(dt, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from lip_sync import aligner  # noqa: E402
+
+
+def _edit_distance(a, b) -> int:
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        cur = [i]
+        for j, cb in enumerate(b, start=1):
+            cur.append(min(prev[j - 1] + (ca != cb), prev[j] + 1, cur[j - 1] + 1))
+        prev = cur
+    return prev[-1]
+
+
+def _mapping_cost(a, b, mapping) -> int:
+    used = [j for j in mapping if j is not None]
+    assert used == sorted(used) and len(set(used)) == len(used)
+    subs_or_dels = sum(1 for i, j in enumerate(mapping) if j is None or a[i] != b[j])
+    return subs_or_dels + (len(b) - len(used))
+
+
+class _CountingTokenizer:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def tokenize(self, text: str):
+        self.calls += 1
+        return [SimpleNamespace(surface=text, reading="カナ")]
+
+
+class TestReadingCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._saved = aligner._tokenizer
+        aligner.text_to_moras.cache_clear()
+
+    def tearDown(self) -> None:
+        aligner._tokenizer = self._saved
+        aligner.text_to_moras.cache_clear()
+
+    def test_tokenizer_is_shared_and_moras_memoized(self) -> None:
+        tok = _CountingTokenizer()
+        aligner._tokenizer = tok
+        self.assertIs(aligner._get_tokenizer(), tok)
+        self.assertEqual(aligner.text_to_moras("漢字"), ("カ", "ナ"))
+        self.assertEqual(aligner.text_to_moras("漢字"), ("カ", "ナ"))
+        self.assertEqual(tok.calls, 1)
+        self.assertEqual(aligner.text_to_moras.cache_info().hits, 1)
+
+    def test_missing_janome_falls_back_to_surface_kana(self) -> None:
+        aligner._tokenizer = False
+        self.assertIsNone(aligner._get_tokenizer())
+        self.assertEqual(aligner.text_to_kana(text="あいう、ABC"), "アイウ")
+
+
+class TestLinearMemoryAlignment(unittest.TestCase):
+    def test_identical_sequences_map_one_to_one(self) -> None:
+        a = list("アイウエオカキクケコ" * 20)
+        self.assertEqual(aligner._levenshtein_align(a, list(a)), list(range(len(a))))
+
+    def test_large_alignments_are_optimal(self) -> None:
+        rng = random.Random(5)
+        alpha = list("アイウエオカキ")
+        for _ in range(20):
+            a = [rng.choice(alpha) for _ in range(rng.randint(80, 160))]
+            b = list(a)
+            for _ in range(rng.randint(5, 25)):
+                k = rng.randrange(len(b))
+                r = rng.random()
+                if r < 0.33:
+                    b.insert(k, rng.choice(alpha))
+                elif r < 0.66:
+                    b.pop(k)
+                else:
+                    b[k] = rng.choice(alpha)
+            mapping = aligner._levenshtein_align(a, b)
+            self.assertEqual(len(mapping), len(a))
+            self.assertEqual(_mapping_cost(a, b, mapping), _edit_distance(a, b))
+
+    def test_edge_cases(self) -> None:
+        self.assertEqual(aligner._levenshtein_align([], ["ア"]), [])
+        self.assertEqual(aligner._levenshtein_align(["ア", "イ"], []), [None, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
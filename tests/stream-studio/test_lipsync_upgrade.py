@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from lip_sync.worker import submit_upgrade  # noqa: E402
+
+try:
+    import server.main as server_main
+except Exception as exc:  # pragma: no cover - environment dependency guard
+    server_main = None
+    _IMPORT_ERROR = exc
+else:
+    _IMPORT_ERROR = None
+
+
+class TestSubmitUpgrade(unittest.TestCase):
+    def test_ready_path_is_delivered(self) -> None:
+        got = []
+        fut = submit_upgrade(lambda: "/audio/x.aligned.lipsync.bin", got.append)
+        self.assertEqual(fut.result(timeout=2), "/audio/x.aligned.lipsync.bin")
+        self.assertEqual(got, ["/audio/x.aligned.lipsync.bin"])
+
+    def test_failures_never_reach_the_caller(self) -> None:
+        got = []
+
+        def _boom():
+            raise RuntimeError("aligner down")
+
+        self.assertIsNone(submit_upgrade(_boom, got.append).result(timeout=2))
+        self.assertIsNone(submit_upgrade(lambda: None, got.append).result(timeout=2))
+        self.assertEqual(got, [])
+
+
+class TestScheduleLipSyncUpgrade(unittest.TestCase):
+    def setUp(self) -> None:
+        if server_main is None:
+            raise unittest.SkipTest(f"server import failed: {_IMPORT_ERROR}")
+        self.td = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.td.name)
+
+    def tearDown(self) -> None:
+        self.td.cleanup()
+
+    def _wait_for(self, pred, timeout: float = 3.0) -> bool:
+        end = time.time() + timeout
+        while time.time() < end:
+            if pred():
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_aligned_curve_patches_published_segment(self) -> None:
+        store = server_main._stage_state(self.data_dir)
+        seg = {"idx": 1, "path": "/audio/segments/r1/001.wav", "lipsync_path": "/audio/segments/r1/001.lipsync.bin"}
+        store.replace({"tts_queue": [seg], "tts_queue_version": 5})
+        release = threading.Event()
+        calls = []
+
+        def _slow_generate(**kw):
+            calls.append(kw)
+            release.wait(2)
+            return "/audio/segments/r1/001.aligned.lipsync.bin"
+
+        def _apply(st, path):
+            for it in st["tts_queue"]:
+                if it["path"] == seg["path"]:
+                    it["lipsync_path"] = path
+
+        with mock.patch.object(server_main, "_lipsync_aligner_type", return_value="whisper"), mock.patch.object(
+            server_main, "_generate_lipsync_json_best_effort", side_effect=_slow_generate
+        ):
+            t0 = time.perf_counter()
+            scheduled = server_main._schedule_lipsync_upgrade(
+                data_dir=self.data_dir,
+                wav_path=self.data_dir / "001.wav",
+                text="こんにちは",
+                out_json_path=self.data_dir / "001.lipsync.json",
+                audio=None,
+                apply=_apply,
+            )
+            # Scheduling never waits for the aligner.
+            self.assertLess(time.perf_counter() - t0, 0.5)
+            self.assertTrue(scheduled)
+            self.assertEqual(store.get()["tts_queue"][0]["lipsync_path"], seg["lipsync_path"])
+            release.set()
+            ok = self._wait_for(lambda: store.get()["tts_queue"][0]["lipsync_path"].endswith(".aligned.lipsync.bin"))
+        self.assertTrue(ok)
+        self.assertEqual(calls[0]["out_json_path"].name, "001.aligned.lipsync.json")
+        self.assertEqual(store.get()["tts_queue_version"], 5)
+
+    def test_legacy_upgrade_uses_per_run_audio_and_checks_version(self) -> None:
+        store = server_main._stage_state(self.data_dir)
+        store.replace({"tts_version": 1, "tts_lipsync_path": "/audio/tts_latest.lipsync.bin"})
+        release = threading.Event()
+        calls = []
+
+        def _slow_generate(**kw):
+            calls.append(kw)
+            release.wait(2)
+            return "/audio/" + kw["out_json_path"].name
+
+        wav = self.data_dir / "audio" / "run1.wav"
+        samples = (object(), 24000)
+        with mock.patch.object(server_main, "_lipsync_aligner_type", return_value="whisper"), mock.patch.object(
+            server_main, "_generate_lipsync_json_best_effort", side_effect=_slow_generate
+        ):
+            server_main._schedule_legacy_lipsync_upgrade(
+                data_dir=self.data_dir, wav_path=wav, text="x", audio=samples, state=store.get()
+            )
+            # A newer reply is published before the aligner finishes.
+            store.replace({"tts_version": 2, "tts_lipsync_path": "/audio/tts_latest.lipsync.bin"})
+            release.set()
+            self.assertTrue(self._wait_for(lambda: len(calls) == 1))
+            time.sleep(0.1)
+        self.assertEqual(calls[0]["wav_path"], wav)
+        self.assertIs(calls[0]["audio"], samples)
+        self.assertEqual(calls[0]["out_json_path"].name, "run1.aligned.lipsync.json")
+        self.assertEqual(store.get()["tts_lipsync_path"], "/audio/tts_latest.lipsync.bin")
+
+    def test_no_aligner_means_provisional_is_final(self) -> None:
+        with mock.patch.object(server_main, "_lipsync_aligner_type", return_value="none"):
+            self.assertFalse(
+                server_main._schedule_lipsync_upgrade(
+                    data_dir=self.data_dir,
+                    wav_path=self.data_dir / "a.wav",
+                    text="x",
+                    out_json_path=self.data_dir / "a.lipsync.json",
+                    audio=None,
+                    apply=lambda st, path: None,
+                )
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from llm import genai_pool  # noqa: E402
+from llm.gemini_mvp import GeminiMVP  # noqa: E402
+from llm.streaming import (  # noqa: E402
+    LeadingSpeechFilter,
+    SentenceSegmenter,
+    StreamingReplyParser,
+    clamp_reply_text,
+    split_sentences,
+)
+
+
+def _chunks(text: str, n: int):
+    return [text[i : i + n] for i in range(0, len(text), n)]
+
+
+class TestStreamingReplyParser(unittest.TestCase):
+    def test_json_speech_is_decoded_incrementally(self) -> None:
+        reply = {
+            "speech_text": "こんにちは、\"みんな\"！\n今日もよろしく。",
+            "overlay_text": "挨拶",
+            "emotion": "happy",
+            "motion_tags": ["wave", "nod"],
+        }
+        src = "```json\n" + json.dumps(reply, ensure_ascii=True) + "\n```"
+        p = StreamingReplyParser()
+        got = "".join(p.feed(c) for c in _chunks(src, 5))
+        self.assertEqual(got, reply["speech_text"])
+        tail, fields = p.finish()
+        self.assertEqual(tail, "")
+        self.assertEqual(fields["overlay_text"], "挨拶")
+        self.assertEqual(fields["motion_tags"], ["wave", "nod"])
+
+    def test_speech_available_before_object_closes(self) -> None:
+        p = StreamingReplyParser()
+        self.assertEqual(p.feed('{"overlay_text": "x", "speech_text": "前半。'), "前半。")
+        self.assertEqual(p.feed("後半"), "後半")
+
+    def test_truncated_json_keeps_readable_fields(self) -> None:
+        p = StreamingReplyParser()
+        p.feed('{"speech_text": "途中まで", "overlay_text": "ov", "motion_tags": ["nod", "sm')
+        _tail, fields = p.finish()
+        self.assertEqual(fields["speech_text"], "途中まで")
+        self.assertEqual(fields["overlay_text"], "ov")
+        self.assertEqual(fields["motion_tags"], ["nod"])
+
+    def test_plain_text_reply(self) -> None:
+        p = StreamingReplyParser()
+        got = "".join(p.feed(c) for c in ["  やあ", "、元気？"])
+        self.assertEqual(got, "やあ、元気？")
+        self.assertEqual(p.finish()[1]["speech_text"], "やあ、元気？")
+
+
+    def test_clamp_applies_llmout_limits(self) -> None:
+        speech, overlay = clamp_reply_text("あ" * 1500, "o" * 300)
+        self.assertEqual((len(speech), len(overlay)), (1000, 120))
+        speech, overlay = clamp_reply_text("  短い返事。 ", "")
+        self.assertEqual((speech, overlay), ("短い返事。", "短い返事。"))
+        self.assertEqual(clamp_reply_text("x" * 500, " ")[1], "x" * 120)
+
+class TestSegmentation(unittest.TestCase):
+    def test_segmenter_matches_batch_split(self) -> None:
+        text = "一文目です。二文目！三つ目、最後"
+        seg = SentenceSegmenter()
+        out = []
+        for c in _chunks(text, 2):
+            out.extend(seg.feed(c))
+        out.extend(seg.flush())
+        sents, rem = split_sentences(text)
+        self.assertEqual(out, sents + [rem])
+
+    def test_leading_filter_drops_ack_and_echoed_prompt(self) -> None:
+        f = LeadingSpeechFilter(system_prompt="あなたは配信者です。")
+        parts = ["了解", "です。", "あなたは配", "信者です。", "こんに", "ちは"]
+        self.assertEqual("".join(f.feed(p) for p in parts) + f.flush(), "こんにちは")
+
+    def test_leading_filter_releases_partial_prefix_at_end(self) -> None:
+        f = LeadingSpeechFilter()
+        self.assertEqual(f.feed("はい"), "")
+        self.assertEqual(f.flush(), "はい")
+
+
+class _StreamingModels:
+    def __init__(self, chunks, delay: float) -> None:
+        self.chunks = chunks
+        self.delay = delay
+        self.kwargs = None
+
+    def generate_content_stream(self, **kwargs):
+        self.kwargs = kwargs
+        for c in self.chunks:
+            time.sleep(self.delay)
+            yield SimpleNamespace(text=c)
+
+
+class TestGenerateStream(unittest.TestCase):
+    def tearDown(self) -> None:
+        genai_pool.set_client_factory(None)
+
+    def test_first_sentence_arrives_before_stream_ends(self) -> None:
+        src = json.dumps({"speech_text": "一つ目。二つ目。三つ目。", "overlay_text": "o"}, ensure_ascii=False)
+        models = _StreamingModels(_chunks(src, 4), delay=0.02)
+        genai_pool.set_client_factory(lambda key: SimpleNamespace(models=models))
+        llm = GeminiMVP(api_key="k", model="m", system_prompt="sys")
+
+        parser = StreamingReplyParser()
+        seg = SentenceSegmenter()
+        t0 = time.perf_counter()
+        first_at = None
+        sents = []
+        for chunk in llm.generate_stream(user_text="hi", rag_context="", vlm_summary=""):
+            got = seg.feed(parser.feed(chunk))
+            if got and first_at is None:
+                first_at = time.perf_counter() - t0
+            sents.extend(got)
+        total = time.perf_counter() - t0
+        self.assertEqual(sents, ["一つ目。", "二つ目。", "三つ目。"])
+        self.assertIsNotNone(first_at)
+        self.assertLess(first_at, total * 0.7)
+        self.assertEqual(models.kwargs["config"]["system_instruction"], "sys")
+
+    def test_stream_failure_is_raised_to_consumer(self) -> None:
+        class _Boom:
+            def generate_content_stream(self, **kwargs):
+                yield SimpleNamespace(text="a")
+                raise RuntimeError("boom")
+
+        genai_pool.set_client_factory(lambda key: SimpleNamespace(models=_Boom()))
+        got = []
+        with self.assertRaises(RuntimeError):
+            for c in GeminiMVP(api_key="k", model="m", system_prompt="s").generate_stream(
+                user_text="x", rag_context="", vlm_summary=""
+            ):
+                got.append(c)
+        self.assertEqual(got, ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
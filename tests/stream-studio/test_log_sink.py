@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import gzip
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from core.log_sink import JsonlSink, LogSinkConfig, rotated_segments  # noqa: E402
+from core.storage import JsonlWriter, tail_jsonl  # noqa: E402
+
+
+class TestJsonlSink(unittest.TestCase):
+    def test_concurrent_appends_are_written_whole(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "events.jsonl"
+            sink = JsonlSink(path, LogSinkConfig(flush_interval_s=0.01))
+
+            def _worker(n: int) -> None:
+                for i in range(100):
+                    sink.append({"n": n, "i": i, "text": "テスト"})
+
+            threads = [threading.Thread(target=_worker, args=(n,)) for n in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertTrue(sink.flush())
+            rows = [json.loads(x) for x in path.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual(len(rows), 400)
+            self.assertEqual(sorted(r["i"] for r in rows if r["n"] == 2), list(range(100)))
+
+    def test_flush_waits_only_for_earlier_lines_under_steady_logging(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "events.jsonl"
+            sink = JsonlSink(path, LogSinkConfig(queue_size=1000, flush_interval_s=0.05, batch_max=8))
+            stop = threading.Event()
+
+            def _spam() -> None:
+                i = 0
+                while not stop.is_set():
+                    sink.append({"bg": i})
+                    i += 1
+
+            t = threading.Thread(target=_spam)
+            t.start()
+            try:
+                time.sleep(0.05)
+                while not sink.append({"marker": True}):
+                    time.sleep(0.001)
+                t0 = time.monotonic()
+                self.assertTrue(sink.flush(timeout=5.0))
+                self.assertLess(time.monotonic() - t0, 1.0)
+                self.assertIn('"marker"', path.read_text(encoding="utf-8"))
+            finally:
+                stop.set()
+                t.join()
+
+    def test_rotation_gzips_and_prunes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "events.jsonl"
+            cfg = LogSinkConfig(flush_interval_s=0.0, batch_max=1, rotate_max_bytes=200, rotate_keep=2)
+            sink = JsonlSink(path, cfg)
+            for i in range(20):
+                sink.append({"i": i, "pad": "x" * 80})
+                sink.flush()
+            deadline = time.monotonic() + 5.0
+            while time.monotonic() < deadline:
+                segs = rotated_segments(path)
+                if len(segs) <= 2 and all(p.name.endswith(".gz") for p in segs):
+                    break
+                time.sleep(0.02)
+            segs = rotated_segments(path)
+            self.assertEqual(len(segs), 2)
+            with gzip.open(segs[-1], "rt", encoding="utf-8") as f:
+                self.assertIn('"pad"', f.read())
+
+    def test_writer_uses_sink_and_tail_sees_queued_lines(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "events.jsonl"
+            JsonlWriter(path).append({"type": "timing", "i": 1})
+            JsonlWriter(path).append({"type": "timing", "i": 2})
+            self.assertEqual([r["i"] for r in tail_jsonl(path, 10)], [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
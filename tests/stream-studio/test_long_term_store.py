@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from core.sqlite_pool import close_thread_connections  # noqa: E402
+from rag.long_term.store import LongTermStore, build_match_query  # noqa: E402
+
+
+class TestBuildMatchQuery(unittest.TestCase):
+    def test_sanitizes_fts_syntax(self) -> None:
+        expr, terms, short = build_match_query('猫の名前は？ AND "tetris" NEAR(x')
+        self.assertIn('"猫の名"', expr)
+        self.assertIn('"tetris"', expr)
+        self.assertNotIn("NEAR(", expr)
+        self.assertIn("x", short)
+        self.assertEqual(len(terms), len(set(terms)))
+
+
+class TestLongTermStore(unittest.TestCase):
+    def tearDown(self) -> None:
+        close_thread_connections()
+
+    def test_japanese_search_ranked_with_snippet(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            lt = LongTermStore(db_path=Path(td) / "lt.sqlite")
+            lt.upsert(doc_id="cat", text="前置き。" * 100 + "飼い猫の名前はミケです。", source="t", created_at="1")
+            lt.upsert(doc_id="food", text="好きな食べ物はラーメンです。", source="t", created_at="2")
+            lt.upsert(doc_id="name", text="配信者の名前はアイです。", source="t", created_at="3")
+
+            hits = lt.search(query="猫の名前は？", limit=5)
+            self.assertEqual(hits[0][0], "cat")
+            self.assertIn("ミケ", hits[0][1])
+            self.assertLessEqual(len(hits[0][1]), 242)
+            self.assertNotIn("food", [h[0] for h in hits])
+
+            lt.upsert(doc_id="cat", text="猫はいません。", source="t", created_at="4")
+            self.assertEqual(lt.get(doc_id="cat")["text"], "猫はいません。")
+            self.assertTrue(lt.delete(doc_id="food"))
+            self.assertEqual(lt.search(query="ラーメン", limit=5), [])
+            self.assertEqual([h[0] for h in lt.search(query="猫", limit=5)], ["cat"])
+
+    def test_migrates_legacy_fts_table(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db = Path(td) / "lt.sqlite"
+            con = sqlite3.connect(str(db))
+            con.execute("CREATE VIRTUAL TABLE docs USING fts5(doc_id, text, source, created_at)")
+            con.execute("INSERT INTO docs VALUES('longRAG', 'テトリスの知識', 's', '1')")
+            con.commit()
+            con.close()
+
+            lt = LongTermStore(db_path=db)
+            self.assertEqual(lt.get(doc_id="longRAG")["text"], "テトリスの知識")
+            self.assertEqual(lt.search(query="テトリス", limit=3)[0][0], "longRAG")
+
+
+if __name__ == "__main__":
+    unittest.main()
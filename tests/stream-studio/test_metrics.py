@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from core.metrics import LatencyHistogram, MetricsRegistry  # noqa: E402
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_quantiles_within_bucket_error(self) -> None:
+        h = LatencyHistogram()
+        for ms in range(1, 1001):
+            h.record(ms)
+        self.assertEqual(h.total, 1000)
+        p95 = h.quantile(0.95)
+        self.assertGreaterEqual(p95, 950)
+        self.assertLessEqual(p95, 950 * 1.125)
+        self.assertEqual(h.quantile(1.0), 1000)
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_rolling_window_drops_old_samples(self) -> None:
+        m = MetricsRegistry(windows_s=(60,), slice_s=10.0)
+        m.observe_latency("tts_segment", 2000, provider="google", now=1000.0)
+        m.observe_latency("tts_segment", 100, provider="google", now=1100.0)
+        h = m._hist[(("phase", "tts_segment"), ("provider", "google"))]
+        self.assertEqual(h.window(60, 1100.0).total, 1)
+        self.assertEqual(h.cumulative.total, 2)
+
+    def test_prometheus_text(self) -> None:
+        m = MetricsRegistry()
+        m.observe_latency("llm_total", 800, provider="gemini")
+        m.inc("fallbacks_total", kind="tts_stub")
+        m.inc("fallbacks_total", kind="tts_stub")
+        text = m.render_prometheus()
+        self.assertIn("# TYPE aituber_phase_latency_ms histogram", text)
+        self.assertIn('aituber_phase_latency_ms_count{phase="llm_total",provider="gemini"} 1', text)
+        self.assertIn('aituber_phase_latency_ms_bucket{phase="llm_total",provider="gemini",le="+Inf"} 1', text)
+        self.assertIn('quantile="0.95",window="60s"', text)
+        self.assertIn('aituber_fallbacks_total{kind="tts_stub"} 2', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from core.pending_store import PendingStore  # noqa: E402
+from core.sqlite_pool import close_thread_connections  # noqa: E402
+from core.types import AssistantOutput, EventIn, PendingItem  # noqa: E402
+
+try:
+    import server.main as server_main
+except Exception as exc:  # pragma: no cover - environment dependency guard
+    server_main = None
+    _IMPORT_ERROR = exc
+else:
+    _IMPORT_ERROR = None
+
+
+def _item(i: int) -> PendingItem:
+    return PendingItem(
+        pending_id=f"p{i:03d}",
+        created_at=f"2026-10-17T00:00:{i:02d}Z",
+        event=EventIn(source="web", text=f"hello {i}"),
+        candidate=AssistantOutput(overlay_text=f"o{i}", speech_text=f"s{i}"),
+    )
+
+
+class TestPendingStore(unittest.TestCase):
+    def tearDown(self) -> None:
+        close_thread_connections()
+
+    def test_status_transitions_paging_and_retention(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = PendingStore(db_path=Path(td) / "pending.sqlite", keep_decided=2)
+            for i in range(6):
+                store.add(_item(i))
+
+            items, total = store.list(status="pending", limit=2, offset=2)
+            self.assertEqual(total, 6)
+            self.assertEqual([x["pending_id"] for x in items], ["p002", "p003"])
+
+            updated = store.update("p001", {"status": "rejected", "notes": "nope"})
+            self.assertEqual(updated.status, "rejected")
+            self.assertEqual(store.get("p001").notes, "nope")
+            self.assertIsNone(store.update("missing", {"status": "approved"}))
+
+            for pid in ("p002", "p003"):
+                store.update(pid, {"status": "approved"})
+            # Only the 2 most recent decided items are retained.
+            self.assertIsNone(store.get("p001"))
+            _, decided = store.list(status="approved")
+            self.assertEqual(decided, 2)
+            self.assertEqual(store.list(status="pending")[1], 3)
+
+    def test_default_listing_is_pending_items_past_many_decided(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = PendingStore(db_path=Path(td) / "pending.sqlite", keep_decided=500)
+            for i in range(250):
+                store.add(_item(i))
+                store.update(f"p{i:03d}", {"status": "approved"})
+            store.add(_item(999))
+
+            items, total = store.list()
+            self.assertEqual(total, 1)
+            self.assertEqual([x["pending_id"] for x in items], ["p999"])
+            self.assertEqual(store.list(status=None)[1], 251)
+
+    def test_endpoint_defaults_to_pending(self) -> None:
+        if server_main is None:
+            raise unittest.SkipTest(f"server import failed: {_IMPORT_ERROR}")
+        with tempfile.TemporaryDirectory() as td:
+            data_dir = Path(td)
+            store = server_main._pending_store(data_dir)
+            store.keep_decided = 500
+            for i in range(210):
+                store.add(_item(i))
+                store.update(f"p{i:03d}", {"status": "rejected"})
+            store.add(_item(999))
+
+            with mock.patch.object(server_main, "load_settings", return_value=SimpleNamespace(data_dir=data_dir)):
+                res = server_main.manager_pending()
+                self.assertTrue(res["ok"])
+                self.assertEqual([x["pending_id"] for x in res["items"]], ["p999"])
+                self.assertEqual(server_main.manager_pending(status="all", limit=1000)["total"], 211)
+                self.assertFalse(server_main.manager_pending(status="bogus")["ok"])
+
+    def test_imports_legacy_json_once(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            legacy = Path(td) / "pending.json"
+            legacy.write_text(
+                json.dumps({"items": [_item(1).model_dump(mode="json"), {"broken": True}]}),
+                encoding="utf-8",
+            )
+            store = PendingStore(db_path=Path(td) / "pending.sqlite")
+            self.assertEqual(store.import_legacy_json(legacy), 1)
+            self.assertFalse(legacy.exists())
+            self.assertEqual(store.get("p001").event.text, "hello 1")
+
+
+if __name__ == "__main__":
+    unittest.main()
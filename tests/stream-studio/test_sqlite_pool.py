@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+from pathlib import Path
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from core.sqlite_pool import close_thread_connections, ensure_schema, get_connection  # noqa: E402
+from rag.turns_store import TurnsStore  # noqa: E402
+
+
+class TestSqlitePool(unittest.TestCase):
+    def tearDown(self) -> None:
+        close_thread_connections()
+
+    def test_connection_reused_per_thread_in_wal_mode(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db = Path(td) / "a.sqlite"
+            con = get_connection(db)
+            self.assertIs(get_connection(db), con)
+            mode = con.execute("PRAGMA journal_mode").fetchone()[0]
+            self.assertEqual(str(mode).lower(), "wal")
+
+            other = []
+            t = threading.Thread(target=lambda: other.append(get_connection(db)))
+            t.start()
+            t.join()
+            self.assertIsNot(other[0], con)
+
+    def test_schema_created_once(self) -> None:
+        calls = []
+
+        def create(con) -> None:
+            calls.append(1)
+            con.execute("CREATE TABLE IF NOT EXISTS t(x INTEGER)")
+
+        with tempfile.TemporaryDirectory() as td:
+            db = Path(td) / "b.sqlite"
+            ensure_schema(db, "t", create)
+            ensure_schema(db, "t", create)
+            self.assertEqual(len(calls), 1)
+
+    def test_turns_store_roundtrip(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = TurnsStore(db_path=Path(td) / "turns.sqlite")
+            store.add_turn(user_text="hi", assistant_text="hello", created_at="2026-01-01T00:00:00Z", max_keep=10)
+            rows = store.list(limit=10)
+            self.assertEqual(len(rows), 1)
+            self.assertEqual(rows[0]["assistant_text"], "hello")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import tempfile
+import threading
+from pathlib import Path
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from core.state_store import VersionedStateStore  # noqa: E402
+from core.storage import read_json  # noqa: E402
+
+
+class TestVersionedStateStore(unittest.TestCase):
+    def test_versions_and_patches(self) -> None:
+        st = VersionedStateStore()
+        self.assertEqual(st.replace({"a": 1, "b": 2}), 1)
+        self.assertEqual(st.update({"b": 3}), 2)
+        # No-op updates do not bump the version.
+        self.assertEqual(st.update({"b": 3}), 2)
+        version, snap = st.snapshot()
+        self.assertEqual(version, 2)
+        self.assertEqual(snap, {"a": 1, "b": 3})
+        snap["a"] = 99
+        self.assertEqual(st.get()["a"], 1)
+
+    def test_concurrent_mutate_keeps_all_appends(self) -> None:
+        st = VersionedStateStore()
+        st.replace({"tts_queue": []})
+
+        def _worker(n: int) -> None:
+            for i in range(50):
+                st.mutate(lambda s, i=i: s["tts_queue"].append((n, i)))
+
+        threads = [threading.Thread(target=_worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(st.get()["tts_queue"]), 200)
+        self.assertEqual(st.version, 201)
+
+    def test_subscriber_receives_snapshot_and_patch(self) -> None:
+        st = VersionedStateStore()
+
+        async def _run() -> list:
+            q = st.subscribe()
+            st.replace({"x": 1})
+            await asyncio.to_thread(st.mutate, lambda s: s.pop("x") and s.update({"y": 2}))
+            msgs = [await asyncio.wait_for(q.get(), 1.0) for _ in range(2)]
+            st.unsubscribe(q)
+            return msgs
+
+        first, second = asyncio.run(_run())
+        self.assertEqual(first["type"], "snapshot")
+        self.assertEqual(first["state"], {"x": 1})
+        self.assertEqual(second["type"], "patch")
+        self.assertEqual(second["patch"], {"y": 2})
+        self.assertEqual(second["removed"], ["x"])
+        self.assertEqual(second["version"], 2)
+
+    def test_flush_writes_snapshot_file(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "state.json"
+            st = VersionedStateStore(path=path, flush_interval_s=10.0)
+            st.replace({"overlay_text": "hi"})
+            st.flush()
+            self.assertEqual(read_json(path), {"overlay_text": "hi"})
+            # Reloads from the snapshot file.
+            self.assertEqual(VersionedStateStore(path=path).get(), {"overlay_text": "hi"})
+
+
+if __name__ == "__main__":
+    unittest.main()
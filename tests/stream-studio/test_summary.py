@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from core.sqlite_pool import close_thread_connections  # noqa: E402
+from rag.conversation_store import ConversationStore  # noqa: E402
+from rag.short_term.memory import ShortTermMemory  # noqa: E402
+from rag.summary import ConversationSummarizer, llm_summarizer, stub_summarize  # noqa: E402
+from rag.turns_store import TurnsStore  # noqa: E402
+
+
+class TestConversationSummarizer(unittest.TestCase):
+    def tearDown(self) -> None:
+        close_thread_connections()
+
+    def test_prompt_stays_bounded_as_conversation_grows(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db = Path(td) / "rag" / "conversation.sqlite"
+            conv = ConversationStore(db_path=db)
+            summ = ConversationSummarizer(store=conv, keep_recent=4, min_batch=4, max_chars=200)
+            st = ShortTermMemory(events_path=Path(td) / "events.jsonl")
+            for i in range(60):
+                conv.append(role="user", text=f"質問{i}", run_id=f"r{i}")
+                conv.append(role="assistant", text=f"回答{i}", run_id=f"r{i}")
+                while summ.compact_once():
+                    pass
+            summary = st.summary_text()
+            self.assertTrue(summary)
+            self.assertLessEqual(len(summary), 200)
+            recent = st.recent_text(max_events=50).split("\n")
+            self.assertLessEqual(len(recent), 4 + 4)
+            self.assertEqual(recent[-1], "[assistant] 回答59")
+            turns_ctx = TurnsStore(db_path=db).get_prompt_context(turns_to_prompt=50)
+            self.assertNotIn("質問0", turns_ctx)
+
+    def test_below_min_batch_is_noop(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            conv = ConversationStore(db_path=Path(td) / "c.sqlite")
+            conv.append(role="user", text="hi")
+            self.assertFalse(ConversationSummarizer(store=conv, keep_recent=0, min_batch=2).compact_once())
+
+    def test_llm_summarizer_falls_back_to_stub(self) -> None:
+        fn = llm_summarizer(lambda **_: "")
+        self.assertEqual(fn("", ["[user] a"], 100), stub_summarize("", ["[user] a"], 100))
+        fn2 = llm_summarizer(lambda **_: "要約" * 100)
+        self.assertEqual(len(fn2("", ["[user] a"], 50)), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from core.tracing import TraceRecorder, get_tracer, record_span, span, trace_context  # noqa: E402
+
+
+class TestTracing(unittest.TestCase):
+    def test_nested_spans_across_threads(self) -> None:
+        rid = "req_trace_test"
+
+        def _worker() -> None:
+            with trace_context(rid), span("web_submit.worker"):
+                with span("tts.segment", idx=1):
+                    time.sleep(0.001)
+
+        with trace_context(rid), span("web_submit.request"):
+            t = threading.Thread(target=_worker, name="worker-x")
+            t.start()
+            t.join()
+        record_span("llm.total", start=time.perf_counter() - 0.01, end=time.perf_counter(), request_id=rid, provider="gemini")
+
+        trace = get_tracer().export_chrome(rid)
+        self.assertIsNotNone(trace)
+        spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        names = [e["name"] for e in spans]
+        self.assertEqual(set(names), {"web_submit.request", "web_submit.worker", "tts.segment", "llm.total"})
+        seg = next(e for e in spans if e["name"] == "tts.segment")
+        worker = next(e for e in spans if e["name"] == "web_submit.worker")
+        self.assertEqual(seg["tid"], worker["tid"])
+        self.assertEqual(seg["args"]["depth"], 1)
+        self.assertGreaterEqual(seg["ts"], worker["ts"])
+        self.assertLessEqual(seg["ts"] + seg["dur"], worker["ts"] + worker["dur"] + 1)
+        thread_names = {e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"}
+        self.assertIn("worker-x", thread_names)
+
+    def test_spans_without_request_are_dropped_and_lru_bounded(self) -> None:
+        rec = TraceRecorder(max_requests=2)
+        rec.add_span("", "x", start=0.0, end=1.0)
+        for rid in ("a", "b", "c"):
+            rec.add_span(rid, "x", start=0.0, end=1.0)
+        self.assertEqual(rec.request_ids(), ["c", "b"])
+        self.assertIsNone(rec.export_chrome("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from tts.cache import TTSCache, cache_key  # noqa: E402
+from tts.engine import TTSEngine  # noqa: E402
+from tts.service import TTSService  # noqa: E402
+
+
+def _key(text: str, **kw) -> str:
+    args = dict(provider="google", voice="v", text=text, ssml=False, sample_rate_hz=24000, postprocess_version="p1")
+    args.update(kw)
+    return cache_key(**args)
+
+
+class _CountingService(TTSService):
+    calls = 0
+
+    def _synthesize_google_audio(self, *, text: str, out_path: Path, ssml: bool):
+        type(self).calls += 1
+        return TTSEngine(voice="stub").synthesize(text=text, out_wav_path=out_path, seconds=0.2), None
+
+
+class TestTTSCache(unittest.TestCase):
+    def test_key_covers_every_input(self) -> None:
+        base = _key("こんにちは")
+        self.assertEqual(base, _key("こんにちは"))
+        for variant in (
+            _key("こんばんは"),
+            _key("こんにちは", voice="w"),
+            _key("こんにちは", ssml=True),
+            _key("こんにちは", sample_rate_hz=16000),
+            _key("こんにちは", postprocess_version="p2"),
+            _key("こんにちは", provider="stub"),
+        ):
+            self.assertNotEqual(base, variant)
+
+    def test_repeated_phrase_is_served_from_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            cache = TTSCache(cache_dir=root / "cache")
+            svc = _CountingService(provider="google", voice="v", cache=cache)
+            _CountingService.calls = 0
+            a = root / "segments" / "r1" / "001.wav"
+            b = root / "segments" / "r2" / "001.wav"
+            self.assertEqual(svc.synthesize_with_meta(text="おはよう", out_path=a)[1:], ("google", None))
+            self.assertEqual(svc.synthesize_with_meta(text="おはよう", out_path=b)[1:], ("google", None))
+            self.assertEqual(_CountingService.calls, 1)
+            self.assertEqual(a.read_bytes(), b.read_bytes())
+            # Re-synthesizing into a linked path must not write through into the cache entry.
+            svc.cache = None
+            svc.synthesize_with_meta(text="別の文", out_path=b)
+            svc.cache = cache
+            self.assertEqual(cache.path_for(svc._cache_key(text="おはよう", ssml=False)).read_bytes(), a.read_bytes())
+
+    def test_lru_eviction_under_byte_budget_survives_reload(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            src = root / "src.wav"
+            src.write_bytes(b"x" * 100)
+            cache = TTSCache(cache_dir=root / "cache", max_bytes=250)
+            cache.put("aa01", src)
+            time.sleep(0.01)
+            cache.put("bb02", src)
+            time.sleep(0.01)
+            self.assertTrue(cache.get("aa01", root / "out1.wav"))  # aa01 becomes most recent
+            time.sleep(0.01)
+            cache.put("cc03", src)
+            self.assertFalse(cache.get("bb02", root / "out2.wav"))
+            self.assertEqual(len(cache), 2)
+            self.assertLessEqual(cache.total_bytes, 250)
+            # Evicted entries leave materialized copies untouched.
+            self.assertTrue((root / "out1.wav").exists())
+
+            reloaded = TTSCache(cache_dir=root / "cache", max_bytes=150)
+            self.assertEqual(len(reloaded), 1)
+            self.assertTrue(reloaded.get("cc03", root / "out3.wav"))
+            self.assertFalse(os.path.exists(reloaded.path_for("aa01")))
+
+
+if __name__ == "__main__":
+    unittest.main()
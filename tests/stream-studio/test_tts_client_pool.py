@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from tts.client_pool import GoogleTTSClientPool  # noqa: E402
+
+try:
+    import server.main as server_main
+except Exception as exc:  # pragma: no cover - environment dependency guard
+    server_main = None
+    _IMPORT_ERROR = exc
+else:
+    _IMPORT_ERROR = None
+
+
+class ServiceUnavailable(Exception):
+    pass
+
+
+class _Client:
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self.broken = False
+
+
+class TestGoogleTTSClientPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.made = []
+
+        def factory() -> _Client:
+            c = _Client(len(self.made))
+            self.made.append(c)
+            return c
+
+        self.factory = factory
+
+    def test_clients_are_created_once_and_reused(self) -> None:
+        pool = GoogleTTSClientPool(size=2, factory=self.factory)
+        used = [pool.call(lambda c: c.n) for _ in range(10)]
+        self.assertEqual(len(self.made), 2)
+        self.assertEqual(sorted(set(used)), [0, 1])
+
+    def test_transport_error_reconnects_and_retries_once(self) -> None:
+        pool = GoogleTTSClientPool(size=1, factory=self.factory)
+        pool.call(lambda c: None)
+
+        def fn(c: _Client) -> int:
+            if c.n == 0:
+                raise ServiceUnavailable("channel closed")
+            return c.n
+
+        self.assertEqual(pool.call(fn), 1)
+        self.assertEqual(len(self.made), 2)
+        self.assertEqual(pool.call(lambda c: c.n), 1)
+
+    def test_other_errors_propagate_without_reconnect(self) -> None:
+        pool = GoogleTTSClientPool(size=1, factory=self.factory)
+        with self.assertRaises(ValueError):
+            pool.call(lambda c: (_ for _ in ()).throw(ValueError("bad voice")))
+        pool.call(lambda c: None)
+        self.assertEqual(len(self.made), 1)
+
+    def test_warm_up_is_best_effort(self) -> None:
+        def failing_factory():
+            raise RuntimeError("no credentials")
+
+        self.assertIsNone(GoogleTTSClientPool(factory=failing_factory).warm_up())
+
+
+
+class TestStartupWarmUpGate(unittest.TestCase):
+    def setUp(self) -> None:
+        if server_main is None:
+            raise unittest.SkipTest(f"server import failed: {_IMPORT_ERROR}")
+
+    def test_follows_resolved_provider_not_app_yaml(self) -> None:
+        appcfg = {"tts": {"provider": "google", "warm_up": True}}
+        gate = server_main._should_warm_up_google_tts
+        # e.g. AITUBER_TTS_PROVIDER=stub overrides the YAML provider.
+        self.assertFalse(gate(settings=SimpleNamespace(tts_provider="stub"), appcfg=appcfg))
+        self.assertTrue(gate(settings=SimpleNamespace(tts_provider="Google"), appcfg={}))
+        self.assertFalse(gate(settings=SimpleNamespace(tts_provider="google"), appcfg={"tts": {"warm_up": False}}))
+
+
+if __name__ == "__main__":
+    unittest.main()
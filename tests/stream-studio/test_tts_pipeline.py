@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from tts.pipeline import OrderedSegmentPipeline, configure_provider_limits, provider_slot  # noqa: E402
+
+
+class TestOrderedSegmentPipeline(unittest.TestCase):
+    def test_publishes_in_order_despite_out_of_order_completion(self) -> None:
+        published = []
+        delays = {1: 0.12, 2: 0.01, 3: 0.05, 4: 0.0, 5: 0.03}
+
+        def work(idx: int, text: str):
+            time.sleep(delays[idx])
+            return {"idx": idx, "text": text}
+
+        p = OrderedSegmentPipeline(work=work, publish=published.append, max_in_flight=3)
+        for i in range(1, 6):
+            p.submit(f"s{i}")
+        p.close()
+        self.assertEqual([x["idx"] for x in published], [1, 2, 3, 4, 5])
+
+    def test_latency_approaches_slowest_segment(self) -> None:
+        published = []
+        p = OrderedSegmentPipeline(work=lambda i, t: (time.sleep(0.1), {"idx": i})[1], publish=published.append, max_in_flight=4)
+        t0 = time.perf_counter()
+        for i in range(4):
+            p.submit(str(i))
+        p.close()
+        self.assertLess(time.perf_counter() - t0, 0.3)
+        self.assertEqual(len(published), 4)
+
+    def test_in_flight_bound_and_failed_segments_skipped(self) -> None:
+        lock = threading.Lock()
+        state = {"now": 0, "peak": 0}
+        published = []
+
+        def work(idx: int, text: str):
+            with lock:
+                state["now"] += 1
+                state["peak"] = max(state["peak"], state["now"])
+            time.sleep(random.uniform(0.0, 0.02))
+            with lock:
+                state["now"] -= 1
+            if idx == 3:
+                raise RuntimeError("synthesis failed")
+            return None if idx == 5 else {"idx": idx}
+
+        p = OrderedSegmentPipeline(work=work, publish=published.append, max_in_flight=2)
+        for i in range(8):
+            p.submit(str(i))
+        p.close()
+        self.assertLessEqual(state["peak"], 2)
+        self.assertEqual([x["idx"] for x in published], [1, 2, 4, 6, 7, 8])
+
+    def test_provider_slot_limits_concurrency(self) -> None:
+        configure_provider_limits({"unit_test_provider": 1})
+        lock = threading.Lock()
+        state = {"now": 0, "peak": 0}
+
+        def call() -> None:
+            with provider_slot("unit_test_provider"):
+                with lock:
+                    state["now"] += 1
+                    state["peak"] = max(state["peak"], state["now"])
+                time.sleep(0.01)
+                with lock:
+                    state["now"] -= 1
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(state["peak"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
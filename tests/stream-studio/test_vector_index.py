@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from core.sqlite_pool import close_thread_connections  # noqa: E402
+from rag.items_store import RagItemsStore  # noqa: E402
+from rag.vector_index import HashingEncoder, VectorIndex, estimate_tokens  # noqa: E402
+
+
+class TestVectorIndex(unittest.TestCase):
+    def tearDown(self) -> None:
+        close_thread_connections()
+
+    def test_encoder_is_stable_and_normalized(self) -> None:
+        enc = HashingEncoder(dim=128)
+        a = enc.encode("今日はテトリスの配信です")
+        b = enc.encode("今日はテトリスの配信です")
+        self.assertTrue((a == b).all())
+        self.assertAlmostEqual(float((a * a).sum()), 1.0, places=5)
+
+    def test_relevant_items_and_incremental_updates(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = RagItemsStore(db_path=Path(td) / "rag_items.sqlite")
+            ids = {}
+            ids["tetris"] = store.add(rag_type="long", title="テトリス", text="テトリスの得意技はTスピンです。", created_at="t")
+            ids["cat"] = store.add(rag_type="long", title="猫", text="飼い猫の名前はミケです。", created_at="t")
+            for i in range(30):
+                store.add(rag_type="long", title=f"メモ{i}", text=f"無関係な話題 {i} 番目の料理レシピ", created_at="t")
+
+            text = store.get_relevant_text(rag_type="long", query="猫の名前は？", top_k=3, token_budget=1000)
+            self.assertIn("ミケ", text)
+            self.assertNotIn("Tスピン", text)
+
+            store.delete(row_id=ids["cat"])
+            text = store.get_relevant_text(rag_type="long", query="猫の名前は？", top_k=3, token_budget=1000)
+            self.assertNotIn("ミケ", text)
+
+            small = store.get_relevant_text(rag_type="long", query="テトリス", top_k=10, token_budget=40)
+            self.assertLessEqual(estimate_tokens(small), 40)
+
+    def test_backfills_items_written_before_index(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db = Path(td) / "rag_items.sqlite"
+            store = RagItemsStore(db_path=db)
+            store.add(rag_type="short", title="", text="今日のゲストは山田さん", created_at="t")
+            fresh = VectorIndex(db, encoder=HashingEncoder(dim=64))
+            self.assertEqual(fresh.count("short"), 1)
+            self.assertEqual(len(fresh.search("山田さん", rag_type="short", k=5)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
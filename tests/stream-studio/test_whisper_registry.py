@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+import unittest
+
+APP_ROOT = Path(__file__).resolve().parents[2] / "apps" / "stream-studio"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from lip_sync.aligner import WhisperAligner  # noqa: E402
+from stt import whisper_service  # noqa: E402
+from stt.whisper_service import WhisperConfig, get_model  # noqa: E402
+
+
+class _FakeModel:
+    def __init__(self, cfg: WhisperConfig) -> None:
+        self.cfg = cfg
+        self.transcribed = []
+
+    def transcribe(self, path, **kwargs):
+        self.transcribed.append((path, kwargs))
+        words = [
+            SimpleNamespace(start=0.0, end=0.2, word="アイ"),
+            SimpleNamespace(start=0.2, end=0.4, word="ウエ"),
+        ]
+        return iter([SimpleNamespace(start=0.0, end=0.4, text="アイウエ", words=words)]), None
+
+
+class _Loader:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.loads = []
+        self._lock = threading.Lock()
+
+    def __call__(self, cfg: WhisperConfig) -> _FakeModel:
+        time.sleep(self.delay)
+        with self._lock:
+            self.loads.append(whisper_service.model_key(cfg))
+        return _FakeModel(cfg)
+
+
+class TestWhisperRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loader = _Loader()
+        whisper_service.set_model_loader(self.loader)
+
+    def tearDown(self) -> None:
+        whisper_service.set_model_loader(None)
+
+    def test_models_are_shared_across_languages_and_callers(self) -> None:
+        a = get_model(WhisperConfig(model="small", device="cpu", compute_type="int8", language="ja"))
+        b = get_model(WhisperConfig(model="small", device="cpu", compute_type="int8", language="en"))
+        c = get_model(WhisperConfig(model="small", device="cpu", compute_type="float32"))
+        self.assertIs(a, b)
+        self.assertIsNot(a, c)
+        self.assertEqual(len(self.loader.loads), 2)
+
+    def test_concurrent_first_use_loads_once(self) -> None:
+        self.loader.delay = 0.05
+        cfg = WhisperConfig(model="base")
+        got = []
+        threads = [threading.Thread(target=lambda: got.append(get_model(cfg))) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(self.loader.loads), 1)
+        self.assertTrue(all(m is got[0] for m in got))
+
+    def test_least_recently_used_model_is_dropped(self) -> None:
+        limit = whisper_service._MAX_MODELS
+        cfgs = [WhisperConfig(model=f"m{i}") for i in range(limit + 1)]
+        for cfg in cfgs:
+            get_model(cfg)
+        get_model(cfgs[-1])
+        self.assertEqual(len(self.loader.loads), limit + 1)
+        get_model(cfgs[0])
+        self.assertEqual(len(self.loader.loads), limit + 2)
+
+
+class TestAlignMany(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loader = _Loader()
+        whisper_service.set_model_loader(self.loader)
+
+    def tearDown(self) -> None:
+        whisper_service.set_model_loader(None)
+
+    def test_align_many_reuses_one_model(self) -> None:
+        aligner = WhisperAligner(model_size="tiny", compute_type="int8")
+        with tempfile.TemporaryDirectory() as td:
+            wavs = []
+            for i in range(3):
+                p = Path(td) / f"{i:03d}.wav"
+                p.write_bytes(b"RIFF")
+                wavs.append(p)
+            wavs.append(Path(td) / "missing.wav")
+            out = aligner.align_many(wavs, ["アイウエ"] * 4)
+            single = WhisperAligner(model_size="tiny", compute_type="int8").align(audio_wav_path=wavs[0], text="アイウエ")
+        self.assertEqual(len(out), 4)
+        self.assertEqual([e.phoneme for e in out[0]], ["a", "i", "u", "e"])
+        self.assertEqual(out[3], [])
+        self.assertEqual([e.phoneme for e in single], ["a", "i", "u", "e"])
+        self.assertEqual(self.loader.loads, [("tiny", "auto", "int8")])
+
+    def test_align_many_requires_matching_lengths(self) -> None:
+        with self.assertRaises(ValueError):
+            WhisperAligner().align_many([Path("a.wav")], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
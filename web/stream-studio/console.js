@@ -649,10 +649,45 @@
     return new Promise((resolve) => setTimeout(resolve, ms));
   }
 
+  // State push (/state/stream): wakes pollForStateChange as soon as the server
+  // updates state. Falls back to fixed-interval polling while disconnected.
+  let stateStreamLive = false;
+  let stateWaiters = [];
+
+  function connectStateStream() {
+    if (typeof EventSource === 'undefined') return;
+    let es;
+    try {
+      es = new EventSource('/state/stream');
+    } catch {
+      return;
+    }
+    const wake = () => {
+      stateStreamLive = true;
+      const ws = stateWaiters;
+      stateWaiters = [];
+      for (const w of ws) w();
+    };
+    es.addEventListener('snapshot', wake);
+    es.addEventListener('patch', wake);
+    es.onerror = () => {
+      stateStreamLive = false;
+    };
+  }
+
+  function waitForStatePush(fallbackMs) {
+    if (!stateStreamLive) return sleep(fallbackMs);
+    return new Promise((resolve) => {
+      stateWaiters.push(resolve);
+      // Safety net in case the stream stalls without an error event.
+      setTimeout(resolve, 2000);
+    });
+  }
+
   async function pollForStateChange(prevRunId, prevVersion, trace) {
     const started = Date.now();
     while (Date.now() - started < 15000) {
-      await sleep(250);
+      await waitForStatePush(250);
       try {
         const j = await jsonFetch('/state', { method: 'GET' });
         const st = j && j.ok ? j.state || {} : {};
@@ -1724,6 +1759,7 @@
   async function main() {
     loadPrefs();
     await loadAllSettings();
+    connectStateStream();
 
     if (el.llmModelAddBtn) {
       el.llmModelAddBtn.onclick = () => {
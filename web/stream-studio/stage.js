@@ -644,6 +644,11 @@
       return x;
     }
 
+    // Curve series are plain arrays (JSON) or Float32Arrays (binary LSC1).
+    function isSeries(a) {
+      return Array.isArray(a) || a instanceof Float32Array;
+    }
+
     function sampleCurve(curve, tMs) {
       if (!curve || !curve.series) return null;
       const fps = Number(curve.fps || LIPSYNC_FPS_DEFAULT) || LIPSYNC_FPS_DEFAULT;
@@ -655,21 +660,21 @@
       if (idx > maxIdx) idx = maxIdx;
 
       const s = curve.series;
-      const open = Array.isArray(s.mouth_open) ? Number(s.mouth_open[Math.min(idx, s.mouth_open.length - 1)] || 0) : 0;
-      const form = Array.isArray(s.mouth_form) ? Number(s.mouth_form[Math.min(idx, s.mouth_form.length - 1)] || 0) : 0;
-      const smile = Array.isArray(s.smile) ? Number(s.smile[Math.min(idx, s.smile.length - 1)] || 0) : 0;
+      const open = isSeries(s.mouth_open) ? Number(s.mouth_open[Math.min(idx, s.mouth_open.length - 1)] || 0) : 0;
+      const form = isSeries(s.mouth_form) ? Number(s.mouth_form[Math.min(idx, s.mouth_form.length - 1)] || 0) : 0;
+      const smile = isSeries(s.smile) ? Number(s.smile[Math.min(idx, s.smile.length - 1)] || 0) : 0;
       const hasVowelSeries =
-        Array.isArray(s.vowel_a) ||
-        Array.isArray(s.vowel_i) ||
-        Array.isArray(s.vowel_u) ||
-        Array.isArray(s.vowel_e) ||
-        Array.isArray(s.vowel_o);
-
-      let va = Array.isArray(s.vowel_a) ? Number(s.vowel_a[Math.min(idx, s.vowel_a.length - 1)] || 0) : 0;
-      let vi = Array.isArray(s.vowel_i) ? Number(s.vowel_i[Math.min(idx, s.vowel_i.length - 1)] || 0) : 0;
-      let vu = Array.isArray(s.vowel_u) ? Number(s.vowel_u[Math.min(idx, s.vowel_u.length - 1)] || 0) : 0;
-      let ve = Array.isArray(s.vowel_e) ? Number(s.vowel_e[Math.min(idx, s.vowel_e.length - 1)] || 0) : 0;
-      let vo = Array.isArray(s.vowel_o) ? Number(s.vowel_o[Math.min(idx, s.vowel_o.length - 1)] || 0) : 0;
+        isSeries(s.vowel_a) ||
+        isSeries(s.vowel_i) ||
+        isSeries(s.vowel_u) ||
+        isSeries(s.vowel_e) ||
+        isSeries(s.vowel_o);
+
+      let va = isSeries(s.vowel_a) ? Number(s.vowel_a[Math.min(idx, s.vowel_a.length - 1)] || 0) : 0;
+      let vi = isSeries(s.vowel_i) ? Number(s.vowel_i[Math.min(idx, s.vowel_i.length - 1)] || 0) : 0;
+      let vu = isSeries(s.vowel_u) ? Number(s.vowel_u[Math.min(idx, s.vowel_u.length - 1)] || 0) : 0;
+      let ve = isSeries(s.vowel_e) ? Number(s.vowel_e[Math.min(idx, s.vowel_e.length - 1)] || 0) : 0;
+      let vo = isSeries(s.vowel_o) ? Number(s.vowel_o[Math.min(idx, s.vowel_o.length - 1)] || 0) : 0;
 
       // Fallback for AIUEO-only models:
       // - If vowel series are missing, or present but effectively empty (e.g. envelope-only mode),
@@ -694,12 +699,79 @@
       };
     }
 
+    function halfToFloat(h) {
+      const sign = h & 0x8000 ? -1 : 1;
+      const exp = (h >> 10) & 0x1f;
+      const frac = h & 0x3ff;
+      if (exp === 0) return sign * Math.pow(2, -14) * (frac / 1024);
+      if (exp === 0x1f) return frac ? NaN : sign * Infinity;
+      return sign * Math.pow(2, exp - 15) * (1 + frac / 1024);
+    }
+
+    // Compact curve ("LSC1", see lip_sync/curve_codec.py): little-endian header,
+    // then frames interleaved across channels as uint8 (quantized) or float16.
+    function decodeLipSyncBinary(buf) {
+      const dv = new DataView(buf);
+      if (dv.byteLength < 20) return null;
+      if (String.fromCharCode(dv.getUint8(0), dv.getUint8(1), dv.getUint8(2), dv.getUint8(3)) !== 'LSC1') return null;
+      if (dv.getUint8(4) !== 1) return null;
+      const enc = dv.getUint8(5);
+      if (enc !== 1 && enc !== 2) return null;
+      const nCh = dv.getUint8(6);
+      const fps = dv.getUint16(8, true);
+      const headerLen = dv.getUint16(10, true);
+      const durationMs = dv.getUint32(12, true);
+      const nFramesDeclared = dv.getUint32(16, true);
+
+      const names = [];
+      const lo = [];
+      const hi = [];
+      let off = 20;
+      for (let c = 0; c < nCh; c++) {
+        lo.push(dv.getFloat32(off, true));
+        hi.push(dv.getFloat32(off + 4, true));
+        const len = dv.getUint8(off + 8);
+        off += 9;
+        names.push(new TextDecoder().decode(new Uint8Array(buf, off, len)));
+        off += len;
+      }
+
+      const bytesPerValue = enc === 1 ? 1 : 2;
+      const frameBytes = Math.max(1, nCh * bytesPerValue);
+      const nFrames = Math.max(0, Math.min(nFramesDeclared, Math.floor((dv.byteLength - headerLen) / frameBytes)));
+      const series = {};
+      const cols = names.map(() => new Float32Array(nFrames));
+      if (enc === 1) {
+        const q = new Uint8Array(buf, headerLen, nFrames * nCh);
+        for (let c = 0; c < nCh; c++) {
+          const col = cols[c];
+          const base = lo[c];
+          const scale = (hi[c] - lo[c]) / 255;
+          for (let i = 0, k = c; i < nFrames; i++, k += nCh) col[i] = base + q[k] * scale;
+        }
+      } else {
+        for (let i = 0; i < nFrames; i++) {
+          for (let c = 0; c < nCh; c++) cols[c][i] = halfToFloat(dv.getUint16(headerLen + (i * nCh + c) * 2, true));
+        }
+      }
+      names.forEach((n, c) => {
+        series[n] = cols[c];
+      });
+      return { version: 1, fps, duration_ms: durationMs, mode: 'binary', series };
+    }
+
     async function loadLipSyncCurve(url, versionKey) {
       const key = `${url}::${String(versionKey || '')}`;
       if (lipsyncCache.has(key)) return lipsyncCache.get(key);
       try {
-        const u = `${url}?v=${encodeURIComponent(String(versionKey || Date.now()))}`;
-        const j = await safeJsonFetch(u);
+        const s = String(url);
+        const u = `${s}${s.includes('?') ? '&' : '?'}v=${encodeURIComponent(String(versionKey || Date.now()))}`;
+        const res = await fetch(u, { cache: 'no-store' });
+        if (!res.ok) return null;
+        // LSC1 comes from *.lipsync.bin files and from /lipsync/bin/<path>.lipsync.json (converted on the fly).
+        const ctype = String(res.headers.get('content-type') || '');
+        const binary = /\.bin(\?|$)/i.test(s) || s.includes('/lipsync/bin/') || /octet-stream/i.test(ctype);
+        const j = binary ? decodeLipSyncBinary(await res.arrayBuffer()) : await res.json();
         if (!j || typeof j !== 'object' || !j.series) return null;
         lipsyncCache.set(key, j);
         return j;
@@ -1325,6 +1397,20 @@
     const playedSegs = new Set();
     let playing = false;
     let queued = [];
+    let currentSegPath = '';
+
+    // Audio is published with a provisional (envelope-only) curve; when the server
+    // finishes the aligned curve it updates lipsync_path. Swap it in mid-playback.
+    function upgradeLipSyncCurve(url, versionKey) {
+      if (!url || url === currentLipSyncUrl || url === pendingLipSyncUrl) return;
+      if (pendingLipSyncUrl) pendingLipSyncUrl = url;
+      if (!currentLipSyncUrl) return;
+      currentLipSyncUrl = url;
+      void (async () => {
+        const curve = await loadLipSyncCurve(url, versionKey);
+        if (curve && currentLipSyncUrl === url) currentCurve = curve;
+      })();
+    }
 
     function pickNextSegment() {
       // queued is an array of {idx, path, text}
@@ -1342,6 +1428,7 @@
       const v = it && it.idx != null ? it.idx : Date.now();
       const t0 = performance.now();
       playing = true;
+      currentSegPath = path;
       pendingLipSyncUrl = it && it.lipsync_path ? String(it.lipsync_path) : '';
       audioStartPerfMs = performance.now();
       audioEl.src = `${path}?v=${encodeURIComponent(String(v))}`;
@@ -1352,6 +1439,7 @@
         currentLipSyncUrl = url;
         void (async () => {
           const curve = await loadLipSyncCurve(url, v);
+          if (currentLipSyncUrl !== url) return;
           currentCurve = curve;
           if (!curve) setMouthNeutral();
         })();
@@ -1417,6 +1505,7 @@
             currentLipSyncUrl = url;
             void (async () => {
               const curve = await loadLipSyncCurve(url, v);
+              if (currentLipSyncUrl !== url) return;
               currentCurve = curve;
               if (!curve) setMouthNeutral();
             })();
@@ -1488,9 +1577,8 @@
         }
       }
     });
-    async function pollOverlay() {
+    async function applyOverlay(j) {
       try {
-        const j = await safeJsonFetch('/overlay_text');
         lastOverlayText = j.speech_text || j.overlay_text || '';
         if (overlayEl) overlayEl.textContent = lastOverlayText;
 
@@ -1505,11 +1593,18 @@
           animStartedForGroupId = 0;
         }
         if (queued && queued.length) ensurePlayback();
+        if (playing && currentSegPath) {
+          const cur = q.find((it) => it && String(it.path || '') === currentSegPath);
+          if (cur && cur.lipsync_path) upgradeLipSyncCurve(String(cur.lipsync_path), cur.idx);
+        }
 
         // Legacy single-file playback fallback
         const v = j.tts_version ?? null;
         const ttsPath = j.tts_path || '/audio/tts_latest.wav';
         const lipSyncPath = j.tts_lipsync_path || '';
+        if ((!q || !q.length) && v && v === lastTtsVersion && lipSyncPath) {
+          upgradeLipSyncCurve(String(lipSyncPath), v);
+        }
         if ((!q || !q.length) && v && v !== lastTtsVersion) {
           lastTtsVersion = v;
           ttsGroupId += 1;
@@ -1525,6 +1620,7 @@
             currentLipSyncUrl = url;
             void (async () => {
               const curve = await loadLipSyncCurve(url, v);
+              if (currentLipSyncUrl !== url) return;
               currentCurve = curve;
               if (!curve) setMouthNeutral();
             })();
@@ -1589,6 +1685,7 @@
                 currentLipSyncUrl = url;
                 void (async () => {
                   const curve = await loadLipSyncCurve(url, v);
+                  if (currentLipSyncUrl !== url) return;
                   currentCurve = curve;
                   if (!curve) setMouthNeutral();
                 })();
@@ -1607,23 +1704,95 @@
         }
       } catch {
         // ignore
+      }
+    }
+
+    // Live2D motion triggers
+    let lastSeq = 0;
+    function applyLive2D(st) {
+      const seq = Number(st.seq || 0);
+      if (seq && seq !== lastSeq) {
+        lastSeq = seq;
+        if (st.last_tag) {
+          playByTag(st.last_tag);
+        }
+      }
+    }
+
+    // Push delivery: /state/stream sends a snapshot then per-change patches.
+    // Polling below is only used while the stream is down.
+    let stateStreamLive = false;
+    let streamState = {};
+    let streamApplyChain = Promise.resolve();
+
+    function overlayFromState(st) {
+      return {
+        overlay_text: st.overlay_text || '',
+        speech_text: st.speech_text || '',
+        tts_path: st.tts_path || '',
+        tts_version: st.tts_version ?? null,
+        tts_queue: Array.isArray(st.tts_queue) ? st.tts_queue : [],
+        tts_queue_version: st.tts_queue_version ?? null,
+        tts_lipsync_path: st.tts_lipsync_path || '',
+      };
+    }
+
+    function onStateMessage(msg) {
+      if (!msg || typeof msg !== 'object') return;
+      if (msg.type === 'snapshot') {
+        streamState = msg.state && typeof msg.state === 'object' ? msg.state : {};
+      } else {
+        streamState = Object.assign({}, streamState, msg.patch || {});
+        for (const k of msg.removed || []) delete streamState[k];
+      }
+      const st = streamState;
+      const web = st.live2d_web || {};
+      applyLive2D({ seq: web.seq, last_tag: web.last_tag });
+      const legacy = (st.tts_version === undefined || st.tts_version === null) && String(st.tts_path || '').endsWith('/audio/tts_latest.wav');
+      streamApplyChain = streamApplyChain.then(async () => {
+        // The legacy tts_latest.wav version is derived server-side; fetch it once.
+        const j = legacy ? await safeJsonFetch('/overlay_text').catch(() => overlayFromState(st)) : overlayFromState(st);
+        await applyOverlay(j);
+      });
+    }
+
+    function connectStateStream() {
+      if (typeof EventSource === 'undefined') return;
+      let es;
+      try {
+        es = new EventSource('/state/stream');
+      } catch {
+        return;
+      }
+      const handler = (ev) => {
+        stateStreamLive = true;
+        try {
+          onStateMessage(JSON.parse(ev.data));
+        } catch {
+          // ignore
+        }
+      };
+      es.addEventListener('snapshot', handler);
+      es.addEventListener('patch', handler);
+      es.onerror = () => {
+        // EventSource reconnects by itself; poll until the next snapshot arrives.
+        stateStreamLive = false;
+      };
+    }
+
+    async function pollOverlay() {
+      try {
+        if (!stateStreamLive) await applyOverlay(await safeJsonFetch('/overlay_text'));
+      } catch {
+        // ignore
       } finally {
         setTimeout(pollOverlay, POLL_OVERLAY_MS);
       }
     }
 
-    // Live2D state polling (motion triggers)
-    let lastSeq = 0;
     async function pollLive2D() {
       try {
-        const st = await safeJsonFetch('/state/live2d');
-        const seq = Number(st.seq || 0);
-        if (seq && seq !== lastSeq) {
-          lastSeq = seq;
-          if (st.last_tag) {
-            playByTag(st.last_tag);
-          }
-        }
+        if (!stateStreamLive) applyLive2D(await safeJsonFetch('/state/live2d'));
       } catch {
         // ignore
       } finally {
@@ -1633,6 +1802,7 @@
 
     // Hide status by default; show only on errors.
     setStatus('');
+    connectStateStream();
     pollOverlay();
     pollLive2D();
 